@@ -0,0 +1,22 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+
+
+def cache_is_shared() -> bool:
+    """
+    Whether the default cache is seen by every worker process. Without
+    REDIS_URL it is a per-process LocMemCache, so an invalidation written to
+    it never reaches the other workers.
+    """
+    return not isinstance(caches["default"], (LocMemCache, DummyCache))
+
+
+def unshared_cache_ttl() -> int:
+    """
+    Upper bound, in seconds, on how long a worker keeps a locally cached copy
+    when the cache is not shared, so changes made on another worker show up
+    after at most this long.
+    """
+    return getattr(settings, "UNSHARED_CACHE_TTL", 30)
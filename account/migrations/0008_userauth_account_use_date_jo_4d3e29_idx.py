@@ -0,0 +1,18 @@
+# Generated by Django 5.2.9 on 2026-10-19 17:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('account', '0007_alter_userauth_profile_pic'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='userauth',
+            index=models.Index(fields=['date_joined', 'user_id'], name='account_use_date_jo_4d3e29_idx'),
+        ),
+    ]
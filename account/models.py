@@ -17,6 +17,7 @@ class UserAuth(AbstractBaseUser, PermissionsMixin):
             models.Index(fields=["is_active", "is_verified"]),
             models.Index(fields=["otp"]),
             models.Index(fields=["is_subscribed"]),
+            models.Index(fields=["date_joined", "user_id"]),
         ]
 
     user_id = models.BigAutoField(primary_key=True)
@@ -0,0 +1,31 @@
+import base64
+import json
+from typing import Any, Dict, Optional
+
+from rest_framework.exceptions import ValidationError
+
+
+def encode_cursor(position: Dict[str, Any]) -> str:
+    raw = json.dumps(position, separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Dict[str, Any]]:
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        position = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        raise ValidationError({"cursor": "Invalid cursor."})
+    if not isinstance(position, dict):
+        raise ValidationError({"cursor": "Invalid cursor."})
+    return position
+
+
+def parse_page_size(value: Optional[str], default: int = 20, maximum: int = 100) -> int:
+    if not value:
+        return default
+    if not value.isdigit() or int(value) <= 0:
+        raise ValidationError({"page_size": "Must be a positive integer."})
+    return min(int(value), maximum)
@@ -108,6 +108,54 @@ DATABASES = {
         ssl_require=True
     )
 }
+# Cache
+# Shared across workers through Redis when REDIS_URL is set; per-process otherwise.
+REDIS_URL = env("REDIS_URL", default=None)
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django_redis.cache.RedisCache",
+            "LOCATION": REDIS_URL,
+            "OPTIONS": {"CLIENT_CLASS": "django_redis.client.DefaultClient"},
+        }
+    }
+
+# Without REDIS_URL, per-worker caches that rely on cache invalidation also
+# expire after this many seconds so other workers' changes show up.
+UNSHARED_CACHE_TTL = env.int("UNSHARED_CACHE_TTL", default=30)
+
+MOOD_ANALYTICS_SNAPSHOT_TTL = env.int("MOOD_ANALYTICS_SNAPSHOT_TTL", default=900)
+DASHBOARD_METRICS_TTL = env.int("DASHBOARD_METRICS_TTL", default=300)
+ENTITLEMENT_CACHE_TTL = env.int("ENTITLEMENT_CACHE_TTL", default=60 * 60 * 24)
+SUBSCRIPTION_PAST_DUE_GRACE_DAYS = env.int("SUBSCRIPTION_PAST_DUE_GRACE_DAYS", default=3)
+# Privacy / about / terms pages: browser and proxy max-age, and how long a rendered copy stays in the cache.
+PRIVACY_CONTENT_MAX_AGE = env.int("PRIVACY_CONTENT_MAX_AGE", default=60 * 60 * 24)
+PRIVACY_CONTENT_CACHE_TTL = env.int("PRIVACY_CONTENT_CACHE_TTL", default=60 * 60 * 24 * 7)
+# Max-age of the current-version pointer and version list; versions themselves are immutable.
+PRIVACY_CONTENT_POINTER_MAX_AGE = env.int("PRIVACY_CONTENT_POINTER_MAX_AGE", default=60)
+# Origin (e.g. https://api.example.com) of the absolute URLs in those pages. They
+# are publicly cacheable, so it never comes from the request's Host; empty
+# gives relative URLs.
+PRIVACY_CONTENT_ORIGIN = env("PRIVACY_CONTENT_ORIGIN", default="")
+# How many rendered pages each worker keeps in memory.
+PRIVACY_CONTENT_LOCAL_ENTRIES = env.int("PRIVACY_CONTENT_LOCAL_ENTRIES", default=64)
+# Admin notification stream (server-sent events). Set the Redis URL to fan out
+# across worker processes; otherwise each process only streams its own notifications.
+NOTIFICATION_STREAM_REDIS_URL = env("NOTIFICATION_STREAM_REDIS_URL", default="")
+NOTIFICATION_STREAM_KEEPALIVE = env.int("NOTIFICATION_STREAM_KEEPALIVE", default=15)
+NOTIFICATION_STREAM_QUEUE_SIZE = env.int("NOTIFICATION_STREAM_QUEUE_SIZE", default=100)
+NOTIFICATION_STREAM_RESUME_LIMIT = env.int("NOTIFICATION_STREAM_RESUME_LIMIT", default=500)
+# Seconds over which an event is coalesced into one digest notification (0 turns it off).
+NOTIFICATION_DIGEST_WINDOWS = {
+    "User Created": env.int("NOTIFICATION_USER_CREATED_DIGEST_WINDOW", default=300),
+}
+# A digest's count and message are brought up to date every this many events
+# or seconds, whichever comes first (see flush_notification_digests).
+NOTIFICATION_DIGEST_FLUSH_EVERY = env.int("NOTIFICATION_DIGEST_FLUSH_EVERY", default=50)
+NOTIFICATION_DIGEST_FLUSH_SECONDS = env.int("NOTIFICATION_DIGEST_FLUSH_SECONDS", default=5)
+# Dotted path to a notification.reminders.ReminderSender subclass.
+CHECKIN_REMINDER_SENDER = env("CHECKIN_REMINDER_SENDER", default="notification.reminders.LoggingReminderSender")
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -257,6 +305,8 @@ import os
 STRIPE_SECRET_KEY = env("STRIPE_SECRET_KEY")
 STRIPE_PUBLIC_KEY = env("STRIPE_PUBLIC_KEY")
 STRIPE_WEBHOOK_SECRET = env("STRIPE_WEBHOOK_SECRET")
+# Maximum age in seconds of a webhook signature timestamp.
+STRIPE_WEBHOOK_TOLERANCE = env.int("STRIPE_WEBHOOK_TOLERANCE", default=300)
 
 SUCCESS_URL = "https://www.facebook.com/"
 CANCEL_URL = "https://www.linkedin.com/"
\ No newline at end of file
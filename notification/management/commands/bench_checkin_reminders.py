@@ -0,0 +1,69 @@
+import random
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from account.models import UserAuth
+from notification.models import CheckInReminder
+from notification.reminders import DEFAULT_BATCH_SIZE, CheckInReminderService, NullReminderSender
+from onboarding.models import TrackMood
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark send_checkin_reminders on synthetic users. Everything, including the "
+        "synthetic data, runs in one transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=1_000_000)
+        parser.add_argument("--checked-in", type=float, default=0.4, help="Share of users with an entry today.")
+        parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self._run(options)
+                raise _Rollback
+        except _Rollback:
+            self.stdout.write("Synthetic data rolled back.")
+
+    def _run(self, options):
+        rng = random.Random(options["seed"])
+        # A day far in the future so real entries and reminders do not interfere.
+        day = timezone.localdate() + timedelta(days=3650)
+        started = time.perf_counter()
+        users = UserAuth.objects.bulk_create(
+            (
+                UserAuth(email=f"bench-{i}@bench.invalid", full_name="Bench", password="!")
+                for i in range(options["users"])
+            ),
+            batch_size=10_000,
+        )
+        TrackMood.objects.bulk_create(
+            (
+                TrackMood(user_id=user.pk, mood_date=day, mood_score=rng.randint(0, 4), feel=[])
+                for user in users
+                if rng.random() < options["checked_in"]
+            ),
+            batch_size=10_000,
+        )
+        self.stdout.write(f"Seeded {len(users):,} users in {time.perf_counter() - started:.1f}s")
+
+        started = time.perf_counter()
+        run = CheckInReminderService.run(day=day, batch_size=options["batch_size"], sender=NullReminderSender())
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Scanned {run.users_scanned:,} users, created {run.reminders_created:,} reminders "
+            f"(sent {run.reminders_sent:,}) in {elapsed:.2f}s: "
+            f"{run.users_scanned / elapsed:,.0f} users/s, batch size {options['batch_size']}"
+        ))
+        assert run.reminders_created == CheckInReminder.objects.filter(day=day).count()
@@ -0,0 +1,23 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from notification.models import Notification
+
+
+class Command(BaseCommand):
+    help = (
+        "Bring recent digest notifications up to date with their events. "
+        "notify() flushes as events arrive; run this on a schedule to catch a "
+        "digest's last events."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--minutes", type=int, default=60, help="Flush digests opened this recently.")
+
+    def handle(self, *args, **options):
+        if options["minutes"] <= 0:
+            raise CommandError("--minutes must be > 0.")
+        changed = Notification.objects.flush_digests(since=timezone.now() - timedelta(minutes=options["minutes"]))
+        self.stdout.write(f"Flushed {changed} digest(s).")
@@ -0,0 +1,39 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from notification.models import Notification
+
+
+class Command(BaseCommand):
+    help = "Delete read notifications older than --days, a bounded batch at a time."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=90)
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--sleep", type=float, default=0.0, help="Seconds to pause between batches.")
+
+    def handle(self, *args, **options):
+        if options["days"] < 0 or options["batch_size"] <= 0:
+            raise CommandError("--days must be >= 0 and --batch-size > 0.")
+
+        cutoff = timezone.now() - timedelta(days=options["days"])
+        # Unread rows are never purged, so the unread counters stay valid.
+        candidates = Notification.objects.filter(is_read=True, created_at__lt=cutoff).order_by("id")
+        deleted = 0
+        last_id = 0
+        while True:
+            # Keyset on id so each batch starts where the previous one ended.
+            ids = list(candidates.filter(id__gt=last_id).values_list("id", flat=True)[:options["batch_size"]])
+            if not ids:
+                break
+            last_id = ids[-1]
+            count, _ = Notification.objects.filter(id__in=ids, is_read=True).delete()
+            deleted += count
+            self.stdout.write(f"Deleted {count} notification(s) up to id {last_id}.")
+            if options["sleep"]:
+                time.sleep(options["sleep"])
+
+        self.stdout.write(self.style.SUCCESS(f"Purged {deleted} read notification(s) older than {options['days']} day(s)."))
@@ -0,0 +1,38 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from notification.reminders import DEFAULT_BATCH_SIZE, CheckInReminderService
+
+
+def _date(value: str) -> date:
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise CommandError(f"Invalid date '{value}'. Use YYYY-MM-DD.")
+
+
+class Command(BaseCommand):
+    help = (
+        "Create and send check-in reminders to active users without a mood entry for the day. "
+        "Resumes from the day's checkpoint when run again."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--date", type=_date, help="Day to remind about (default: today).")
+        parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+        parser.add_argument("--restart", action="store_true", help="Ignore the checkpoint and scan all users again.")
+        parser.add_argument("--max-batches", type=int, default=None, help="Stop after this many batches.")
+
+    def handle(self, *args, **options):
+        run = CheckInReminderService.run(
+            day=options["date"],
+            batch_size=options["batch_size"],
+            restart=options["restart"],
+            max_batches=options["max_batches"],
+        )
+        state = "finished" if run.finished_at else f"paused after user {run.last_user_id}"
+        self.stdout.write(
+            f"Reminders for {run.day} ({state}): {run.users_scanned} user(s) scanned, "
+            f"{run.reminders_created} created, {run.reminders_sent} sent."
+        )
@@ -0,0 +1,199 @@
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Optional
+
+from django.conf import settings
+from django.db import IntegrityError, connection, models, transaction
+from django.db.models import Count, F
+from django.utils import timezone
+
+# How many triggering user ids a digest keeps; all of them are in its events.
+DIGEST_SAMPLE_SIZE = 10
+
+
+def _setting(name: str, default):
+    return getattr(settings, name, default)
+
+
+def digest_window(event: str) -> int:
+    """Seconds over which ``event`` is coalesced into one digest; 0 means never."""
+    return _setting("NOTIFICATION_DIGEST_WINDOWS", {}).get(event, 0)
+
+
+class NotificationCounterManager(models.Manager):
+
+    def bump(self, event: str, delta: int) -> None:
+        """Add ``delta`` to the unread count of ``event`` with one UPDATE."""
+        if not delta:
+            return
+        if self.filter(event=event).update(unread=F("unread") + delta):
+            return
+        try:
+            with transaction.atomic():
+                self.create(event=event, unread=delta)
+        except IntegrityError:
+            # Another transaction created the row first.
+            self.filter(event=event).update(unread=F("unread") + delta)
+
+    def bump_many(self, deltas: Dict[str, int]) -> None:
+        for event, delta in deltas.items():
+            self.bump(event, delta)
+
+    def unread(self, event: str = None) -> int:
+        qs = self.filter(event=event) if event is not None else self.all()
+        return qs.aggregate(total=models.Sum("unread"))["total"] or 0
+
+    @transaction.atomic
+    def rebuild(self) -> None:
+        """Recount unread notifications per event from scratch."""
+        from .models import Notification
+
+        self.all().delete()
+        self.bulk_create([
+            self.model(event=row["event"], unread=row["unread"])
+            for row in Notification.objects.filter(is_read=False).values("event").annotate(unread=Count("id")).order_by()
+        ])
+
+
+class NotificationQuerySet(models.QuerySet):
+
+    @transaction.atomic
+    def mark_read(self) -> int:
+        """
+        Mark every unread notification in this queryset read and take them
+        off the unread counters. Returns the number of rows changed.
+        """
+        from .models import NotificationCounter
+
+        unread = self.filter(is_read=False).order_by()
+        if connection.vendor == "postgresql":
+            # One UPDATE that also reports which events lost unread rows.
+            inner, params = unread.values("id").query.sql_with_params()
+            table = self.model._meta.db_table
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f'UPDATE "{table}" SET is_read = true WHERE id IN ({inner}) AND NOT is_read RETURNING event',
+                    params,
+                )
+                events = [row[0] for row in cursor.fetchall()]
+        else:
+            rows = list(unread.select_for_update().values_list("id", "event"))
+            self.model.objects.filter(id__in=[row[0] for row in rows]).update(is_read=True)
+            events = [row[1] for row in rows]
+
+        NotificationCounter.objects.bump_many({event: -count for event, count in Counter(events).items()})
+        return len(events)
+
+
+class NotificationManager(models.Manager.from_queryset(NotificationQuerySet)):
+
+    @transaction.atomic
+    def notify(self, *, event: str, title: str, message: str, user_id: Optional[int] = None,
+               now: Optional[datetime] = None):
+        """
+        Create a notification. When ``event`` has a digest window, record it
+        as a NotificationEvent of that window's digest instead; the digest's
+        count, sample_user_ids, message and last_event_at catch up in batches
+        (see ``flush_digest``), not on every event.
+        """
+        from .models import NotificationEvent
+
+        now = now or timezone.now()
+        window = digest_window(event)
+        if not window:
+            return self.create(event=event, title=title, message=message, user_id=user_id, created_at=now)
+
+        start = int(now.timestamp()) // window * window
+        key = f"{event}:{window}:{start}"
+        digest = self.filter(digest_key=key).only("id", "last_event_at", "flushed_event_id").first()
+        if digest is None:
+            try:
+                with transaction.atomic():
+                    digest = self.create(
+                        event=event, title=title, message=message, user_id=user_id, created_at=now,
+                        digest_key=key, last_event_at=now,
+                        sample_user_ids=[user_id] if user_id is not None else [],
+                    )
+                    first = NotificationEvent.objects.create(
+                        notification=digest, user_id=user_id, message=message, created_at=now
+                    )
+                    self.filter(pk=digest.pk).update(flushed_event_id=first.pk)
+            except IntegrityError:
+                # Another transaction opened this window first.
+                digest = self.filter(digest_key=key).only("id", "last_event_at", "flushed_event_id").get()
+            else:
+                # The previous window will not get another event to flush it.
+                previous = self.filter(digest_key=f"{event}:{window}:{start - window}").values_list("pk", flat=True)
+                for pk in previous:
+                    self.flush_digest(pk)
+                return digest
+
+        added = NotificationEvent.objects.create(notification=digest, user_id=user_id, message=message, created_at=now)
+        if (
+            added.pk - (digest.flushed_event_id or 0) >= _setting("NOTIFICATION_DIGEST_FLUSH_EVERY", 50)
+            or (now - digest.last_event_at).total_seconds() >= _setting("NOTIFICATION_DIGEST_FLUSH_SECONDS", 5)
+        ):
+            self.flush_digest(digest.pk)
+        return digest
+
+    @transaction.atomic
+    def flush_digest(self, pk: int):
+        """
+        Bring a digest's count, sample_user_ids, message and last_event_at up
+        to date with its events, and stream the change. A digest that another
+        transaction is flushing is skipped. Returns the digest when it changed.
+        """
+        from .models import NotificationCounter, NotificationEvent
+        from .stream import hub, payload_for
+
+        digest = self.select_for_update(skip_locked=True).filter(pk=pk).first()
+        if digest is None:
+            return None
+        # Recounted rather than added to: an event can commit after a flush
+        # that has already seen a later id.
+        events = NotificationEvent.objects.filter(notification_id=pk)
+        count = events.count()
+        latest = events.order_by("-id").first()
+        if latest is None or (count == digest.count and latest.pk == digest.flushed_event_id):
+            return None
+
+        was_read = digest.is_read
+        digest.count = count
+        digest.message = f"{count} events. Latest: {latest.message}"
+        digest.last_event_at = latest.created_at
+        digest.flushed_event_id = latest.pk
+        digest.is_read = False
+        digest.sample_user_ids = list(
+            events.exclude(user_id=None).order_by("id").values_list("user_id", flat=True)[:DIGEST_SAMPLE_SIZE]
+        )
+        # A plain UPDATE: the row is locked and the save() signals are not needed.
+        self.filter(pk=pk).update(
+            count=digest.count,
+            message=digest.message,
+            last_event_at=digest.last_event_at,
+            flushed_event_id=digest.flushed_event_id,
+            is_read=False,
+            sample_user_ids=digest.sample_user_ids,
+        )
+        if was_read:
+            NotificationCounter.objects.bump(digest.event, 1)
+
+        payload = payload_for(digest)
+        transaction.on_commit(lambda: hub.publish(payload))
+        return digest
+
+    def flush_digests(self, *, since: datetime) -> int:
+        """Flush every digest opened since ``since``. Returns how many changed."""
+        pks = self.filter(digest_key__isnull=False, created_at__gte=since).values_list("pk", flat=True)
+        return sum(1 for pk in pks if self.flush_digest(pk) is not None)
+
+    def bulk_create(self, objs, *args, **kwargs):
+        """Like ``bulk_create``, and also updates the unread counters and the live stream (signals do not fire)."""
+        from .models import NotificationCounter
+        from .stream import hub, payload_for
+
+        objs = super().bulk_create(objs, *args, **kwargs)
+        NotificationCounter.objects.bump_many(Counter(obj.event for obj in objs if not obj.is_read))
+        payloads = [payload_for(obj) for obj in objs if obj.pk is not None]
+        transaction.on_commit(lambda: [hub.publish(payload) for payload in payloads])
+        return objs
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.9 on 2026-10-19 17:25
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def count_unread(apps, schema_editor):
+    Notification = apps.get_model("notification", "Notification")
+    NotificationCounter = apps.get_model("notification", "NotificationCounter")
+    NotificationCounter.objects.bulk_create([
+        NotificationCounter(event=row["event"], unread=row["unread"])
+        for row in Notification.objects.filter(is_read=False).values("event").annotate(unread=Count("id")).order_by()
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notification', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event', models.CharField(max_length=50, unique=True)),
+                ('unread', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['created_at', 'id'], name='notificatio_created_fd85ff_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['event', 'is_read', 'created_at', 'id'], name='notificatio_event_a11eba_idx'),
+        ),
+        migrations.RunPython(count_unread, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.9 on 2026-10-19 17:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notification', '0002_notification_counter'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(condition=models.Q(('is_read', False)), fields=['created_at', 'id'], name='notification_unread_idx'),
+        ),
+    ]
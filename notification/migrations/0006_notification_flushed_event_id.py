@@ -0,0 +1,31 @@
+# Generated by Django 5.2.9 on 2026-10-19 18:11
+
+from django.db import migrations, models
+from django.db.models import Max, OuterRef, Subquery
+
+
+def set_flushed_event_ids(apps, schema_editor):
+    # Existing digests were updated on every event, so they are up to date.
+    Notification = apps.get_model("notification", "Notification")
+    NotificationEvent = apps.get_model("notification", "NotificationEvent")
+    latest = (
+        NotificationEvent.objects.filter(notification=OuterRef("pk"))
+        .values("notification").annotate(latest=Max("id")).values("latest")
+    )
+    Notification.objects.filter(digest_key__isnull=False).update(flushed_event_id=Subquery(latest))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notification', '0005_notification_digests'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notification',
+            name='flushed_event_id',
+            field=models.BigIntegerField(blank=True, db_index=True, null=True),
+        ),
+        migrations.RunPython(set_flushed_event_ids, migrations.RunPython.noop),
+    ]
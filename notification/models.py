@@ -1,8 +1,11 @@
 # notifications/models.py
+from django.conf import settings
 from django.db import models
 from django.utils import timezone
 from typing import Final
 
+from .managers import NotificationCounterManager, NotificationManager
+
 class Notification(models.Model):
     id = models.BigAutoField(primary_key=True)
 
@@ -17,13 +20,108 @@ class Notification(models.Model):
 
     created_at = models.DateTimeField(default=timezone.now, db_index=True)
 
+    # Digests (see NOTIFICATION_DIGEST_WINDOWS): one row per event and time
+    # window, updated in place in batches; the individual events are
+    # NotificationEvents. flushed_event_id is the latest event folded in, and
+    # doubles as the stream id of the update.
+    count = models.PositiveIntegerField(default=1)
+    sample_user_ids = models.JSONField(default=list, blank=True)
+    digest_key = models.CharField(max_length=100, null=True, blank=True, unique=True)
+    last_event_at = models.DateTimeField(null=True, blank=True)
+    flushed_event_id = models.BigIntegerField(null=True, blank=True, db_index=True)
+
+    objects = NotificationManager()
+
     class Meta:
         ordering = ["-created_at"]
         indexes = [
             models.Index(fields=["event"]),
             models.Index(fields=["is_read"]),
             models.Index(fields=["created_at"]),
+            # Keyset pages over (created_at, id), optionally filtered by event / is_read.
+            models.Index(fields=["created_at", "id"]),
+            models.Index(fields=["event", "is_read", "created_at", "id"]),
+            # Unread rows are the small, hot set; read ones are purged over time.
+            models.Index(
+                fields=["created_at", "id"],
+                condition=models.Q(is_read=False),
+                name="notification_unread_idx",
+            ),
         ]
 
     def __str__(self) -> str:
         return self.title
+
+
+class NotificationCounter(models.Model):
+    """
+    Unread notifications per event, kept up to date on create, read and
+    delete so the admin list never has to COUNT(*) the notification table.
+    """
+    event = models.CharField(max_length=50, unique=True)
+    unread = models.IntegerField(default=0)
+
+    objects = NotificationCounterManager()
+
+    def __str__(self) -> str:
+        return f"{self.event}: {self.unread}"
+
+
+class NotificationEvent(models.Model):
+    """One event folded into a digest notification, listed on demand."""
+    id = models.BigAutoField(primary_key=True)
+    notification = models.ForeignKey(
+        Notification,
+        on_delete=models.CASCADE,
+        related_name="events",
+        db_index=False,  # covered by the (notification, id) index
+    )
+    user_id = models.BigIntegerField(null=True, blank=True)
+    message = models.TextField()
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["notification", "id"]),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.notification_id} | {self.message}"
+
+
+class CheckInReminder(models.Model):
+    """A "log your mood" reminder for one user and day; at most one per day."""
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="checkin_reminders",
+    )
+    day = models.DateField()
+    created_at = models.DateTimeField(default=timezone.now)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["user", "day"], name="unique_user_reminder_day"),
+        ]
+        indexes = [
+            models.Index(fields=["day", "user"], condition=models.Q(sent_at__isnull=True), name="reminder_unsent_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.user_id} | {self.day}"
+
+
+class ReminderRun(models.Model):
+    """Checkpoint of the reminder scheduler for one day, so a run can resume."""
+    day = models.DateField(unique=True)
+    last_user_id = models.BigIntegerField(default=0)
+    users_scanned = models.PositiveIntegerField(default=0)
+    reminders_created = models.PositiveIntegerField(default=0)
+    reminders_sent = models.PositiveIntegerField(default=0)
+    started_at = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self) -> str:
+        return f"{self.day} | up to user {self.last_user_id}"
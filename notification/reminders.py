@@ -0,0 +1,187 @@
+import logging
+from abc import ABC, abstractmethod
+from datetime import date
+from typing import List, Optional, Tuple
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Exists, F, OuterRef
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from account.models import UserAuth
+from onboarding.models import TrackMood
+from .models import CheckInReminder, ReminderRun
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 5000
+
+
+class ReminderSender(ABC):
+    """
+    Delivery backend for check-in reminders, chosen with the
+    CHECKIN_REMINDER_SENDER setting (a dotted path). ``send`` gets a batch of
+    unsent reminders; raising leaves the whole batch unsent for the next run.
+    A subclass without ``send`` fails when it is instantiated, before any
+    reminder is claimed.
+    """
+
+    @abstractmethod
+    def send(self, reminders: List[CheckInReminder]) -> None:
+        ...
+
+
+class LoggingReminderSender(ReminderSender):
+    def send(self, reminders: List[CheckInReminder]) -> None:
+        if reminders:
+            logger.info(
+                "Check-in reminders for %s: %d user(s), ids %s..%s",
+                reminders[0].day, len(reminders), reminders[0].user_id, reminders[-1].user_id,
+            )
+
+
+class NullReminderSender(ReminderSender):
+    def send(self, reminders: List[CheckInReminder]) -> None:
+        pass
+
+
+def get_sender() -> ReminderSender:
+    path = getattr(settings, "CHECKIN_REMINDER_SENDER", "notification.reminders.LoggingReminderSender")
+    return import_string(path)()
+
+
+class CheckInReminderService:
+    """
+    Creates and delivers reminders for active users without a mood entry on
+    ``day``, walking users in keyset batches of ids.
+
+    Per batch: one anti-join (NOT EXISTS on TrackMood and on existing
+    reminders) finds who is missing, one bulk_create inserts their reminders,
+    and the checkpoint moves past the batch in the same transaction. Delivery
+    happens after commit; reminders whose delivery failed stay unsent and are
+    retried when the run resumes. Several runners for the same day share the
+    checkpoint and take turns on batches.
+
+    Delivery claims unsent reminders with SELECT ... FOR UPDATE SKIP LOCKED
+    and marks them sent in the same transaction, so a runner never sends
+    reminders another runner is still delivering.
+    """
+
+    @staticmethod
+    @transaction.atomic
+    def _deliver(
+        run: ReminderRun, sender: ReminderSender, *, lower: int, upper: int, batch_size: int
+    ) -> Tuple[int, Optional[int]]:
+        """
+        Claim and send up to ``batch_size`` unsent reminders of users in
+        (lower, upper]. Returns how many were sent and the last claimed user
+        id, or None when there was nothing left to claim.
+        """
+        reminders = list(
+            CheckInReminder.objects
+            .select_for_update(skip_locked=True)
+            .filter(day=run.day, user_id__gt=lower, user_id__lte=upper, sent_at__isnull=True)
+            .order_by("user_id")[:batch_size]
+        )
+        if not reminders:
+            return 0, None
+        sender.send(reminders)
+        sent = CheckInReminder.objects.filter(pk__in=[reminder.pk for reminder in reminders]).update(
+            sent_at=timezone.now()
+        )
+        ReminderRun.objects.filter(pk=run.pk).update(reminders_sent=F("reminders_sent") + sent)
+        return sent, reminders[-1].user_id
+
+    @staticmethod
+    def _deliver_range(run: ReminderRun, sender: ReminderSender, *, lower: int, upper: int, batch_size: int) -> int:
+        sent = 0
+        while True:
+            count, last = CheckInReminderService._deliver(
+                run, sender, lower=lower, upper=upper, batch_size=batch_size
+            )
+            if last is None:
+                return sent
+            sent, lower = sent + count, last
+
+    @staticmethod
+    def _flush(run: ReminderRun, sender: ReminderSender, batch_size: int) -> int:
+        """Deliver reminders an interrupted run created but did not send."""
+        return CheckInReminderService._deliver_range(
+            run, sender, lower=0, upper=run.last_user_id, batch_size=batch_size
+        )
+
+    @staticmethod
+    @transaction.atomic
+    def _schedule_batch(run: ReminderRun, batch_size: int) -> Optional[Tuple[int, int]]:
+        """
+        Create reminders for the next batch of users. Returns the batch's id
+        range, or None when every user has been scanned.
+        """
+        # Locking the checkpoint serializes concurrent runners batch by batch.
+        checkpoint = ReminderRun.objects.select_for_update().get(pk=run.pk)
+        ids = list(
+            UserAuth.objects
+            .filter(user_id__gt=checkpoint.last_user_id, is_active=True)
+            .order_by("user_id")
+            .values_list("user_id", flat=True)[:batch_size]
+        )
+        if not ids:
+            return None
+        lower, upper = checkpoint.last_user_id, ids[-1]
+
+        missing = (
+            UserAuth.objects
+            .filter(user_id__gt=lower, user_id__lte=upper, is_active=True)
+            .filter(
+                ~Exists(TrackMood.objects.filter(user_id=OuterRef("pk"), mood_date=run.day)),
+                ~Exists(CheckInReminder.objects.filter(user_id=OuterRef("pk"), day=run.day)),
+            )
+            .values_list("user_id", flat=True)
+        )
+        created = CheckInReminder.objects.bulk_create(
+            [CheckInReminder(user_id=user_id, day=run.day) for user_id in missing]
+        )
+
+        ReminderRun.objects.filter(pk=run.pk).update(
+            last_user_id=upper,
+            users_scanned=F("users_scanned") + len(ids),
+            reminders_created=F("reminders_created") + len(created),
+            updated_at=timezone.now(),
+        )
+        return lower, upper
+
+    @staticmethod
+    def run(
+        *,
+        day: Optional[date] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        sender: Optional[ReminderSender] = None,
+        restart: bool = False,
+        max_batches: Optional[int] = None,
+    ) -> ReminderRun:
+        day = day or timezone.localdate()
+        sender = sender or get_sender()
+        run, _ = ReminderRun.objects.get_or_create(day=day)
+        if restart:
+            run.last_user_id = run.users_scanned = run.reminders_created = run.reminders_sent = 0
+            run.finished_at = None
+            run.started_at = timezone.now()
+            run.save()
+        elif run.finished_at:
+            return run
+
+        CheckInReminderService._flush(run, sender, batch_size)
+
+        batches = 0
+        while max_batches is None or batches < max_batches:
+            batch = CheckInReminderService._schedule_batch(run, batch_size)
+            if batch is None:
+                ReminderRun.objects.filter(pk=run.pk).update(finished_at=timezone.now())
+                break
+            lower, upper = batch
+            CheckInReminderService._deliver_range(run, sender, lower=lower, upper=upper, batch_size=batch_size)
+            batches += 1
+
+        run.refresh_from_db()
+        return run
@@ -1,8 +1,32 @@
 from rest_framework import serializers
-from .models import Notification
+from .models import Notification, NotificationEvent
 
 class NotificationSerializer(serializers.ModelSerializer):
     class Meta:
         model = Notification
-        fields = "__all__"
-        read_only_fields = ["id", "created_at"]
\ No newline at end of file
+        # Explicit, so list views can load exactly these columns with only().
+        fields = [
+            "id", "event", "title", "message", "user_id", "is_read", "created_at",
+            "count", "sample_user_ids", "digest_key", "last_event_at", "flushed_event_id",
+        ]
+        read_only_fields = ["id", "created_at"]
+
+
+class NotificationEventSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = NotificationEvent
+        fields = ["id", "user_id", "message", "created_at"]
+
+
+class BulkMarkReadSerializer(serializers.Serializer):
+    """Any combination of filters; at least one is required."""
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), required=False, allow_empty=False, max_length=1000
+    )
+    before = serializers.DateTimeField(required=False)
+    event = serializers.CharField(required=False, max_length=50)
+
+    def validate(self, attrs):
+        if not attrs:
+            raise serializers.ValidationError("Provide ids, before or event.")
+        return attrs
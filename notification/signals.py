@@ -1,7 +1,9 @@
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 from account.models import UserAuth
-from .models import Notification
+from .models import Notification, NotificationCounter
+from .stream import hub, payload_for
 
 @receiver(post_save, sender=UserAuth)
 def notify_user_creation(sender, instance: UserAuth, created:bool, **kwargs)-> None:
@@ -9,11 +11,42 @@ def notify_user_creation(sender, instance: UserAuth, created:bool, **kwargs)-> N
         return
     
     if created:
-        Notification.objects.create(
+        fields = dict(
             event = "User Created",
             title = "New User Registered",
             message = f"A new user with email {instance.email} has registered.",
             user_id = instance.user_id
         )
-        
-    
\ No newline at end of file
+        # After commit, so a busy digest row is not locked for the rest of the
+        # signup transaction, and a failure here cannot undo the signup.
+        transaction.on_commit(lambda: Notification.objects.notify(**fields), robust=True)
+
+
+@receiver(pre_save, sender=Notification)
+def remember_read_state(sender, instance: Notification, **kwargs) -> None:
+    instance._previous = (
+        Notification.objects.filter(pk=instance.pk).values_list("event", "is_read").first()
+        if instance.pk else None
+    )
+
+
+@receiver(post_save, sender=Notification)
+def count_unread(sender, instance: Notification, created: bool, **kwargs) -> None:
+    previous = getattr(instance, "_previous", None)
+    if previous and not previous[1]:
+        NotificationCounter.objects.bump(previous[0], -1)
+    if not instance.is_read:
+        NotificationCounter.objects.bump(instance.event, 1)
+
+
+@receiver(post_delete, sender=Notification)
+def uncount_unread(sender, instance: Notification, **kwargs) -> None:
+    if not instance.is_read:
+        NotificationCounter.objects.bump(instance.event, -1)
+
+
+@receiver(post_save, sender=Notification)
+def stream_notification(sender, instance: Notification, created: bool, **kwargs) -> None:
+    if created:
+        payload = payload_for(instance)
+        transaction.on_commit(lambda: hub.publish(payload))
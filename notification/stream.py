@@ -0,0 +1,226 @@
+import asyncio
+import json
+import logging
+import re
+import threading
+from typing import AsyncIterator, List, Optional, Set, Tuple
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db.models import Max
+
+from .models import Notification
+from .serializers import NotificationSerializer
+
+logger = logging.getLogger(__name__)
+
+REDIS_CHANNEL = "notification:stream"
+# Put on a subscriber's queue when it fell too far behind.
+OVERFLOW = object()
+
+
+def _setting(name: str, default):
+    return getattr(settings, name, default)
+
+
+class Subscriber:
+    """One open stream: a bounded queue living on the event loop that serves it."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, maxsize: int):
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.overflowed = False
+
+    def offer(self, payload: dict) -> None:
+        # Runs on self.loop. A full queue means the client is not reading fast
+        # enough: drop what is buffered and tell it to resume from its last id.
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(payload)
+        except asyncio.QueueFull:
+            self.overflowed = True
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(OVERFLOW)
+
+
+class NotificationHub:
+    """
+    In-process fan-out of new notifications to open streams.
+
+    ``publish`` may be called from any thread. With
+    NOTIFICATION_STREAM_REDIS_URL set, it publishes to Redis instead, and
+    every worker process relays the channel to its own subscribers, so a
+    notification created on one worker reaches streams on all of them.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers: Set[Subscriber] = set()
+        self._bridge: Optional[asyncio.Task] = None
+        self._redis = None
+
+    def subscribe(self) -> Subscriber:
+        loop = asyncio.get_running_loop()
+        subscriber = Subscriber(loop, _setting("NOTIFICATION_STREAM_QUEUE_SIZE", 100))
+        with self._lock:
+            self._subscribers.add(subscriber)
+        if _setting("NOTIFICATION_STREAM_REDIS_URL", "") and (self._bridge is None or self._bridge.done()):
+            self._bridge = loop.create_task(self._relay_redis())
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    def publish(self, payload: dict) -> None:
+        redis_url = _setting("NOTIFICATION_STREAM_REDIS_URL", "")
+        if not redis_url:
+            self.publish_local(payload)
+            return
+        try:
+            if self._redis is None:
+                import redis
+
+                self._redis = redis.Redis.from_url(redis_url)
+            self._redis.publish(REDIS_CHANNEL, json.dumps(payload))
+        except Exception:
+            logger.exception("Could not publish notification %s to Redis", payload.get("id"))
+            self.publish_local(payload)
+
+    def publish_local(self, payload: dict) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            try:
+                subscriber.loop.call_soon_threadsafe(subscriber.offer, payload)
+            except RuntimeError:
+                # The subscriber's loop has closed.
+                self.unsubscribe(subscriber)
+
+    async def _relay_redis(self) -> None:
+        import redis.asyncio as aioredis
+
+        client = aioredis.from_url(_setting("NOTIFICATION_STREAM_REDIS_URL", ""))
+        while True:
+            try:
+                async with client.pubsub() as pubsub:
+                    await pubsub.subscribe(REDIS_CHANNEL)
+                    async for message in pubsub.listen():
+                        if message["type"] == "message":
+                            self.publish_local(json.loads(message["data"]))
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Notification Redis relay failed; reconnecting")
+                await asyncio.sleep(1)
+
+
+hub = NotificationHub()
+
+
+def payload_for(notification: Notification) -> dict:
+    return dict(NotificationSerializer(notification).data)
+
+
+def _frame(payload: dict, stream_id: str) -> str:
+    return f"id: {stream_id}\nevent: notification\ndata: {json.dumps(payload)}\n\n"
+
+
+def parse_stream_id(value: str) -> Optional[Tuple[int, Optional[int]]]:
+    """
+    ``"<notification id>-<update id>"`` as sent in frame ids, or a bare
+    notification id from older clients. None when it is neither.
+    """
+    match = re.fullmatch(r"(\d+)(?:-(\d+))?", value)
+    if match is None:
+        return None
+    return int(match[1]), int(match[2]) if match[2] is not None else None
+
+
+def _is_update(payload: dict) -> bool:
+    # A digest only gets flushed_event_id once its events are folded in, so
+    # the payload published when it is created has none.
+    return payload.get("flushed_event_id") is not None
+
+
+def _current_marks() -> Tuple[int, int]:
+    marks = Notification.objects.aggregate(created=Max("id"), updated=Max("flushed_event_id"))
+    return marks["created"] or 0, marks["updated"] or 0
+
+
+def _backlog(last_id: int, last_update_id: Optional[int], limit: int) -> Tuple[List[dict], List[dict]]:
+    created = [
+        payload_for(notification)
+        for notification in Notification.objects.filter(id__gt=last_id).order_by("id")[:limit + 1]
+    ]
+    updated = [] if last_update_id is None else [
+        payload_for(notification)
+        for notification in (
+            Notification.objects
+            .filter(id__lte=last_id, flushed_event_id__gt=last_update_id)
+            .order_by("flushed_event_id")[:limit + 1]
+        )
+    ]
+    return created, updated
+
+
+async def event_stream(*, last_event_id: Optional[int], last_update_id: Optional[int] = None) -> AsyncIterator[str]:
+    """
+    Server-sent events for new notifications and digest updates. Frame ids
+    are ``"<notification id>-<update id>"``: the newest notification and the
+    newest digest update (its ``flushed_event_id``) sent so far, so a
+    digest update that keeps its notification id is still replayed.
+    Resumes after ``last_event_id`` / ``last_update_id`` from the database
+    first; a client that is too far behind gets a ``reset`` event and should
+    reload the list.
+    """
+    keepalive = _setting("NOTIFICATION_STREAM_KEEPALIVE", 15)
+    resume_limit = _setting("NOTIFICATION_STREAM_RESUME_LIMIT", 500)
+    # Subscribe before reading the backlog so nothing created in between is missed.
+    subscriber = hub.subscribe()
+    try:
+        yield "retry: 3000\n\n"
+        # Live payloads already sent from the backlog are skipped. Ids are not
+        # compared otherwise: concurrent commits can arrive out of id order.
+        sent_through = updates_through = 0
+
+        if last_event_id is None:
+            created_mark, updated_mark = await sync_to_async(_current_marks)()
+        else:
+            created_mark, updated_mark = last_event_id, last_update_id
+            created, updated = await sync_to_async(_backlog)(last_event_id, last_update_id, resume_limit)
+            if len(created) + len(updated) > resume_limit:
+                yield "event: reset\ndata: {}\n\n"
+                created, updated = [], []
+                created_mark, updated_mark = await sync_to_async(_current_marks)()
+            for payload in created:
+                sent_through = created_mark = payload["id"]
+                yield _frame(payload, f"{created_mark}-{updated_mark or 0}")
+            for payload in updated:
+                updates_through = updated_mark = payload["flushed_event_id"]
+                yield _frame(payload, f"{created_mark}-{updated_mark}")
+            if updated_mark is None:
+                # An old-style id carries no update mark: start from now.
+                updated_mark = (await sync_to_async(_current_marks)())[1]
+
+        while True:
+            try:
+                payload = await asyncio.wait_for(subscriber.queue.get(), timeout=keepalive)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            if payload is OVERFLOW:
+                # Closing lets EventSource reconnect with Last-Event-ID and catch up.
+                yield "event: overflow\ndata: {}\n\n"
+                return
+            if _is_update(payload):
+                if payload["flushed_event_id"] > updates_through:
+                    updated_mark = max(updated_mark, payload["flushed_event_id"])
+                    yield _frame(payload, f"{created_mark}-{updated_mark}")
+            elif payload["id"] > sent_through:
+                created_mark = max(created_mark, payload["id"])
+                yield _frame(payload, f"{created_mark}-{updated_mark}")
+    finally:
+        hub.unsubscribe(subscriber)
@@ -1,3 +1,42 @@
-from django.test import TestCase
+from datetime import date
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from .models import Notification, ReminderRun
+from .reminders import CheckInReminderService, ReminderSender
+
+
+class IncompleteSender(ReminderSender):
+    pass
+
+
+class CheckInReminderSenderTests(TestCase):
+    @override_settings(CHECKIN_REMINDER_SENDER="notification.tests.IncompleteSender")
+    def test_sender_without_send_fails_before_the_run_starts(self):
+        with self.assertRaises(TypeError):
+            CheckInReminderService.run(day=date(2026, 3, 2))
+        self.assertFalse(ReminderRun.objects.exists())
+
+
+class AdminNotificationListTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = get_user_model().objects.create_user(
+            email="admin@example.com", full_name="Admin", password="pw", is_staff=True
+        )
+        for i in range(10):
+            Notification.objects.create(event="USER_CREATED", title=f"Signup {i}", message="A new user signed up.")
+
+    def test_list_does_not_query_per_row(self):
+        client = APIClient()
+        client.force_authenticate(self.admin)
+
+        # The page itself and the unread count; no deferred field loads.
+        with self.assertNumQueries(2):
+            response = client.get("/api/v1/notification/admin/get-list/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["data"]), 10)
+        self.assertIn("flushed_event_id", response.json()["data"][0])
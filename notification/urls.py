@@ -1,8 +1,11 @@
 # notifications/urls.py
 from django.urls import path
-from .views import AdminNotificationListAPI, MarkNotificationReadAPI
+from .views import AdminNotificationListAPI, AdminNotificationStreamAPI, BulkMarkNotificationsReadAPI, MarkNotificationReadAPI, NotificationEventListAPI
 
 urlpatterns = [
     path("admin/get-list/", AdminNotificationListAPI.as_view()),
     path("admin/get-info/<int:pk>/read/", MarkNotificationReadAPI.as_view()),
+    path("admin/get-info/<int:pk>/events/", NotificationEventListAPI.as_view()),
+    path("admin/mark-read/", BulkMarkNotificationsReadAPI.as_view()),
+    path("admin/stream/", AdminNotificationStreamAPI.as_view()),
 ]
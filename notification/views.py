@@ -4,24 +4,73 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAdminUser
 from rest_framework import status
+from rest_framework.exceptions import ValidationError
 
-from django.shortcuts import get_object_or_404
-from django.db.models import QuerySet
+from django.http import Http404, StreamingHttpResponse
+from django.db.models import Q, QuerySet
+from datetime import datetime
 from typing import List
 
-from .models import Notification
-from .serializers import NotificationSerializer
+from account.pagination import decode_cursor, encode_cursor, parse_page_size
+from .authentication import QueryParamJWTAuthentication
+from .models import Notification, NotificationCounter, NotificationEvent
+from .serializers import BulkMarkReadSerializer, NotificationEventSerializer, NotificationSerializer
+from .stream import event_stream, parse_stream_id
+
+
+def _parse_bool(value: str, name: str) -> bool:
+    if value.lower() in ("1", "true"):
+        return True
+    if value.lower() in ("0", "false"):
+        return False
+    raise ValidationError({name: "Must be true or false."})
+
 
 class AdminNotificationListAPI(APIView):
+    """
+    Newest first, keyset-paginated on (created_at, id) with ``?cursor=`` and
+    ``?page_size=``; filter with ``?event=`` and ``?is_read=``. The unread
+    count comes from NotificationCounter (for ``event`` when given).
+    Digest rows carry ``count`` and ``sample_user_ids``; their individual
+    events are listed by NotificationEventListAPI.
+    """
     permission_classes = [IsAdminUser]
 
     def get(self, request) -> Response:
+        params = request.query_params
+        page_size = parse_page_size(params.get("page_size"), default=50, maximum=200)
+        event = params.get("event") or None
+
         qs: QuerySet[Notification] = Notification.objects.only(
-            "id", "event", "title", "message", "user_id", "is_read", "created_at"
-        )[:50]
+            *NotificationSerializer.Meta.fields
+        ).order_by("-created_at", "-id")
+        if event:
+            qs = qs.filter(event=event)
+        if params.get("is_read"):
+            qs = qs.filter(is_read=_parse_bool(params["is_read"], "is_read"))
 
-        data: List[dict] = NotificationSerializer(qs, many=True).data
-        return Response({"success": True, "data": data})
+        position = decode_cursor(params.get("cursor"))
+        if position:
+            try:
+                created_at = datetime.fromisoformat(position["created_at"])
+                last_id = int(position["id"])
+            except (KeyError, TypeError, ValueError):
+                raise ValidationError({"cursor": "Invalid cursor."})
+            qs = qs.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=last_id))
+
+        rows = list(qs[:page_size + 1])
+        next_cursor = None
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            next_cursor = encode_cursor({"created_at": rows[-1].created_at.isoformat(), "id": rows[-1].id})
+
+        data: List[dict] = NotificationSerializer(rows, many=True).data
+        return Response({
+            "success": True,
+            "data": data,
+            "next_cursor": next_cursor,
+            "unread_count": NotificationCounter.objects.unread(event),
+        })
 
 
 # notifications/apis.py
@@ -30,8 +79,96 @@ class MarkNotificationReadAPI(APIView):
     permission_classes = [IsAdminUser]
 
     def post(self, request, pk: int) -> Response:
-        notif = get_object_or_404(Notification, pk=pk)
-        notif.is_read = True
-        notif.save(update_fields=["is_read"])
+        queryset = Notification.objects.filter(pk=pk)
+        # Only the request that actually flips the flag decrements the unread counter.
+        if not queryset.mark_read() and not queryset.exists():
+            raise Http404
 
         return Response({"success": True}, status=status.HTTP_200_OK)
+
+
+class NotificationEventListAPI(APIView):
+    """
+    The individual events folded into a digest notification, oldest first,
+    keyset-paginated on id with ``?cursor=`` and ``?page_size=``. A
+    notification that is not a digest has no events.
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, pk: int) -> Response:
+        if not Notification.objects.filter(pk=pk).exists():
+            raise Http404
+        params = request.query_params
+        page_size = parse_page_size(params.get("page_size"), default=100, maximum=500)
+
+        qs = NotificationEvent.objects.filter(notification_id=pk).order_by("id")
+        position = decode_cursor(params.get("cursor"))
+        if position:
+            try:
+                qs = qs.filter(id__gt=int(position["id"]))
+            except (KeyError, TypeError, ValueError):
+                raise ValidationError({"cursor": "Invalid cursor."})
+
+        rows = list(qs[:page_size + 1])
+        next_cursor = None
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            next_cursor = encode_cursor({"id": rows[-1].id})
+
+        return Response({
+            "success": True,
+            "data": NotificationEventSerializer(rows, many=True).data,
+            "next_cursor": next_cursor,
+        })
+
+
+class BulkMarkNotificationsReadAPI(APIView):
+    """
+    Mark notifications read in one UPDATE. The body filters by ``ids``,
+    ``before`` (created before this time) and/or ``event``.
+    """
+    permission_classes = [IsAdminUser]
+
+    def post(self, request) -> Response:
+        serializer = BulkMarkReadSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        filters = serializer.validated_data
+
+        qs = Notification.objects.all()
+        if "ids" in filters:
+            qs = qs.filter(id__in=filters["ids"])
+        if "before" in filters:
+            qs = qs.filter(created_at__lt=filters["before"])
+        if "event" in filters:
+            qs = qs.filter(event=filters["event"])
+
+        return Response({"success": True, "data": {"updated": qs.mark_read()}}, status=status.HTTP_200_OK)
+
+
+class AdminNotificationStreamAPI(APIView):
+    """
+    Server-sent events: each new notification, and each digest update, as an
+    ``event: notification``. Reconnecting clients send ``Last-Event-ID``
+    (EventSource does this itself) or ``?last_event_id=`` to receive what
+    they missed. Authenticate with the usual Bearer header or ``?token=``.
+    A digest that gains events is sent again under a new event id.
+
+    The response body is an async generator, so under ASGI an open stream
+    holds no worker thread.
+    """
+    authentication_classes = [QueryParamJWTAuthentication]
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        last_event_id = request.headers.get("Last-Event-ID") or request.query_params.get("last_event_id")
+        marks = parse_stream_id(str(last_event_id)) if last_event_id is not None else (None, None)
+        if marks is None:
+            raise ValidationError({"last_event_id": "Must be an event id from the stream."})
+
+        response = StreamingHttpResponse(
+            event_stream(last_event_id=marks[0], last_update_id=marks[1]),
+            content_type="text/event-stream",
+        )
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"
+        return response
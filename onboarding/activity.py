@@ -0,0 +1,133 @@
+import base64
+from calendar import isleap
+from datetime import date
+from typing import Dict, List, Optional
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import MoodActivityYear
+
+LEVEL_BITS = 3
+LEVEL_MASK = (1 << LEVEL_BITS) - 1
+
+
+def day_index(day: date) -> int:
+    return day.timetuple().tm_yday - 1
+
+
+def longest_run(bits: int) -> int:
+    """Length of the longest run of consecutive set bits."""
+    run = 0
+    while bits:
+        bits &= bits >> 1
+        run += 1
+    return run
+
+
+def run_ending_at(bits: int, index: int) -> int:
+    """Length of the run of consecutive set bits ending at bit ``index``."""
+    if index < 0:
+        return 0
+    window = bits & ((1 << (index + 1)) - 1)
+    gaps = ~window & ((1 << (index + 1)) - 1)
+    return index + 1 if not gaps else index - (gaps.bit_length() - 1)
+
+
+def current_streak(bits: int, year: int, today: date) -> int:
+    """
+    Streak that is still going on ``today``: for the current year it ends
+    today, or yesterday while today has no entry yet; a past year's streak
+    ends on Dec 31. Streaks are counted within the year.
+    """
+    if year > today.year:
+        return 0
+    if year < today.year:
+        return run_ending_at(bits, (366 if isleap(year) else 365) - 1)
+    i = day_index(today)
+    return run_ending_at(bits, i if bits >> i & 1 else i - 1)
+
+
+class MoodActivityService:
+
+    @staticmethod
+    @transaction.atomic
+    def mark(*, user_id: int, mood_date: date, mood_score: int) -> None:
+        activity, _ = (
+            MoodActivityYear.objects
+            .select_for_update()
+            .get_or_create(user_id=user_id, year=mood_date.year)
+        )
+        i = day_index(mood_date)
+        days = int.from_bytes(activity.days, "little") | (1 << i)
+        levels = int.from_bytes(activity.levels, "little")
+        levels = (levels & ~(LEVEL_MASK << (LEVEL_BITS * i))) | ((mood_score + 1) << (LEVEL_BITS * i))
+
+        activity.days = days.to_bytes(MoodActivityYear.DAY_BYTES, "little")
+        activity.levels = levels.to_bytes(MoodActivityYear.LEVEL_BYTES, "little")
+        activity.save(update_fields=["days", "levels", "updated_at"])
+
+    @staticmethod
+    @transaction.atomic
+    def clear(*, user_id: int, mood_date: date) -> None:
+        activity = (
+            MoodActivityYear.objects
+            .select_for_update()
+            .filter(user_id=user_id, year=mood_date.year)
+            .first()
+        )
+        if activity is None:
+            return
+        i = day_index(mood_date)
+        days = int.from_bytes(activity.days, "little") & ~(1 << i)
+        levels = int.from_bytes(activity.levels, "little") & ~(LEVEL_MASK << (LEVEL_BITS * i))
+
+        activity.days = days.to_bytes(MoodActivityYear.DAY_BYTES, "little")
+        activity.levels = levels.to_bytes(MoodActivityYear.LEVEL_BYTES, "little")
+        activity.save(update_fields=["days", "levels", "updated_at"])
+
+    @staticmethod
+    @transaction.atomic
+    def clear_many(*, year: int, days_by_user: Dict[int, List[date]]) -> None:
+        """Clear many users' days of one year with one read and one bulk update."""
+        activities = list(
+            MoodActivityYear.objects
+            .select_for_update()
+            .filter(user_id__in=days_by_user, year=year)
+        )
+        now = timezone.now()
+        for activity in activities:
+            days = int.from_bytes(activity.days, "little")
+            levels = int.from_bytes(activity.levels, "little")
+            for day in days_by_user[activity.user_id]:
+                i = day_index(day)
+                days &= ~(1 << i)
+                levels &= ~(LEVEL_MASK << (LEVEL_BITS * i))
+            activity.days = days.to_bytes(MoodActivityYear.DAY_BYTES, "little")
+            activity.levels = levels.to_bytes(MoodActivityYear.LEVEL_BYTES, "little")
+            activity.updated_at = now
+        MoodActivityYear.objects.bulk_update(activities, ["days", "levels", "updated_at"])
+
+    @staticmethod
+    def heatmap(*, user, year: int, include_levels: bool = False) -> dict:
+        activity: Optional[MoodActivityYear] = (
+            MoodActivityYear.objects
+            .filter(user=user, year=year)
+            .only("days", "levels")
+            .first()
+        )
+        days = bytes(activity.days) if activity else bytes(MoodActivityYear.DAY_BYTES)
+        bits = int.from_bytes(days, "little")
+
+        data = {
+            "year": year,
+            "days_in_year": 366 if isleap(year) else 365,
+            "days": base64.b64encode(days).decode(),
+            "active_days": bits.bit_count(),
+            "current_streak": current_streak(bits, year, timezone.localdate()),
+            "longest_streak": longest_run(bits),
+        }
+        if include_levels:
+            levels = bytes(activity.levels) if activity else bytes(MoodActivityYear.LEVEL_BYTES)
+            data["levels"] = base64.b64encode(levels).decode()
+        return data
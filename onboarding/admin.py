@@ -1,5 +1,6 @@
 from django.contrib import admin
 from .models import CoachingStyle, OnboardingStep, TrackMood
+from .services import TrackMoodService
 
 
 
@@ -35,4 +36,26 @@ class TrackMoodAdmin(admin.ModelAdmin):
     list_display = ("user", "mood_score", "mood_label", "mood_date")
     list_filter = ("mood_score", "mood_date")
     search_fields = ("user__username", "journal")
-    ordering = ("-mood_date",)
\ No newline at end of file
+    ordering = ("-mood_date",)
+
+    # Writes go through TrackMoodService, which also keeps the feelings
+    # index, journal search and activity bitmaps of the entry in sync.
+    def save_model(self, request, obj, form, change):
+        if change:
+            # A fresh copy, so the service sees the values before the edit.
+            TrackMoodService.update(
+                instance=TrackMood.objects.get(pk=obj.pk),
+                data={name: getattr(obj, name) for name in form.changed_data},
+            )
+            return
+        mood = TrackMoodService.create(
+            user=obj.user,
+            data={name: getattr(obj, name) for name in form.cleaned_data if name != "user"},
+        )
+        obj.pk, obj.created_at, obj.updated_at = mood.pk, mood.created_at, mood.updated_at
+
+    def delete_model(self, request, obj):
+        TrackMoodService.delete(instance=obj)
+
+    def delete_queryset(self, request, queryset):
+        TrackMoodService.delete_many(queryset=queryset)
@@ -0,0 +1,454 @@
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Dict, List, Optional, TypedDict
+
+import time
+
+import numpy as np
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils import timezone
+
+from .archive import unpack_entries
+from .models import CohortRetentionReport, MoodArchive, OnboardingStep, TrackMood
+
+User = get_user_model()
+
+FETCH_CHUNK_SIZE = 20000
+MOOD_LEVELS = len(TrackMood.MOOD_CHOICES)
+PERCENTILES = (25, 50, 75, 90)
+UNKNOWN = "unknown"
+MAX_MARK_CELLS = 50_000_000
+SNAPSHOT_KEY = "mood_analytics:population:{start}:{end}"
+RETENTION_WEEKS = 12
+RETENTION_HEADLINE_WEEKS = (1, 4, 12)
+
+
+class CohortStats(TypedDict):
+    key: str
+    entries: int
+    users: int
+    mean: Optional[float]
+    histogram: Dict[str, int]
+    percentiles: Dict[str, Optional[int]]
+
+
+@dataclass(frozen=True)
+class MoodColumns:
+    """Compact column arrays for every mood row in a date range."""
+
+    user_ids: np.ndarray  # int64
+    days: np.ndarray  # datetime64[D]
+    scores: np.ndarray  # int8
+    styles: np.ndarray  # int32 index into style_labels
+    countries: np.ndarray  # int32 index into country_labels
+    style_labels: List[str]
+    country_labels: List[str]
+
+
+def _factorize(user_ids: np.ndarray, values: List[Optional[str]], mood_user_ids: np.ndarray):
+    """
+    Map each mood row to the integer code of its user's attribute
+    (coaching style, country), with users lacking a value mapped to UNKNOWN.
+    """
+    labels, codes = np.unique(
+        np.array([value or UNKNOWN for value in values] + [UNKNOWN], dtype=object),
+        return_inverse=True,
+    )
+    unknown_code = codes[-1]
+    codes = codes[:-1]
+
+    order = np.argsort(user_ids)
+    sorted_ids = user_ids[order]
+    sorted_codes = codes[order]
+
+    pos = np.searchsorted(sorted_ids, mood_user_ids)
+    pos = np.clip(pos, 0, max(len(sorted_ids) - 1, 0))
+    found = sorted_ids[pos] == mood_user_ids if len(sorted_ids) else np.zeros(len(mood_user_ids), bool)
+
+    result = np.full(len(mood_user_ids), unknown_code, dtype=np.int32)
+    if len(sorted_ids):
+        result[found] = sorted_codes[pos[found]]
+    return result, [str(label) for label in labels]
+
+
+def load_mood_columns(start_date: date, end_date: date) -> MoodColumns:
+    rows = (
+        TrackMood.objects
+        .filter(mood_date__range=(start_date, end_date))
+        .values_list("user_id", "mood_date", "mood_score")
+        .iterator(chunk_size=FETCH_CHUNK_SIZE)
+    )
+
+    user_chunks, day_chunks, score_chunks = [], [], []
+
+    def flush(batch):
+        user_ids, days, scores = zip(*batch)
+        user_chunks.append(np.fromiter(user_ids, dtype=np.int64, count=len(batch)))
+        day_chunks.append(np.array(days, dtype="datetime64[D]"))
+        score_chunks.append(np.fromiter(scores, dtype=np.int8, count=len(batch)))
+
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= FETCH_CHUNK_SIZE:
+            flush(batch)
+            batch = []
+    if batch:
+        flush(batch)
+
+    mood_user_ids = np.concatenate(user_chunks) if user_chunks else np.empty(0, np.int64)
+    days = np.concatenate(day_chunks) if day_chunks else np.empty(0, "datetime64[D]")
+    scores = np.concatenate(score_chunks) if score_chunks else np.empty(0, np.int8)
+
+    style_rows = list(OnboardingStep.objects.values_list("user_id", "coaching_style_value"))
+    country_rows = list(
+        User.objects.exclude(country__isnull=True).exclude(country="").values_list("pk", "country")
+    )
+
+    styles, style_labels = _factorize(
+        np.array([user_id for user_id, _ in style_rows], dtype=np.int64),
+        [value for _, value in style_rows],
+        mood_user_ids,
+    )
+    countries, country_labels = _factorize(
+        np.array([user_id for user_id, _ in country_rows], dtype=np.int64),
+        [value.strip().upper() or None for _, value in country_rows],
+        mood_user_ids,
+    )
+
+    return MoodColumns(
+        user_ids=mood_user_ids,
+        days=days,
+        scores=scores,
+        styles=styles,
+        countries=countries,
+        style_labels=style_labels,
+        country_labels=country_labels,
+    )
+
+
+def dense_user_index(user_ids: np.ndarray):
+    """Map sparse user ids to 0..n_users-1 without sorting."""
+    if not len(user_ids):
+        return np.empty(0, np.int64), 0
+    present = np.zeros(int(user_ids.max()) + 1, dtype=bool)
+    present[user_ids] = True
+    dense = np.cumsum(present, dtype=np.int64) - 1
+    return dense[user_ids], int(dense[-1]) + 1
+
+
+def _distinct_users(codes: np.ndarray, n: int, users: np.ndarray, n_users: int) -> np.ndarray:
+    keys = codes.astype(np.int64) * n_users + users
+    if n * n_users <= MAX_MARK_CELLS:
+        seen = np.zeros(n * n_users, dtype=bool)
+        seen[keys] = True
+        return seen.reshape(n, n_users).sum(axis=1)
+    return np.bincount(np.unique(keys) // n_users, minlength=n)
+
+
+def cohort_stats(
+    codes: np.ndarray, labels: List[str], scores: np.ndarray, users: np.ndarray, n_users: int
+) -> List[CohortStats]:
+    """
+    Score histogram, mean, percentiles and distinct users per cohort code,
+    computed with a single bincount over (code, score) pairs. ``users`` are
+    dense indexes from ``dense_user_index``.
+    """
+    n = len(labels)
+    if n == 0:
+        return []
+
+    counts = np.bincount(
+        codes.astype(np.int64) * MOOD_LEVELS + scores,
+        minlength=n * MOOD_LEVELS,
+    ).reshape(n, MOOD_LEVELS)
+    totals = counts.sum(axis=1)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = (counts * np.arange(MOOD_LEVELS)).sum(axis=1) / totals
+        cdf = np.cumsum(counts, axis=1) / totals[:, None]
+    percentiles = {
+        p: np.argmax(cdf >= p / 100, axis=1)
+        for p in PERCENTILES
+    }
+
+    distinct = _distinct_users(codes, n, users, n_users)
+
+    mood_labels = [label for _, label in TrackMood.MOOD_CHOICES]
+    result: List[CohortStats] = []
+    for i in np.flatnonzero(totals):
+        result.append({
+            "key": labels[i],
+            "entries": int(totals[i]),
+            "users": int(distinct[i]),
+            "mean": round(float(means[i]), 2),
+            "histogram": dict(zip(mood_labels, counts[i].tolist())),
+            "percentiles": {f"p{p}": int(percentiles[p][i]) for p in PERCENTILES},
+        })
+    return result
+
+
+def compute_population_stats(columns: MoodColumns) -> dict:
+    users, n_users = dense_user_index(columns.user_ids)
+    scores = columns.scores
+
+    # Calendar months as offsets from the first month, so no sort is needed.
+    months = columns.days.astype("datetime64[M]").astype(np.int64)
+    first_month = int(months.min()) if len(months) else 0
+    month_codes = months - first_month
+    month_labels = [
+        str(np.datetime64(first_month + i, "M"))
+        for i in range(int(month_codes.max(initial=-1)) + 1)
+    ]
+
+    overall = cohort_stats(np.zeros(len(scores), dtype=np.int32), ["all"], scores, users, n_users)
+
+    return {
+        "total_entries": int(len(scores)),
+        "overall": overall[0] if overall else None,
+        "by_coaching_style": cohort_stats(columns.styles, columns.style_labels, scores, users, n_users),
+        "by_country": cohort_stats(columns.countries, columns.country_labels, scores, users, n_users),
+        "over_time": cohort_stats(month_codes, month_labels, scores, users, n_users),
+    }
+
+
+class PopulationAnalyticsService:
+
+    @staticmethod
+    def snapshot(*, start_date: date, end_date: date, refresh: bool = False) -> dict:
+        key = SNAPSHOT_KEY.format(start=start_date.isoformat(), end=end_date.isoformat())
+        if not refresh:
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
+
+        snapshot = {
+            "generated_at": timezone.now().isoformat(),
+            "range": {
+                "start_date": start_date.isoformat(),
+                "end_date": end_date.isoformat(),
+            },
+            **compute_population_stats(load_mood_columns(start_date, end_date)),
+        }
+        cache.set(key, snapshot, timeout=getattr(settings, "MOOD_ANALYTICS_SNAPSHOT_TTL", 900))
+        return snapshot
+
+
+def rolling_trend(values: np.ndarray, window: int = 7, warmup: int = 0) -> dict:
+    """
+    Rolling mean/std, week-over-week delta and linear trend over a dense
+    daily series in which days without an entry are NaN. The first
+    ``warmup`` days only feed the windows and are dropped from the result.
+
+    Windows only count observed days: the mean needs at least one entry in
+    the window, the standard deviation at least two; otherwise the value is
+    NaN. The week-over-week delta compares each rolling mean with the one
+    seven days earlier. The slope is an ordinary least-squares fit over the
+    observed days, in mood points per day.
+    """
+    n = len(values)
+    observed = ~np.isnan(values)
+    filled = np.where(observed, values, 0.0)
+
+    counts = np.concatenate(([0], np.cumsum(observed)))
+    sums = np.concatenate(([0.0], np.cumsum(filled)))
+    squares = np.concatenate(([0.0], np.cumsum(filled * filled)))
+
+    end = np.arange(1, n + 1)
+    start = np.maximum(end - window, 0)
+    in_window = counts[end] - counts[start]
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = (sums[end] - sums[start]) / in_window
+        variance = (squares[end] - squares[start]) / in_window - mean * mean
+    std = np.sqrt(np.clip(variance, 0.0, None))
+    mean[in_window == 0] = np.nan
+    std[in_window < 2] = np.nan
+
+    week_over_week = np.full(n, np.nan)
+    week_over_week[7:] = mean[7:] - mean[:-7]
+
+    x = np.flatnonzero(observed[warmup:]).astype(np.float64)
+    slope = None
+    if len(x) >= 2:
+        y = values[warmup:][observed[warmup:]]
+        x_centered = x - x.mean()
+        slope = float((x_centered * (y - y.mean())).sum() / (x_centered * x_centered).sum())
+
+    return {
+        "rolling_mean": mean[warmup:],
+        "rolling_std": std[warmup:],
+        "week_over_week": week_over_week[warmup:],
+        "slope_per_day": slope,
+    }
+
+
+def daily_trend(daily_avg: Dict[date, float], *, start_date: date, end_date: date, window: int = 7) -> dict:
+    """
+    Build the dense day array for [start_date - warmup, end_date] from a
+    {date: average score} map and run ``rolling_trend`` over it, so windows
+    at the start of the range still see the days before it.
+    """
+    warmup = window - 1 + 7
+    first_day = start_date - timedelta(days=warmup)
+    values = np.full((end_date - first_day).days + 1, np.nan)
+    for day, avg in daily_avg.items():
+        if first_day <= day <= end_date:
+            values[(day - first_day).days] = avg
+    return rolling_trend(values, window=window, warmup=warmup)
+
+
+@dataclass(frozen=True)
+class RetentionColumns:
+    """Signup day per user plus one (user, day) pair per mood entry."""
+
+    user_ids: np.ndarray  # int64
+    joined: np.ndarray  # datetime64[D]
+    activity_user_ids: np.ndarray  # int64
+    activity_days: np.ndarray  # datetime64[D]
+
+
+def _id_day_chunks(rows, to_day=lambda value: value):
+    """Collect (id, day) rows into int64 / datetime64[D] array chunks."""
+    id_chunks, day_chunks, batch = [], [], []
+
+    def flush():
+        id_chunks.append(np.fromiter((pk for pk, _ in batch), dtype=np.int64, count=len(batch)))
+        day_chunks.append(np.array([to_day(value) for _, value in batch], dtype="datetime64[D]"))
+        batch.clear()
+
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= FETCH_CHUNK_SIZE:
+            flush()
+    if batch:
+        flush()
+    return id_chunks, day_chunks
+
+
+def _local_day(value):
+    return timezone.localtime(value).date() if timezone.is_aware(value) else value.date()
+
+
+def load_retention_columns() -> RetentionColumns:
+    """
+    One pass over users and mood entries (hot rows and archived months),
+    kept as compact NumPy columns.
+    """
+    user_chunks, joined_chunks = _id_day_chunks(
+        User.objects.values_list("pk", "date_joined").iterator(chunk_size=FETCH_CHUNK_SIZE),
+        to_day=_local_day,
+    )
+    activity_user_chunks, activity_day_chunks = _id_day_chunks(
+        TrackMood.objects.values_list("user_id", "mood_date").iterator(chunk_size=FETCH_CHUNK_SIZE)
+    )
+    for user_id, payload in MoodArchive.objects.values_list("user_id", "payload").iterator(chunk_size=100):
+        days = [entry["mood_date"] for entry in unpack_entries(payload)]
+        activity_user_chunks.append(np.full(len(days), user_id, dtype=np.int64))
+        activity_day_chunks.append(np.array(days, dtype="datetime64[D]"))
+
+    def concat(chunks, dtype):
+        return np.concatenate(chunks) if chunks else np.empty(0, dtype)
+
+    return RetentionColumns(
+        user_ids=concat(user_chunks, np.int64),
+        joined=concat(joined_chunks, "datetime64[D]"),
+        activity_user_ids=concat(activity_user_chunks, np.int64),
+        activity_days=concat(activity_day_chunks, "datetime64[D]"),
+    )
+
+
+def cohort_retention(columns: RetentionColumns, as_of: date, weeks: int = RETENTION_WEEKS) -> dict:
+    """
+    Monthly signup cohort x week-since-signup retention.
+
+    Week ``k`` covers days [7k, 7k + 7) after the signup day. A user is
+    eligible for week ``k`` once that week is over by ``as_of``, and active
+    in it if they logged at least one mood during it. Retention is
+    active / eligible, or None while no user of the cohort is eligible.
+    """
+    n_weeks = weeks + 1
+    as_of_day = np.datetime64(as_of, "D")
+
+    # Dense user index over the users table: sparse id -> 0..n-1, -1 elsewhere.
+    n_users = len(columns.user_ids)
+    max_id = int(max(columns.user_ids.max(initial=0), columns.activity_user_ids.max(initial=0)))
+    index = np.full(max_id + 1, -1, dtype=np.int64)
+    index[columns.user_ids] = np.arange(n_users)
+
+    months = columns.joined.astype("datetime64[M]").astype(np.int64)
+    first_month = int(months.min()) if n_users else 0
+    cohorts = months - first_month
+    n_cohorts = int(cohorts.max(initial=-1)) + 1
+    cohort_labels = [str(np.datetime64(first_month + i, "M")) for i in range(n_cohorts)]
+
+    sizes = np.bincount(cohorts, minlength=n_cohorts)
+
+    # Eligible: the last completed week per user, counted then summed from the right.
+    completed = (as_of_day - columns.joined).astype(np.int64) // 7 - 1
+    completed = np.clip(completed, -1, weeks)
+    has_week = completed >= 0
+    eligible = np.bincount(
+        cohorts[has_week] * n_weeks + completed[has_week],
+        minlength=n_cohorts * n_weeks,
+    ).reshape(n_cohorts, n_weeks)
+    eligible = np.cumsum(eligible[:, ::-1], axis=1)[:, ::-1]
+
+    # Active: distinct (user, week) pairs inside the window, marked in a bool grid.
+    dense = index[columns.activity_user_ids]
+    known = dense >= 0
+    dense = dense[known]
+    offset = (columns.activity_days[known] - columns.joined[dense]).astype(np.int64)
+    week = offset // 7
+    # Only weeks the user is eligible for count, so active <= eligible.
+    in_window = (offset >= 0) & (week <= completed[dense])
+    seen = np.zeros(n_users * n_weeks, dtype=bool)
+    seen[dense[in_window] * n_weeks + week[in_window]] = True
+    marked = np.flatnonzero(seen)
+    active = np.bincount(
+        cohorts[marked // n_weeks] * n_weeks + marked % n_weeks,
+        minlength=n_cohorts * n_weeks,
+    ).reshape(n_cohorts, n_weeks)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        retention = active / eligible
+
+    result = []
+    for i in np.flatnonzero(sizes):
+        rates = [None if eligible[i, k] == 0 else round(float(retention[i, k]), 4) for k in range(n_weeks)]
+        result.append({
+            "cohort": cohort_labels[i],
+            "users": int(sizes[i]),
+            "active": active[i].tolist(),
+            "eligible": eligible[i].tolist(),
+            "retention": rates,
+            **{f"week_{k}": rates[k] for k in RETENTION_HEADLINE_WEEKS if k <= weeks},
+        })
+
+    return {
+        "as_of": as_of.isoformat(),
+        "weeks": list(range(n_weeks)),
+        "cohorts": result,
+    }
+
+
+class RetentionService:
+
+    @staticmethod
+    def build(*, as_of: Optional[date] = None) -> CohortRetentionReport:
+        as_of = as_of or timezone.localdate()
+        started = time.perf_counter()
+        columns = load_retention_columns()
+        payload = cohort_retention(columns, as_of)
+        return CohortRetentionReport.objects.create(
+            as_of=as_of,
+            user_count=len(columns.user_ids),
+            duration_ms=int((time.perf_counter() - started) * 1000),
+            payload=payload,
+        )
+
+    @staticmethod
+    def latest() -> Optional[CohortRetentionReport]:
+        return CohortRetentionReport.objects.order_by("-created_at").first()
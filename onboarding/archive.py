@@ -0,0 +1,252 @@
+import json
+import zlib
+from collections import defaultdict
+from datetime import date, datetime
+from typing import AsyncIterator, Dict, Iterable, Iterator, List, Optional, TypedDict
+
+from django.db import DatabaseError, connection, transaction
+
+from account.streaming import aiter_queryset
+from .models import MoodArchive, MoodFeeling, TrackMood
+from .search import JournalSearchService
+
+ARCHIVE_FORMAT = 1
+COMPRESSION_LEVEL = 9
+ARCHIVE_CHUNK_SIZE = 100
+ENTRY_FIELDS = ("id", "mood_date", "mood_score", "feel", "journal", "created_at", "updated_at")
+
+
+class ArchiveStats(TypedDict):
+    months: int
+    entries: int
+    raw_bytes: int
+    compressed_bytes: int
+    hot_row_bytes: int  # heap bytes of the archived rows (PostgreSQL only, else 0)
+
+
+def _month(day: date) -> date:
+    return day.replace(day=1)
+
+
+def pack_entries(entries: List[dict]) -> tuple:
+    """Return (zlib payload, uncompressed size) for entries sorted by mood_date."""
+    raw = json.dumps(
+        {"v": ARCHIVE_FORMAT, "entries": entries},
+        separators=(",", ":"),
+        ensure_ascii=False,
+    ).encode()
+    return zlib.compress(raw, COMPRESSION_LEVEL), len(raw)
+
+
+def unpack_entries(payload) -> List[dict]:
+    """Decode a payload back into entries with date/datetime values."""
+    data = json.loads(zlib.decompress(payload))
+    entries = data["entries"]
+    for entry in entries:
+        entry["mood_date"] = date.fromisoformat(entry["mood_date"])
+        entry["created_at"] = datetime.fromisoformat(entry["created_at"])
+        entry["updated_at"] = datetime.fromisoformat(entry["updated_at"])
+    return entries
+
+
+def _serialize(row: dict) -> dict:
+    return {
+        **row,
+        "mood_date": row["mood_date"].isoformat(),
+        "created_at": row["created_at"].isoformat(),
+        "updated_at": row["updated_at"].isoformat(),
+    }
+
+
+def hot_table_bytes() -> Optional[int]:
+    """On-disk size of the TrackMood table and its indexes, if the database reports it."""
+    table = TrackMood._meta.db_table
+    try:
+        with connection.cursor() as cursor:
+            if connection.vendor == "postgresql":
+                # Covers every partition when the table is partitioned.
+                cursor.execute(
+                    "SELECT coalesce(sum(pg_total_relation_size(relid)), 0) FROM pg_partition_tree(%s)",
+                    [table],
+                )
+            elif connection.vendor == "sqlite":
+                cursor.execute(
+                    "SELECT coalesce(sum(pgsize), 0) FROM dbstat WHERE name IN "
+                    "(SELECT name FROM sqlite_master WHERE tbl_name = %s)",
+                    [table],
+                )
+            else:
+                return None
+            return int(cursor.fetchone()[0])
+    except DatabaseError:
+        return None
+
+
+def _hot_row_bytes(user_id: int, cutoff: date) -> int:
+    if connection.vendor != "postgresql":
+        return 0
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT coalesce(sum(pg_column_size(t.*)), 0) FROM {TrackMood._meta.db_table} t "
+            "WHERE user_id = %s AND mood_date < %s",
+            [user_id, cutoff],
+        )
+        return int(cursor.fetchone()[0])
+
+
+class MoodArchiveService:
+    """
+    Cold tier for old mood entries: one compressed blob per user and month.
+
+    Archived entries keep their original ids and timestamps. If a hot row and
+    an archived entry exist for the same day, readers use the hot row.
+    Archived journals are not searchable and archived feelings are not part of
+    feeling statistics until the month is restored.
+    """
+
+    @staticmethod
+    @transaction.atomic
+    def archive_user(*, user_id: int, before: date) -> ArchiveStats:
+        """Move the user's entries from whole months before ``before`` into archives."""
+        cutoff = _month(before)
+        rows = list(
+            TrackMood.objects
+            .select_for_update()
+            .filter(user_id=user_id, mood_date__lt=cutoff)
+            .order_by("mood_date")
+            .values(*ENTRY_FIELDS)
+        )
+        stats: ArchiveStats = {
+            "months": 0, "entries": 0, "raw_bytes": 0, "compressed_bytes": 0, "hot_row_bytes": 0,
+        }
+        if not rows:
+            return stats
+        stats["hot_row_bytes"] = _hot_row_bytes(user_id, cutoff)
+
+        by_month: Dict[date, List[dict]] = defaultdict(list)
+        for row in rows:
+            by_month[_month(row["mood_date"])].append(_serialize(row))
+
+        existing = {
+            archive.month: archive
+            for archive in MoodArchive.objects.select_for_update().filter(user_id=user_id, month__in=by_month)
+        }
+
+        for month, entries in by_month.items():
+            archive = existing.get(month) or MoodArchive(user_id=user_id, month=month)
+            if archive.pk:
+                new_days = {entry["mood_date"] for entry in entries}
+                kept = [
+                    _serialize(old)
+                    for old in unpack_entries(archive.payload)
+                    if old["mood_date"].isoformat() not in new_days
+                ]
+                entries = sorted(kept + entries, key=lambda entry: entry["mood_date"])
+            archive.payload, archive.raw_bytes = pack_entries(entries)
+            archive.compressed_bytes = len(archive.payload)
+            archive.entry_count = len(entries)
+            archive.save()
+
+            stats["months"] += 1
+            stats["entries"] += len(by_month[month])
+            stats["raw_bytes"] += archive.raw_bytes
+            stats["compressed_bytes"] += archive.compressed_bytes
+
+        mood_ids = [row["id"] for row in rows]
+        # The activity bitmap is left as is: archived days still count as check-ins.
+        TrackMood.objects.filter(id__in=mood_ids).delete()
+        JournalSearchService.discard(mood_ids=mood_ids)
+        return stats
+
+    @staticmethod
+    @transaction.atomic
+    def restore_user(*, user_id: int, months: Optional[Iterable[date]] = None) -> int:
+        """
+        Move archived entries back into TrackMood and delete their archives.
+        Days that already have a hot row keep it. Returns the number of rows restored.
+        """
+        archives = MoodArchive.objects.select_for_update().filter(user_id=user_id)
+        if months is not None:
+            archives = archives.filter(month__in=[_month(month) for month in months])
+        archives = list(archives)
+        if not archives:
+            return 0
+
+        entries = [entry for archive in archives for entry in unpack_entries(archive.payload)]
+        hot_days = set(
+            TrackMood.objects
+            .filter(user_id=user_id, mood_date__in=[entry["mood_date"] for entry in entries])
+            .values_list("mood_date", flat=True)
+        )
+        moods = [
+            TrackMood(user_id=user_id, **entry)
+            for entry in entries
+            if entry["mood_date"] not in hot_days
+        ]
+        timestamps = [(mood.created_at, mood.updated_at) for mood in moods]
+
+        TrackMood.objects.bulk_create(moods)
+        # bulk_create applies auto_now/auto_now_add; put the original timestamps back.
+        for mood, (created_at, updated_at) in zip(moods, timestamps):
+            mood.created_at, mood.updated_at = created_at, updated_at
+        TrackMood.objects.bulk_update(moods, ["created_at", "updated_at"])
+
+        MoodFeeling.objects.bulk_create(
+            [
+                MoodFeeling.objects._row(mood, feeling)
+                for mood in moods
+                for feeling in dict.fromkeys(mood.feel or [])
+            ],
+            ignore_conflicts=True,
+        )
+        JournalSearchService.refresh(mood_ids=[mood.id for mood in moods])
+
+        MoodArchive.objects.filter(id__in=[archive.id for archive in archives]).delete()
+        return len(moods)
+
+    @staticmethod
+    def entries(*, user, start_date: date, end_date: date) -> Iterator[dict]:
+        """Archived entries of ``user`` with ``mood_date`` in [start_date, end_date]."""
+        payloads = (
+            MoodArchive.objects
+            .filter(user=user, month__range=(_month(start_date), end_date))
+            .order_by("month")
+            .values_list("payload", flat=True)
+        )
+        for payload in payloads:
+            for entry in unpack_entries(payload):
+                if start_date <= entry["mood_date"] <= end_date:
+                    yield entry
+
+    @staticmethod
+    async def aiter_rows(*, user) -> AsyncIterator[tuple]:
+        """All archived entries of ``user`` as ENTRY_FIELDS tuples, ordered by mood_date."""
+        payloads = (
+            MoodArchive.objects
+            .filter(user=user)
+            .order_by("month")
+            .values_list("payload", flat=True)
+        )
+        async for payload in aiter_queryset(payloads, chunk_size=ARCHIVE_CHUNK_SIZE):
+            for entry in unpack_entries(payload):
+                yield tuple(entry[field] for field in ENTRY_FIELDS)
+
+
+async def merge_tiers(hot: AsyncIterator[tuple], archived: AsyncIterator[tuple]) -> AsyncIterator[tuple]:
+    """
+    Merge two ENTRY_FIELDS streams that are both ordered by mood_date. When a
+    day appears in both, only the hot row is kept.
+    """
+    date_index = ENTRY_FIELDS.index("mood_date")
+    hot_row = await anext(hot, None)
+    archived_row = await anext(archived, None)
+
+    while hot_row is not None or archived_row is not None:
+        if archived_row is None or (hot_row is not None and hot_row[date_index] <= archived_row[date_index]):
+            if archived_row is not None and hot_row[date_index] == archived_row[date_index]:
+                archived_row = await anext(archived, None)
+            yield hot_row
+            hot_row = await anext(hot, None)
+        else:
+            yield archived_row
+            archived_row = await anext(archived, None)
@@ -0,0 +1,82 @@
+import threading
+import time
+import uuid
+from typing import Dict, List, Optional
+
+from django.core.cache import cache
+
+from account.caching import cache_is_shared, unshared_cache_ttl
+from .models import CoachingStyle
+
+CATALOG_VERSION_KEY = "onboarding:coaching_style_catalog:version"
+
+
+class CoachingStyleCatalog:
+    """
+    Per-worker, in-memory catalog of active coaching styles.
+
+    The catalog is loaded once per worker and reloaded only when the shared
+    version key changes, which happens whenever a CoachingStyle is saved or
+    deleted (see ``onboarding.signals``). Checking freshness costs one cache
+    read and no database queries.
+
+    The version key only reaches every worker through a shared cache
+    (REDIS_URL). With the per-process default cache, a worker also reloads
+    once its copy is older than UNSHARED_CACHE_TTL seconds.
+    """
+
+    _lock = threading.Lock()
+    _version: Optional[str] = None
+    _loaded_at: float = 0.0
+    _by_value: Dict[str, CoachingStyle] = {}
+    _by_pk: Dict[int, CoachingStyle] = {}
+    _styles: List[CoachingStyle] = []
+
+    @staticmethod
+    def _shared_version() -> str:
+        version = cache.get(CATALOG_VERSION_KEY)
+        if version is None:
+            cache.add(CATALOG_VERSION_KEY, uuid.uuid4().hex, timeout=None)
+            version = cache.get(CATALOG_VERSION_KEY)
+        return version
+
+    @classmethod
+    def _is_fresh(cls, version: str) -> bool:
+        return version == cls._version and (
+            cache_is_shared() or time.monotonic() - cls._loaded_at < unshared_cache_ttl()
+        )
+
+    @classmethod
+    def _ensure_loaded(cls) -> None:
+        version = cls._shared_version()
+        if cls._is_fresh(version):
+            return
+
+        with cls._lock:
+            if cls._is_fresh(version):
+                return
+            styles = list(CoachingStyle.objects.filter(is_active=True).order_by("order", "id"))
+            cls._by_value = {style.value: style for style in styles}
+            cls._by_pk = {style.pk: style for style in styles}
+            cls._styles = styles
+            cls._version = version
+            cls._loaded_at = time.monotonic()
+
+    @classmethod
+    def get(cls, value: str) -> Optional[CoachingStyle]:
+        cls._ensure_loaded()
+        return cls._by_value.get(value)
+
+    @classmethod
+    def get_by_pk(cls, pk: int) -> Optional[CoachingStyle]:
+        cls._ensure_loaded()
+        return cls._by_pk.get(pk)
+
+    @classmethod
+    def all(cls) -> List[CoachingStyle]:
+        cls._ensure_loaded()
+        return list(cls._styles)
+
+    @staticmethod
+    def invalidate() -> None:
+        cache.set(CATALOG_VERSION_KEY, uuid.uuid4().hex, timeout=None)
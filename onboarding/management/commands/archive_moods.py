@@ -0,0 +1,68 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.utils import timezone
+
+from onboarding.archive import MoodArchiveService, hot_table_bytes
+from onboarding.models import TrackMood
+
+
+def _size(value):
+    return "n/a" if value is None else f"{value / 1024:.1f} KiB"
+
+
+class Command(BaseCommand):
+    help = (
+        "Roll mood entries from whole months older than --older-than-days into "
+        "compressed per-user monthly archives, and report the storage saved."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--older-than-days", type=int, default=90)
+        parser.add_argument("--user-id", type=int, help="Only archive this user.")
+        parser.add_argument(
+            "--vacuum", action="store_true",
+            help="VACUUM the mood table afterwards. Freed pages become reusable; files only shrink with VACUUM FULL.",
+        )
+
+    def handle(self, *args, **options):
+        before = timezone.localdate() - timedelta(days=options["older_than_days"])
+
+        user_ids = TrackMood.objects.filter(mood_date__lt=before.replace(day=1))
+        if options["user_id"]:
+            user_ids = user_ids.filter(user_id=options["user_id"])
+        user_ids = list(user_ids.order_by("user_id").values_list("user_id", flat=True).distinct())
+
+        hot_rows_before = TrackMood.objects.count()
+        hot_bytes_before = hot_table_bytes()
+
+        totals = {"months": 0, "entries": 0, "raw_bytes": 0, "compressed_bytes": 0, "hot_row_bytes": 0}
+        for user_id in user_ids:
+            stats = MoodArchiveService.archive_user(user_id=user_id, before=before)
+            for key in totals:
+                totals[key] += stats[key]
+
+        if options["vacuum"]:
+            with connection.cursor() as cursor:
+                cursor.execute(f"VACUUM {TrackMood._meta.db_table}" if connection.vendor == "postgresql" else "VACUUM")
+
+        hot_rows_after = TrackMood.objects.count()
+        hot_bytes_after = hot_table_bytes()
+
+        saved = totals["raw_bytes"] - totals["compressed_bytes"]
+        ratio = totals["compressed_bytes"] / totals["raw_bytes"] if totals["raw_bytes"] else 0
+
+        self.stdout.write(
+            f"Archived {totals['entries']} entries from {len(user_ids)} user(s) "
+            f"into {totals['months']} monthly archive(s) (before {before.replace(day=1)})."
+        )
+        self.stdout.write(
+            f"Archive payloads: {_size(totals['raw_bytes'])} JSON -> {_size(totals['compressed_bytes'])} "
+            f"compressed ({ratio:.0%}), {_size(saved)} saved."
+        )
+        self.stdout.write(
+            f"Hot rows: {hot_rows_before} -> {hot_rows_after}"
+            + (f", {_size(totals['hot_row_bytes'])} of row data removed." if totals["hot_row_bytes"] else ".")
+        )
+        self.stdout.write(f"Hot table size: {_size(hot_bytes_before)} -> {_size(hot_bytes_after)}.")
@@ -0,0 +1,117 @@
+import math
+import time
+from datetime import date
+
+import numpy as np
+from django.core.management.base import BaseCommand
+
+from onboarding.analytics import (
+    MoodColumns,
+    RetentionColumns,
+    cohort_retention,
+    compute_population_stats,
+    rolling_trend,
+)
+
+
+def _timed(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings), sum(timings) / len(timings)
+
+
+def _rolling_trend_loop(values, window=7):
+    """Straightforward per-day loop, kept as the baseline for rolling_trend."""
+    n = len(values)
+    mean, std, wow = [None] * n, [None] * n, [None] * n
+    for i in range(n):
+        seen = [v for v in values[max(0, i - window + 1):i + 1] if not math.isnan(v)]
+        if seen:
+            mean[i] = sum(seen) / len(seen)
+        if len(seen) >= 2:
+            std[i] = math.sqrt(sum((v - mean[i]) ** 2 for v in seen) / len(seen))
+        if i >= 7 and mean[i] is not None and mean[i - 7] is not None:
+            wow[i] = mean[i] - mean[i - 7]
+    points = [(i, v) for i, v in enumerate(values) if not math.isnan(v)]
+    x_mean = sum(i for i, _ in points) / len(points)
+    y_mean = sum(v for _, v in points) / len(points)
+    slope = (
+        sum((i - x_mean) * (v - y_mean) for i, v in points)
+        / sum((i - x_mean) ** 2 for i, _ in points)
+    )
+    return mean, std, wow, slope
+
+
+class Command(BaseCommand):
+    help = "Benchmark the vectorized mood analytics kernels on synthetic data (no database access)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--suite", choices=["population", "trend", "retention", "all"], default="all")
+        parser.add_argument("--rows", type=int, default=10_000_000)
+        parser.add_argument("--users", type=int, default=200_000)
+        parser.add_argument("--days", type=int, default=365)
+        parser.add_argument("--cohort-users", type=int, default=1_000_000)
+        parser.add_argument("--entries-per-user", type=int, default=20)
+        parser.add_argument("--repeat", type=int, default=3)
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        rng = np.random.default_rng(options["seed"])
+        if options["suite"] in ("population", "all"):
+            self._population(rng, options)
+        if options["suite"] in ("trend", "all"):
+            self._trend(rng, options)
+        if options["suite"] in ("retention", "all"):
+            self._retention(rng, options)
+
+    def _population(self, rng, options):
+        rows, users = options["rows"], options["users"]
+        columns = MoodColumns(
+            user_ids=rng.integers(1, users + 1, rows, dtype=np.int64),
+            days=np.datetime64("2025-01-01") + rng.integers(0, 365, rows).astype("timedelta64[D]"),
+            scores=rng.integers(0, 5, rows, dtype=np.int8),
+            styles=rng.integers(0, 6, rows, dtype=np.int32),
+            countries=rng.integers(0, 60, rows, dtype=np.int32),
+            style_labels=[f"style-{i}" for i in range(6)],
+            country_labels=[f"C{i:02d}" for i in range(60)],
+        )
+        best, mean = _timed(lambda: compute_population_stats(columns), options["repeat"])
+        self.stdout.write(self.style.SUCCESS(
+            f"population stats, {rows:,} rows / {users:,} users: best {best:.3f}s, mean {mean:.3f}s"
+        ))
+
+    def _trend(self, rng, options):
+        days = options["days"]
+        values = rng.integers(0, 5, days).astype(np.float64)
+        values[rng.random(days) < 0.3] = np.nan  # ~30% of days without a check-in
+        as_list = values.tolist()
+        repeat = max(options["repeat"], 1) * 100
+
+        numpy_best, _ = _timed(lambda: rolling_trend(values), repeat)
+        loop_best, _ = _timed(lambda: _rolling_trend_loop(as_list), repeat)
+        self.stdout.write(self.style.SUCCESS(
+            f"rolling trend, {days} days: numpy {numpy_best * 1e6:.0f}us, "
+            f"python loop {loop_best * 1e6:.0f}us ({loop_best / numpy_best:.1f}x)"
+        ))
+
+    def _retention(self, rng, options):
+        users = options["cohort_users"]
+        start = np.datetime64("2024-01-01")
+        joined = start + rng.integers(0, 730, users).astype("timedelta64[D]")
+        entries = users * options["entries_per_user"]
+        owners = rng.integers(0, users, entries)
+        columns = RetentionColumns(
+            user_ids=np.arange(1, users + 1, dtype=np.int64),
+            joined=joined,
+            activity_user_ids=owners + 1,
+            # Entries fall within ~20 weeks of signup, so later weeks thin out.
+            activity_days=joined[owners] + rng.integers(0, 140, entries).astype("timedelta64[D]"),
+        )
+        as_of = date(2026, 1, 1)
+        best, mean = _timed(lambda: cohort_retention(columns, as_of), options["repeat"])
+        self.stdout.write(self.style.SUCCESS(
+            f"cohort retention, {users:,} users / {entries:,} entries: best {best:.3f}s, mean {mean:.3f}s"
+        ))
@@ -0,0 +1,69 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError
+from django.db.models import Avg
+from django.utils import timezone
+
+from onboarding.models import TrackMood
+from onboarding.partitions import TrackMoodPartitionService, add_months, month_start
+
+
+class Command(BaseCommand):
+    help = (
+        "Create upcoming monthly TrackMood partitions, optionally detach old ones, "
+        "and check that the mood report query prunes partitions (PostgreSQL only)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--months-ahead", type=int, default=3)
+        parser.add_argument(
+            "--retain-months", type=int, default=None,
+            help="Detach partitions that end before the start of the month this many months ago.",
+        )
+        parser.add_argument("--drop", action="store_true", help="Drop detached partitions instead of keeping them.")
+        parser.add_argument("--check-pruning", action="store_true")
+
+    def handle(self, *args, **options):
+        if not TrackMoodPartitionService.is_partitioned():
+            self.stdout.write("onboarding_trackmood is not partitioned on this database; nothing to do.")
+            return
+
+        try:
+            created = TrackMoodPartitionService.ensure_partitions(months_ahead=options["months_ahead"])
+        except DatabaseError as exc:
+            raise CommandError(f"Could not create partitions: {exc}")
+        self.stdout.write(f"Created {len(created)} partition(s): {', '.join(created) or '-'}")
+
+        if options["retain_months"] is not None:
+            before = add_months(month_start(timezone.localdate()), -options["retain_months"])
+            detached = TrackMoodPartitionService.detach_partitions(before=before, drop=options["drop"])
+            action = "Dropped" if options["drop"] else "Detached"
+            self.stdout.write(f"{action} {len(detached)} partition(s): {', '.join(detached) or '-'}")
+
+        if options["check_pruning"]:
+            self._check_pruning()
+
+    def _check_pruning(self):
+        total = len(TrackMoodPartitionService.list_partitions()) + 1
+        today = timezone.localdate()
+        failed = False
+
+        # Same shape as the hot-table query in TrackMoodService.daily_averages,
+        # which MoodReportAPIView uses.
+        for days in (7, 30, 90, 365):
+            queryset = (
+                TrackMood.objects
+                .filter(user_id=0, mood_date__range=(today - timedelta(days=days - 1), today))
+                .values("mood_date")
+                .annotate(avg_mood=Avg("mood_score"))
+            )
+            scanned = TrackMoodPartitionService.scanned_partitions(queryset)
+            self.stdout.write(f"report range={days}d scans {len(scanned)}/{total}: {', '.join(scanned)}")
+            expected = days // 28 + 2
+            if len(scanned) > expected:
+                failed = True
+
+        if failed:
+            raise CommandError("Mood report queries are not pruning partitions.")
+        self.stdout.write(self.style.SUCCESS("Partition pruning OK"))
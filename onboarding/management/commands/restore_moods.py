@@ -0,0 +1,35 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from onboarding.archive import MoodArchiveService
+from onboarding.models import MoodArchive
+
+
+def _month(value: str) -> date:
+    try:
+        return date.fromisoformat(f"{value}-01")
+    except ValueError:
+        raise CommandError(f"Invalid month '{value}'. Use YYYY-MM.")
+
+
+class Command(BaseCommand):
+    help = "Move archived mood entries back into the hot TrackMood table."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user-id", type=int, help="Only restore this user (default: all archived users).")
+        parser.add_argument("--month", action="append", type=_month, help="YYYY-MM; may be repeated.")
+
+    def handle(self, *args, **options):
+        archives = MoodArchive.objects.all()
+        if options["user_id"]:
+            archives = archives.filter(user_id=options["user_id"])
+        if options["month"]:
+            archives = archives.filter(month__in=options["month"])
+        user_ids = list(archives.order_by("user_id").values_list("user_id", flat=True).distinct())
+
+        restored = 0
+        for user_id in user_ids:
+            restored += MoodArchiveService.restore_user(user_id=user_id, months=options["month"])
+
+        self.stdout.write(f"Restored {restored} entries for {len(user_ids)} user(s).")
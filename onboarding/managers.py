@@ -0,0 +1,198 @@
+import json
+from typing import List
+
+from django.db import connections, models
+from django.utils import timezone
+
+
+class TrackMoodManager(models.Manager):
+
+    def upsert_for_day(self, *, user, mood_date, mood_score, feel=None, journal=""):
+        """
+        Create or overwrite the user's entry for ``mood_date`` with a single
+        ``INSERT ... ON CONFLICT DO UPDATE`` statement.
+
+        Returns ``(mood, created)``. A freshly inserted row is the only case in
+        which ``created_at`` equals ``updated_at``, since both are bound to the
+        same timestamp here and an update only moves ``updated_at``.
+        """
+        connection = connections[self.db]
+        opts = self.model._meta
+        now = timezone.now()
+        values = {
+            "user": user.pk,
+            "mood_date": mood_date,
+            "mood_score": mood_score,
+            "feel": feel if feel is not None else [],
+            "journal": journal,
+            "created_at": now,
+            "updated_at": now,
+        }
+
+        quote = connection.ops.quote_name
+        fields = [opts.get_field(name) for name in values]
+        columns = ", ".join(quote(field.column) for field in fields)
+        placeholders = ", ".join(["%s"] * len(fields))
+        params = [
+            field.get_db_prep_save(values[field.name], connection)
+            for field in fields
+        ]
+        updates = ", ".join(
+            f"{quote(column)} = EXCLUDED.{quote(column)}"
+            for column in ("mood_score", "feel", "journal", "updated_at")
+        )
+        returning = ", ".join(quote(field.column) for field in opts.concrete_fields)
+
+        sql = (
+            f"INSERT INTO {quote(opts.db_table)} ({columns}) VALUES ({placeholders}) "
+            f"ON CONFLICT ({quote('user_id')}, {quote('mood_date')}) DO UPDATE SET {updates} "
+            f"RETURNING {returning}, ({quote('created_at')} = {quote('updated_at')}) AS was_created"
+        )
+
+        mood = next(iter(self.raw(sql, params)))
+        created = bool(mood.was_created)
+        del mood.was_created
+        return mood, created
+
+    def _update_feel(self, *, mood_id, user_id, expression, expression_params, condition="", condition_params=()):
+        connection = connections[self.db]
+        quote = connection.ops.quote_name
+        updated_at = self.model._meta.get_field("updated_at").get_db_prep_save(timezone.now(), connection)
+
+        sql = (
+            f"UPDATE {quote(self.model._meta.db_table)} "
+            f"SET {quote('feel')} = {expression}, {quote('updated_at')} = %s "
+            f"WHERE {quote('id')} = %s AND {quote('user_id')} = %s {condition}"
+            f"RETURNING {quote('id')}, {quote('user_id')}, {quote('feel')}, "
+            f"{quote('mood_score')}, {quote('mood_date')}"
+        )
+        params = [*expression_params, updated_at, mood_id, user_id, *condition_params]
+        return next(iter(self.raw(sql, params)), None)
+
+    def append_feel(self, *, mood_id, user_id, feeling: str):
+        """
+        Add ``feeling`` to the mood's feel list in one UPDATE, without reading
+        the row first. Returns the mood with id/user/feel/score/date loaded,
+        or None if no such mood belongs to the user.
+        """
+        if connections[self.db].vendor == "postgresql":
+            expression = (
+                "CASE WHEN feel @> jsonb_build_array(%s::text) THEN feel "
+                "ELSE feel || jsonb_build_array(%s::text) END"
+            )
+        else:
+            expression = (
+                "CASE WHEN EXISTS (SELECT 1 FROM json_each(feel) WHERE value = %s) THEN feel "
+                "ELSE json_insert(feel, '$[#]', %s) END"
+            )
+        return self._update_feel(
+            mood_id=mood_id, user_id=user_id, expression=expression, expression_params=[feeling, feeling]
+        )
+
+    def discard_feel(self, *, mood_id, user_id, feeling: str):
+        """Remove ``feeling`` from the mood's feel list in one UPDATE; see append_feel."""
+        if connections[self.db].vendor == "postgresql":
+            expression = "feel - %s::text"
+        else:
+            expression = "(SELECT json_group_array(value) FROM json_each(feel) WHERE value <> %s)"
+        return self._update_feel(
+            mood_id=mood_id, user_id=user_id, expression=expression, expression_params=[feeling]
+        )
+
+
+    def change_feel(self, *, mood_id, user_id, add: List[str], remove: List[str]):
+        """
+        Apply every addition and removal to the mood's feel list in one
+        UPDATE; removals win over additions of the same feeling. The row is
+        only written when the list actually changes.
+
+        Returns ``(mood, changed)`` with id/user/feel/score/date loaded, or
+        ``(None, False)`` if no such mood belongs to the user.
+        """
+        remove = list(dict.fromkeys(remove))
+        add = [feeling for feeling in dict.fromkeys(add) if feeling not in remove]
+
+        if connections[self.db].vendor == "postgresql":
+            expression = (
+                "(SELECT COALESCE(jsonb_agg(value ORDER BY ord), '[]'::jsonb) FROM ("
+                "  SELECT kept.value, kept.ord FROM jsonb_array_elements(feel) WITH ORDINALITY AS kept(value, ord)"
+                "  WHERE NOT (kept.value #>> '{}') = ANY(%s::text[])"
+                "  UNION ALL"
+                "  SELECT to_jsonb(added.value), 2147483647 + added.ord"
+                "  FROM unnest(%s::text[]) WITH ORDINALITY AS added(value, ord)"
+                "  WHERE NOT feel ? added.value"
+                ") AS merged)"
+            )
+            condition = (
+                "AND (feel ?| %s::text[] "
+                "OR EXISTS (SELECT 1 FROM unnest(%s::text[]) AS added(value) WHERE NOT feel ? added.value)) "
+            )
+            expression_params = [remove, add]
+            condition_params = [remove, add]
+        else:
+            expression = (
+                "(SELECT json_group_array(value) FROM ("
+                "  SELECT kept.value, kept.key AS ord FROM json_each(feel) AS kept"
+                "  WHERE kept.value NOT IN (SELECT value FROM json_each(%s))"
+                "  UNION ALL"
+                "  SELECT added.value, 2147483647 + added.key FROM json_each(%s) AS added"
+                "  WHERE added.value NOT IN (SELECT value FROM json_each(feel))"
+                "  ORDER BY ord"
+                "))"
+            )
+            condition = (
+                "AND (EXISTS (SELECT 1 FROM json_each(feel) WHERE value IN (SELECT value FROM json_each(%s))) "
+                "OR EXISTS (SELECT 1 FROM json_each(%s) AS added "
+                "WHERE added.value NOT IN (SELECT value FROM json_each(feel)))) "
+            )
+            expression_params = [json.dumps(remove), json.dumps(add)]
+            condition_params = [json.dumps(remove), json.dumps(add)]
+
+        mood = self._update_feel(
+            mood_id=mood_id, user_id=user_id,
+            expression=expression, expression_params=expression_params,
+            condition=condition, condition_params=condition_params,
+        )
+        if mood is not None:
+            return mood, True
+        # Nothing to change, or no such mood.
+        mood = (
+            self.filter(id=mood_id, user_id=user_id)
+            .only("id", "user_id", "feel", "mood_score", "mood_date")
+            .first()
+        )
+        return mood, False
+
+
+class MoodFeelingManager(models.Manager):
+    """Keeps the normalized feeling index in step with ``TrackMood.feel``."""
+
+    def _row(self, mood, feeling):
+        return self.model(
+            mood_id=mood.id,
+            user_id=mood.user_id,
+            feeling=feeling,
+            mood_score=mood.mood_score,
+            mood_date=mood.mood_date,
+        )
+
+    def sync(self, mood) -> None:
+        self.filter(mood_id=mood.id).delete()
+        self.bulk_create(
+            [self._row(mood, feeling) for feeling in dict.fromkeys(mood.feel or [])],
+            ignore_conflicts=True,
+        )
+
+    def add(self, mood, feeling: str) -> None:
+        self.bulk_create([self._row(mood, feeling)], ignore_conflicts=True)
+
+    def remove(self, mood, feeling: str) -> None:
+        self.filter(mood_id=mood.id, feeling=feeling).delete()
+
+    def apply_change(self, mood, *, add: List[str], remove: List[str]) -> None:
+        """Index a change_feel() result: one delete and one bulk insert."""
+        if remove:
+            self.filter(mood_id=mood.id, feeling__in=remove).delete()
+        added = [feeling for feeling in dict.fromkeys(add) if feeling in mood.feel]
+        if added:
+            self.bulk_create([self._row(mood, feeling) for feeling in added], ignore_conflicts=True)
@@ -0,0 +1,50 @@
+# Generated by Django 5.2.9 on 2026-10-19 16:45
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        schema_editor.execute(
+            "CREATE INDEX onboarding_trackmood_search_gin "
+            "ON onboarding_trackmood USING gin (search_vector)"
+        )
+        schema_editor.execute(
+            "UPDATE onboarding_trackmood "
+            "SET search_vector = to_tsvector('english', journal)"
+        )
+    elif vendor == "sqlite":
+        schema_editor.execute(
+            "CREATE VIRTUAL TABLE onboarding_trackmood_fts "
+            "USING fts5(journal, user_id UNINDEXED)"
+        )
+        schema_editor.execute(
+            "INSERT INTO onboarding_trackmood_fts (rowid, journal, user_id) "
+            "SELECT id, journal, user_id FROM onboarding_trackmood WHERE journal <> ''"
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        schema_editor.execute("DROP INDEX IF EXISTS onboarding_trackmood_search_gin")
+    elif vendor == "sqlite":
+        schema_editor.execute("DROP TABLE IF EXISTS onboarding_trackmood_fts")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('onboarding', '0005_alter_trackmood_options_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='trackmood',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, help_text='Journal tsvector maintained by JournalSearchService (PostgreSQL only)', null=True),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.2.9 on 2026-10-19 16:46
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_mood_feelings(apps, schema_editor):
+    TrackMood = apps.get_model("onboarding", "TrackMood")
+    MoodFeeling = apps.get_model("onboarding", "MoodFeeling")
+
+    batch = []
+    moods = TrackMood.objects.exclude(feel=[]).values_list(
+        "id", "user_id", "feel", "mood_score", "mood_date"
+    )
+    for mood_id, user_id, feel, mood_score, mood_date in moods.iterator(chunk_size=2000):
+        for feeling in dict.fromkeys(feel or []):
+            batch.append(MoodFeeling(
+                mood_id=mood_id,
+                user_id=user_id,
+                feeling=str(feeling)[:100],
+                mood_score=mood_score,
+                mood_date=mood_date,
+            ))
+        if len(batch) >= 2000:
+            MoodFeeling.objects.bulk_create(batch, ignore_conflicts=True)
+            batch = []
+    MoodFeeling.objects.bulk_create(batch, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('onboarding', '0006_trackmood_search_vector'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MoodFeeling',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('feeling', models.CharField(max_length=100)),
+                ('mood_score', models.SmallIntegerField(choices=[(0, 'Sad'), (1, 'Unhappy'), (2, 'Neutral'), (3, 'Happy'), (4, 'Very Happy')])),
+                ('mood_date', models.DateField()),
+                ('mood', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='feelings', to='onboarding.trackmood')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='mood_feelings', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Mood Feeling',
+                'verbose_name_plural': 'Mood Feelings',
+                'indexes': [models.Index(fields=['user', 'mood_date', 'feeling'], name='onboarding__user_id_8bf25a_idx'), models.Index(fields=['user', 'feeling', 'mood_date'], name='onboarding__user_id_3982da_idx')],
+                'constraints': [models.UniqueConstraint(fields=('mood', 'feeling'), name='unique_mood_feeling')],
+            },
+        ),
+        migrations.RunPython(backfill_mood_feelings, migrations.RunPython.noop),
+    ]
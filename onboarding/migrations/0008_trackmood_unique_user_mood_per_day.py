@@ -0,0 +1,57 @@
+# Generated by Django 5.2.9 on 2026-10-19 16:53
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def dedupe_moods_per_day(apps, schema_editor):
+    """Keep only the most recently updated entry per (user, mood_date)."""
+    TrackMood = apps.get_model("onboarding", "TrackMood")
+
+    duplicates = (
+        TrackMood.objects
+        .values("user_id", "mood_date")
+        .annotate(entries=Count("id"))
+        .filter(entries__gt=1)
+    )
+
+    stale_ids = []
+    for group in duplicates.iterator():
+        ids = list(
+            TrackMood.objects
+            .filter(user_id=group["user_id"], mood_date=group["mood_date"])
+            .order_by("-updated_at", "-id")
+            .values_list("id", flat=True)
+        )
+        stale_ids.extend(ids[1:])
+
+    for start in range(0, len(stale_ids), 1000):
+        batch = stale_ids[start:start + 1000]
+        TrackMood.objects.filter(id__in=batch).delete()
+        if schema_editor.connection.vendor == "sqlite":
+            placeholders = ", ".join(["%s"] * len(batch))
+            schema_editor.execute(
+                f"DELETE FROM onboarding_trackmood_fts WHERE rowid IN ({placeholders})",
+                batch,
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('onboarding', '0007_moodfeeling'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(dedupe_moods_per_day, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='trackmood',
+            constraint=models.UniqueConstraint(fields=('user', 'mood_date'), name='unique_user_mood_per_day'),
+        ),
+        migrations.RemoveIndex(
+            model_name='trackmood',
+            name='onboarding__user_id_2f8ff7_idx',
+        ),
+    ]
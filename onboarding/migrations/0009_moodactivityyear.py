@@ -0,0 +1,63 @@
+# Generated by Django 5.2.9 on 2026-10-19 16:56
+
+import django.db.models.deletion
+import onboarding.models
+from django.conf import settings
+from django.db import migrations, models
+
+DAY_BYTES = 46
+LEVEL_BYTES = 138
+BATCH_SIZE = 1000
+
+
+def backfill_activity(apps, schema_editor):
+    TrackMood = apps.get_model("onboarding", "TrackMood")
+    MoodActivityYear = apps.get_model("onboarding", "MoodActivityYear")
+
+    bitmaps = {}
+    rows = TrackMood.objects.values_list("user_id", "mood_date", "mood_score").iterator(chunk_size=BATCH_SIZE)
+    for user_id, mood_date, mood_score in rows:
+        i = mood_date.timetuple().tm_yday - 1
+        days, levels = bitmaps.get((user_id, mood_date.year), (0, 0))
+        bitmaps[(user_id, mood_date.year)] = (days | (1 << i), levels | ((mood_score + 1) << (3 * i)))
+
+    MoodActivityYear.objects.bulk_create(
+        [
+            MoodActivityYear(
+                user_id=user_id,
+                year=year,
+                days=days.to_bytes(DAY_BYTES, "little"),
+                levels=levels.to_bytes(LEVEL_BYTES, "little"),
+            )
+            for (user_id, year), (days, levels) in bitmaps.items()
+        ],
+        batch_size=BATCH_SIZE,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('onboarding', '0008_trackmood_unique_user_mood_per_day'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MoodActivityYear',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.PositiveSmallIntegerField()),
+                ('days', models.BinaryField(default=onboarding.models.empty_activity_days)),
+                ('levels', models.BinaryField(default=onboarding.models.empty_activity_levels)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='mood_activity_years', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Mood Activity Year',
+                'verbose_name_plural': 'Mood Activity Years',
+                'constraints': [models.UniqueConstraint(fields=('user', 'year'), name='unique_user_activity_year')],
+            },
+        ),
+        migrations.RunPython(backfill_activity, migrations.RunPython.noop),
+    ]
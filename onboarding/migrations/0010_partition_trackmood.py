@@ -0,0 +1,125 @@
+# Generated by Django 5.2.9 on 2026-10-19 17:10
+
+from datetime import date
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+TABLE = "onboarding_trackmood"
+OLD_TABLE = "onboarding_trackmood_old"
+MONTHS_AHEAD = 3
+MAX_MONTHS_BACK = 120
+
+
+def _add_months(day, months):
+    month = day.month - 1 + months
+    return date(day.year + month // 12, month % 12 + 1, 1)
+
+
+def _rebuild(cursor, partitioned):
+    """
+    Recreate the table as partitioned (or plain) and copy the rows over,
+    keeping column defaults, the id sequence, constraint and index names.
+    """
+    cursor.execute(
+        "SELECT conname, contype, pg_get_constraintdef(oid) FROM pg_constraint "
+        "WHERE conrelid = %s::regclass AND contype IN ('p', 'u', 'f')",
+        [TABLE],
+    )
+    constraints = cursor.fetchall()
+    cursor.execute(
+        "SELECT indexname, indexdef FROM pg_indexes "
+        "WHERE schemaname = current_schema() AND tablename = %s "
+        "AND indexname NOT IN (SELECT conname FROM pg_constraint WHERE conrelid = %s::regclass)",
+        [TABLE, TABLE],
+    )
+    indexes = cursor.fetchall()
+    cursor.execute(
+        "SELECT attidentity <> '' FROM pg_attribute WHERE attrelid = %s::regclass AND attname = 'id'",
+        [TABLE],
+    )
+    is_identity = cursor.fetchone()[0]
+    cursor.execute("SELECT pg_get_serial_sequence(%s, 'id')", [TABLE])
+    sequence = cursor.fetchone()[0]
+
+    cursor.execute(f"ALTER TABLE {TABLE} RENAME TO {OLD_TABLE}")
+    for name, contype, _ in sorted(constraints, key=lambda row: row[1] != "f"):
+        cursor.execute(f'ALTER TABLE {OLD_TABLE} DROP CONSTRAINT "{name}"')
+    for name, _ in indexes:
+        cursor.execute(f'DROP INDEX "{name}"')
+
+    cursor.execute(
+        f"CREATE TABLE {TABLE} (LIKE {OLD_TABLE} INCLUDING DEFAULTS INCLUDING IDENTITY "
+        f"INCLUDING CONSTRAINTS INCLUDING STORAGE)"
+        + (" PARTITION BY RANGE (mood_date)" if partitioned else "")
+    )
+
+    if partitioned:
+        cursor.execute(f"SELECT min(mood_date) FROM {OLD_TABLE}")
+        oldest = cursor.fetchone()[0]
+        current = date.today().replace(day=1)
+        # Cover at least the past year so back-dated entries get a partition;
+        # anything older than MAX_MONTHS_BACK goes to the default partition.
+        month = min(_add_months(current, -12), (oldest or current).replace(day=1))
+        month = max(month, _add_months(current, -MAX_MONTHS_BACK))
+        while month <= _add_months(current, MONTHS_AHEAD):
+            cursor.execute(
+                f"CREATE TABLE {TABLE}_p{month:%Y%m} PARTITION OF {TABLE} "
+                f"FOR VALUES FROM ('{month.isoformat()}') TO ('{_add_months(month, 1).isoformat()}')"
+            )
+            month = _add_months(month, 1)
+        cursor.execute(f"CREATE TABLE {TABLE}_default PARTITION OF {TABLE} DEFAULT")
+
+    cursor.execute(f"INSERT INTO {TABLE} SELECT * FROM {OLD_TABLE}")
+
+    if is_identity:
+        cursor.execute(
+            f"SELECT setval(pg_get_serial_sequence(%s, 'id'), coalesce(max(id), 0) + 1, false) FROM {TABLE}",
+            [TABLE],
+        )
+    elif sequence:
+        # serial column: the default still points at the old sequence.
+        cursor.execute(f"ALTER SEQUENCE {sequence} OWNED BY {TABLE}.id")
+    cursor.execute(f"DROP TABLE {OLD_TABLE}")
+
+    # Unique constraints on a partitioned table must include the partition key.
+    primary_key = "PRIMARY KEY (id, mood_date)" if partitioned else "PRIMARY KEY (id)"
+    for name, contype, definition in sorted(constraints, key=lambda row: row[1] == "f"):
+        cursor.execute(
+            f'ALTER TABLE {TABLE} ADD CONSTRAINT "{name}" '
+            + (primary_key if contype == "p" else definition)
+        )
+    for _, definition in indexes:
+        cursor.execute(definition)
+
+
+def partition_trackmood(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    with schema_editor.connection.cursor() as cursor:
+        _rebuild(cursor, partitioned=True)
+
+
+def unpartition_trackmood(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    with schema_editor.connection.cursor() as cursor:
+        _rebuild(cursor, partitioned=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('onboarding', '0009_moodactivityyear'),
+    ]
+
+    operations = [
+        # A foreign key must reference a unique constraint, and the partitioned
+        # table's primary key is (id, mood_date); deletes still cascade in Django.
+        migrations.AlterField(
+            model_name='moodfeeling',
+            name='mood',
+            field=models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.CASCADE, related_name='feelings', to='onboarding.trackmood'),
+        ),
+        migrations.RunPython(partition_trackmood, unpartition_trackmood),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.9 on 2026-10-19 17:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('onboarding', '0011_moodarchive'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CohortRetentionReport',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('as_of', models.DateField()),
+                ('user_count', models.PositiveIntegerField(default=0)),
+                ('duration_ms', models.PositiveIntegerField(default=0)),
+                ('payload', models.JSONField(default=dict)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+            options={
+                'verbose_name': 'Cohort Retention Report',
+                'verbose_name_plural': 'Cohort Retention Reports',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
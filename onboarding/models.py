@@ -1,5 +1,8 @@
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth import get_user_model
+from django.contrib.postgres.search import SearchVectorField
+
+from .managers import MoodFeelingManager, TrackMoodManager
 
 User = get_user_model()
 
@@ -73,9 +76,13 @@ class OnboardingStep(models.Model):
         return f"OnboardingStep(user={self.user_id}, style={style_name})"
 
     def save(self, *args, **kwargs):
-        if self.coaching_style_id:
-            self.coaching_style_value = self.coaching_style_id.value
-            self.coaching_style_name = self.coaching_style_id.name
+        from .catalog import CoachingStyleCatalog
+
+        if self.coaching_style_id_id:
+            # Snapshot from the in-memory catalog; fall back to the FK for inactive styles.
+            style = CoachingStyleCatalog.get_by_pk(self.coaching_style_id_id) or self.coaching_style_id
+            self.coaching_style_value = style.value
+            self.coaching_style_name = style.name
         super().save(*args, **kwargs)
 
     @property
@@ -135,9 +142,20 @@ class TrackMood(models.Model):
         auto_now=True
     )
 
+    search_vector = SearchVectorField(
+        null=True,
+        editable=False,
+        help_text="Journal tsvector maintained by JournalSearchService (PostgreSQL only)"
+    )
+
+    objects = TrackMoodManager()
+
     class Meta:
+        constraints = [
+            # Also serves the (user, mood_date) lookups the old composite index covered.
+            models.UniqueConstraint(fields=["user", "mood_date"], name="unique_user_mood_per_day"),
+        ]
         indexes = [
-            models.Index(fields=["user", "mood_date"]),
             models.Index(fields=["user", "created_at"]),
             models.Index(fields=["user", "mood_score"]),
         ]
@@ -153,13 +171,169 @@ class TrackMood(models.Model):
         return dict(self.MOOD_CHOICES).get(self.mood_score, "Unknown")
 
     def add_feel(self, new_feel: str) -> None:
-        if new_feel and new_feel not in self.feel:
-            self.feel.append(new_feel)
-            self.save(update_fields=["feel", "updated_at"])
+        if not new_feel:
+            return
+        with transaction.atomic():
+            mood = TrackMood.objects.append_feel(mood_id=self.id, user_id=self.user_id, feeling=new_feel)
+            if mood is not None:
+                self.feel = mood.feel
+                MoodFeeling.objects.add(mood, new_feel)
 
     def remove_feel(self, remove_feel: str) -> None:
-        if remove_feel in self.feel:
-            self.feel.remove(remove_feel)
-            self.save(update_fields=["feel", "updated_at"])
+        with transaction.atomic():
+            mood = TrackMood.objects.discard_feel(mood_id=self.id, user_id=self.user_id, feeling=remove_feel)
+            if mood is not None:
+                self.feel = mood.feel
+                MoodFeeling.objects.remove(mood, remove_feel)
+
+
+class MoodFeeling(models.Model):
+    """
+    One row per (mood, feeling), denormalizing the mood's score and date so
+    feeling analytics can be aggregated in the database.
+    """
+
+    # No database constraint: on PostgreSQL TrackMood is partitioned by
+    # mood_date and its primary key is (id, mood_date).
+    mood = models.ForeignKey(
+        TrackMood,
+        on_delete=models.CASCADE,
+        related_name="feelings",
+        db_constraint=False
+    )
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="mood_feelings"
+    )
+
+    feeling = models.CharField(max_length=100)
+
+    mood_score = models.SmallIntegerField(choices=TrackMood.MOOD_CHOICES)
+
+    mood_date = models.DateField()
+
+    objects = MoodFeelingManager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["mood", "feeling"], name="unique_mood_feeling"),
+        ]
+        indexes = [
+            models.Index(fields=["user", "mood_date", "feeling"]),
+            models.Index(fields=["user", "feeling", "mood_date"]),
+        ]
+        verbose_name = "Mood Feeling"
+        verbose_name_plural = "Mood Feelings"
+
+    def __str__(self):
+        return f"User:{self.user_id} | {self.feeling} | {self.mood_date}"
+
+
+def empty_activity_days():
+    return bytes(MoodActivityYear.DAY_BYTES)
+
+
+def empty_activity_levels():
+    return bytes(MoodActivityYear.LEVEL_BYTES)
+
+
+class MoodActivityYear(models.Model):
+    """
+    Per-user, per-year check-in bitmaps for calendar heatmaps.
+
+    ``days`` holds one bit per day of the year (bit ``i`` of the little-endian
+    integer is day-of-year ``i + 1``). ``levels`` holds 3 bits per day at bit
+    offset ``3 * i``: 0 for no entry, otherwise ``mood_score + 1``.
+    """
+
+    DAY_BYTES = 46  # ceil(366 / 8)
+    LEVEL_BYTES = 138  # ceil(366 * 3 / 8)
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="mood_activity_years"
+    )
+
+    year = models.PositiveSmallIntegerField()
+
+    days = models.BinaryField(default=empty_activity_days)
 
+    levels = models.BinaryField(default=empty_activity_levels)
 
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["user", "year"], name="unique_user_activity_year"),
+        ]
+        verbose_name = "Mood Activity Year"
+        verbose_name_plural = "Mood Activity Years"
+
+    def __str__(self):
+        return f"User:{self.user_id} | {self.year}"
+
+
+class MoodArchive(models.Model):
+    """
+    One month of a user's archived mood entries, stored as a zlib-compressed
+    JSON payload (see ``onboarding.archive``) instead of hot TrackMood rows.
+    """
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="mood_archives"
+    )
+
+    month = models.DateField(help_text="First day of the archived month")
+
+    payload = models.BinaryField()
+
+    entry_count = models.PositiveIntegerField(default=0)
+
+    raw_bytes = models.PositiveIntegerField(default=0, help_text="Uncompressed JSON size")
+
+    compressed_bytes = models.PositiveIntegerField(default=0)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["user", "month"], name="unique_user_archive_month"),
+        ]
+        ordering = ["user", "month"]
+        verbose_name = "Mood Archive"
+        verbose_name_plural = "Mood Archives"
+
+    def __str__(self):
+        return f"User:{self.user_id} | {self.month:%Y-%m} | {self.entry_count} entries"
+
+
+class CohortRetentionReport(models.Model):
+    """
+    Nightly signup-cohort x week retention matrix built by
+    ``build_retention_report``; see ``onboarding.analytics.cohort_retention``.
+    """
+
+    as_of = models.DateField()
+
+    user_count = models.PositiveIntegerField(default=0)
+
+    duration_ms = models.PositiveIntegerField(default=0)
+
+    payload = models.JSONField(default=dict)
+
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        verbose_name = "Cohort Retention Report"
+        verbose_name_plural = "Cohort Retention Reports"
+
+    def __str__(self):
+        return f"Retention as of {self.as_of} ({self.user_count} users)"
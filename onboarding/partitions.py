@@ -0,0 +1,181 @@
+import re
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, List, Optional
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .activity import MoodActivityService
+from .models import MoodFeeling, TrackMood
+
+PARTITIONED_TABLE = TrackMood._meta.db_table
+PARTITION_KEY = "mood_date"
+DEFAULT_PARTITION = f"{PARTITIONED_TABLE}_default"
+# Rows read at a time when clearing a dropped partition's activity bits.
+DROP_BATCH_SIZE = 5000
+
+_BOUND_RE = re.compile(r"FOR VALUES FROM \('([\d-]+)'\) TO \('([\d-]+)'\)")
+
+
+@dataclass(frozen=True)
+class Partition:
+    name: str
+    start: date  # inclusive
+    end: date  # exclusive
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def add_months(day: date, months: int) -> date:
+    month = day.month - 1 + months
+    return date(day.year + month // 12, month % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{PARTITIONED_TABLE}_p{month:%Y%m}"
+
+
+class TrackMoodPartitionService:
+    """
+    Monthly range partitions of the TrackMood table on ``mood_date``.
+
+    PostgreSQL only: on other databases the table is never partitioned and
+    every method is a no-op. Rows whose month has no partition land in the
+    default partition, so partitions should be created ahead of time.
+    """
+
+    @staticmethod
+    def is_partitioned() -> bool:
+        if connection.vendor != "postgresql":
+            return False
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = %s::regclass)",
+                [PARTITIONED_TABLE],
+            )
+            return cursor.fetchone()[0]
+
+    @staticmethod
+    def list_partitions() -> List[Partition]:
+        """Monthly partitions ordered by range; the default partition is excluded."""
+        if not TrackMoodPartitionService.is_partitioned():
+            return []
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) "
+                "FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+                "WHERE i.inhparent = %s::regclass",
+                [PARTITIONED_TABLE],
+            )
+            rows = cursor.fetchall()
+
+        partitions = []
+        for name, bound in rows:
+            match = _BOUND_RE.search(bound)
+            if match:
+                partitions.append(Partition(
+                    name=name,
+                    start=date.fromisoformat(match.group(1)),
+                    end=date.fromisoformat(match.group(2)),
+                ))
+        return sorted(partitions, key=lambda partition: partition.start)
+
+    @staticmethod
+    def ensure_partitions(*, months_ahead: int = 3, today: Optional[date] = None) -> List[str]:
+        """
+        Create the monthly partitions from the current month through
+        ``months_ahead`` months ahead that do not exist yet.
+
+        Rows for such a month that already sit in the default partition are
+        moved into the new partition in the same transaction (PostgreSQL
+        refuses to create the partition while they are there).
+        """
+        if not TrackMoodPartitionService.is_partitioned():
+            return []
+
+        current = month_start(today or timezone.localdate())
+        existing = {partition.start for partition in TrackMoodPartitionService.list_partitions()}
+
+        created = []
+        with transaction.atomic(), connection.cursor() as cursor:
+            for offset in range(months_ahead + 1):
+                month = add_months(current, offset)
+                if month in existing:
+                    continue
+                name = partition_name(month)
+                end = add_months(month, 1)
+                cursor.execute(
+                    f'SELECT EXISTS (SELECT 1 FROM "{DEFAULT_PARTITION}" '
+                    f"WHERE {PARTITION_KEY} >= %s AND {PARTITION_KEY} < %s)",
+                    [month, end],
+                )
+                stranded = cursor.fetchone()[0]
+                if stranded:
+                    cursor.execute(
+                        f'CREATE TEMPORARY TABLE "{name}_moving" (LIKE "{PARTITIONED_TABLE}") ON COMMIT DROP'
+                    )
+                    cursor.execute(
+                        f'WITH moved AS (DELETE FROM "{DEFAULT_PARTITION}" '
+                        f"WHERE {PARTITION_KEY} >= %s AND {PARTITION_KEY} < %s RETURNING *) "
+                        f'INSERT INTO "{name}_moving" SELECT * FROM moved',
+                        [month, end],
+                    )
+                # DDL cannot take bind parameters; both bounds are generated dates.
+                cursor.execute(
+                    f'CREATE TABLE "{name}" PARTITION OF "{PARTITIONED_TABLE}" '
+                    f"FOR VALUES FROM ('{month.isoformat()}') TO ('{end.isoformat()}')"
+                )
+                if stranded:
+                    cursor.execute(f'INSERT INTO "{PARTITIONED_TABLE}" SELECT * FROM "{name}_moving"')
+                    cursor.execute(f'DROP TABLE "{name}_moving"')
+                created.append(name)
+        return created
+
+    @staticmethod
+    def detach_partitions(*, before: date, drop: bool = False) -> List[str]:
+        """
+        Detach every monthly partition that ends on or before ``before``. The
+        detached tables are kept as standalone tables unless ``drop`` is set;
+        kept tables leave the rows that depend on them alone, so they can be
+        attached again.
+
+        With ``drop``, the dropped moods' MoodFeeling rows and activity bits
+        are removed in the same transaction. Their search vectors live on the
+        mood rows themselves and go with the table.
+        """
+        detached = []
+        with transaction.atomic(), connection.cursor() as cursor:
+            for partition in TrackMoodPartitionService.list_partitions():
+                if partition.end > before:
+                    continue
+                cursor.execute(f'ALTER TABLE "{PARTITIONED_TABLE}" DETACH PARTITION "{partition.name}"')
+                if drop:
+                    TrackMoodPartitionService._discard_dependents(cursor, partition)
+                    cursor.execute(f'DROP TABLE "{partition.name}"')
+                detached.append(partition.name)
+        return detached
+
+    @staticmethod
+    def _discard_dependents(cursor, partition: Partition) -> None:
+        cursor.execute(
+            f'DELETE FROM "{MoodFeeling._meta.db_table}" WHERE mood_id IN (SELECT id FROM "{partition.name}")'
+        )
+        # A monthly partition lies within one year.
+        cursor.execute(f'SELECT user_id, {PARTITION_KEY} FROM "{partition.name}" ORDER BY user_id')
+        while rows := cursor.fetchmany(DROP_BATCH_SIZE):
+            days_by_user: Dict[int, List[date]] = defaultdict(list)
+            for user_id, mood_date in rows:
+                days_by_user[user_id].append(mood_date)
+            MoodActivityService.clear_many(year=partition.start.year, days_by_user=days_by_user)
+
+    @staticmethod
+    def scanned_partitions(queryset) -> List[str]:
+        """Names of the partitions the planner keeps for ``queryset`` after pruning."""
+        plan = queryset.explain()
+        names = {partition.name for partition in TrackMoodPartitionService.list_partitions()}
+        names.add(DEFAULT_PARTITION)
+        return sorted(name for name in names if re.search(rf"\b{name}\b", plan))
@@ -0,0 +1,192 @@
+import re
+from typing import Iterable, List, Optional, Tuple
+
+from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank, SearchVector
+from django.db import connection
+from django.db.models import F, FloatField, Q, Value
+from django.db.models.functions import Cast, Left
+from rest_framework.exceptions import ValidationError
+
+from account.pagination import decode_cursor, encode_cursor
+from .models import TrackMood
+
+SEARCH_CONFIG = "english"
+FTS_TABLE = "onboarding_trackmood_fts"
+HIGHLIGHT_START = "<mark>"
+HIGHLIGHT_STOP = "</mark>"
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def _fts5_query(query: str) -> str:
+    # Quote every term so user input can never hit FTS5 query syntax errors.
+    return " ".join(f'"{word}"' for word in _WORD_RE.findall(query))
+
+
+class JournalSearchService:
+    """
+    Journal full-text search.
+
+    PostgreSQL keeps a tsvector column (GIN indexed) on TrackMood; SQLite keeps
+    an FTS5 side table keyed by the mood id. Both are refreshed by the service
+    layer whenever a mood is written.
+    """
+
+    @staticmethod
+    def refresh(*, mood_ids: Iterable[int]) -> None:
+        mood_ids = list(mood_ids)
+        if not mood_ids:
+            return
+
+        if connection.vendor == "postgresql":
+            TrackMood.objects.filter(id__in=mood_ids).update(
+                search_vector=SearchVector("journal", config=SEARCH_CONFIG)
+            )
+        elif connection.vendor == "sqlite":
+            placeholders = ", ".join(["%s"] * len(mood_ids))
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"DELETE FROM {FTS_TABLE} WHERE rowid IN ({placeholders})",
+                    mood_ids,
+                )
+                cursor.execute(
+                    f"INSERT INTO {FTS_TABLE} (rowid, journal, user_id) "
+                    f"SELECT id, journal, user_id FROM {TrackMood._meta.db_table} "
+                    f"WHERE id IN ({placeholders}) AND journal <> ''",
+                    mood_ids,
+                )
+
+    @staticmethod
+    def discard(*, mood_ids: Iterable[int]) -> None:
+        mood_ids = list(mood_ids)
+        if not mood_ids or connection.vendor != "sqlite":
+            return
+
+        placeholders = ", ".join(["%s"] * len(mood_ids))
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {FTS_TABLE} WHERE rowid IN ({placeholders})",
+                mood_ids,
+            )
+
+    @staticmethod
+    def search(
+        *, user, query: str, cursor: Optional[str] = None, page_size: int = 20
+    ) -> Tuple[List[TrackMood], Optional[str]]:
+        """
+        Return one page of the user's moods matching ``query``, best match
+        first, each annotated with ``rank`` and a highlighted ``snippet``.
+        """
+        position = _parse_position(decode_cursor(cursor))
+
+        if connection.vendor == "postgresql":
+            moods = _search_postgres(user, query, position, page_size + 1)
+        elif connection.vendor == "sqlite":
+            moods = _search_sqlite(user, query, position, page_size + 1)
+        else:
+            moods = _search_fallback(user, query, position, page_size + 1)
+
+        next_cursor = None
+        if len(moods) > page_size:
+            moods = moods[:page_size]
+            last = moods[-1]
+            next_cursor = encode_cursor({"rank": last.rank, "id": last.id})
+
+        return moods, next_cursor
+
+
+def _parse_position(position: Optional[dict]) -> Optional[dict]:
+    if position is None:
+        return None
+    try:
+        return {"rank": float(position["rank"]), "id": int(position["id"])}
+    except (KeyError, TypeError, ValueError):
+        raise ValidationError({"cursor": "Invalid cursor."})
+
+
+def _search_postgres(user, query, position, limit) -> List[TrackMood]:
+    search_query = SearchQuery(query, search_type="websearch", config=SEARCH_CONFIG)
+
+    qs = (
+        TrackMood.objects
+        .filter(user=user, search_vector=search_query)
+        .annotate(
+            # ts_rank() returns real; compare cursors at double precision so
+            # the rank round-trips through JSON exactly.
+            rank=Cast(SearchRank(F("search_vector"), search_query), FloatField()),
+            snippet=SearchHeadline(
+                "journal",
+                search_query,
+                config=SEARCH_CONFIG,
+                start_sel=HIGHLIGHT_START,
+                stop_sel=HIGHLIGHT_STOP,
+                max_fragments=2,
+            ),
+        )
+    )
+
+    if position:
+        qs = qs.filter(
+            Q(rank__lt=position["rank"])
+            | Q(rank=position["rank"], id__lt=position["id"])
+        )
+
+    return list(qs.order_by("-rank", "-id")[:limit])
+
+
+def _search_sqlite(user, query, position, limit) -> List[TrackMood]:
+    match = _fts5_query(query)
+    if not match:
+        return []
+
+    sql = (
+        "SELECT id, rank, snippet FROM ("
+        f"  SELECT rowid AS id, -bm25({FTS_TABLE}) AS rank, "
+        f"  snippet({FTS_TABLE}, 0, %s, %s, '…', 16) AS snippet "
+        f"  FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s AND user_id = %s"
+        ")"
+    )
+    params = [HIGHLIGHT_START, HIGHLIGHT_STOP, match, user.pk]
+
+    if position:
+        sql += " WHERE rank < %s OR (rank = %s AND id < %s)"
+        params += [position["rank"], position["rank"], position["id"]]
+
+    sql += " ORDER BY rank DESC, id DESC LIMIT %s"
+    params.append(limit)
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        hits = cursor.fetchall()
+
+    moods = TrackMood.objects.in_bulk([mood_id for mood_id, _, _ in hits])
+    results = []
+    for mood_id, rank, snippet in hits:
+        mood = moods.get(mood_id)
+        if mood is None:
+            continue
+        mood.rank = rank
+        mood.snippet = snippet
+        results.append(mood)
+    return results
+
+
+def _search_fallback(user, query, position, limit) -> List[TrackMood]:
+    # Other databases: unranked substring match on every word, newest first.
+    words = _WORD_RE.findall(query)
+    if not words:
+        return []
+
+    qs = TrackMood.objects.filter(user=user).annotate(
+        rank=Value(0.0, output_field=FloatField()),
+        snippet=Left("journal", 200),
+    )
+    for word in words:
+        qs = qs.filter(journal__icontains=word)
+    if position:
+        qs = qs.filter(
+            Q(rank__lt=position["rank"])
+            | Q(rank=position["rank"], id__lt=position["id"])
+        )
+
+    return list(qs.order_by("-id")[:limit])
@@ -1,13 +1,36 @@
 from rest_framework import serializers
+from .catalog import CoachingStyleCatalog
 from .models import OnboardingStep, CoachingStyle, TrackMood
 
+
+class CoachingStyleField(serializers.Field):
+    """Coaching style slug, validated against the in-memory catalog."""
+
+    # Same messages and exact matching as the SlugRelatedField this replaced.
+    default_error_messages = {
+        "invalid": "Invalid value.",
+        "does_not_exist": "Object with value={value} does not exist.",
+    }
+
+    def get_attribute(self, instance):
+        style = CoachingStyleCatalog.get_by_pk(instance.coaching_style_id_id)
+        return style.value if style else instance.coaching_style_value
+
+    def to_representation(self, value):
+        return value
+
+    def to_internal_value(self, data):
+        if not isinstance(data, str):
+            self.fail("invalid")
+        style = CoachingStyleCatalog.get(data)
+        if style is None:
+            self.fail("does_not_exist", value=data)
+        return style
+
+
 class OnboardingSerializer(serializers.ModelSerializer):
     # Input/output flat field
-    coaching_style = serializers.SlugRelatedField(
-        source='coaching_style_id',  # maps to actual FK
-        slug_field='value',
-        queryset=CoachingStyle.objects.filter(is_active=True)
-    )
+    coaching_style = CoachingStyleField(source='coaching_style_id')  # maps to actual FK
 
     coaching_style_name = serializers.CharField(read_only=True)
 
@@ -41,4 +64,41 @@ class TrackMoodSerializer(serializers.ModelSerializer):
             "created_at",
             "updated_at",
         ]
-        read_only_fields = ("user", "created_at", "updated_at")
\ No newline at end of file
+        read_only_fields = ("user", "created_at", "updated_at")
+
+    def validate_feel(self, value):
+        if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+            raise serializers.ValidationError("Must be a list of strings.")
+        if any(len(item) > 100 for item in value):
+            raise serializers.ValidationError("Each feeling must be at most 100 characters.")
+        return list(dict.fromkeys(item.strip() for item in value if item.strip()))
+
+class TrackMoodCheckInSerializer(TrackMoodSerializer):
+    mood_date = serializers.DateField(required=False)
+
+
+class TrackMoodFeelPatchSerializer(serializers.Serializer):
+    add = serializers.ListField(child=serializers.CharField(max_length=100), required=False, default=list)
+    remove = serializers.ListField(child=serializers.CharField(max_length=100), required=False, default=list)
+
+    def validate(self, attrs):
+        if not attrs["add"] and not attrs["remove"]:
+            raise serializers.ValidationError("Provide at least one feeling to add or remove.")
+        attrs["add"] = list(dict.fromkeys(attrs["add"]))
+        attrs["remove"] = list(dict.fromkeys(attrs["remove"]))
+        return attrs
+
+
+class TrackMoodSearchResultSerializer(TrackMoodSerializer):
+    rank = serializers.FloatField(read_only=True)
+    snippet = serializers.CharField(read_only=True)
+
+    class Meta(TrackMoodSerializer.Meta):
+        fields = TrackMoodSerializer.Meta.fields + ["rank", "snippet"]
+
+
+
+class CoachingStyleSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = CoachingStyle
+        fields = ["value", "name", "description", "order"]
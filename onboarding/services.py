@@ -1,6 +1,13 @@
+from collections import defaultdict
 from typing import List
 from django.db import transaction
-from .models import OnboardingStep, CoachingStyle, TrackMood
+from django.db.models import Avg, Count, Q
+from django.utils import timezone
+from .models import OnboardingStep, CoachingStyle, TrackMood, MoodFeeling
+from .activity import MoodActivityService
+from .archive import ENTRY_FIELDS, MoodArchiveService, merge_tiers
+from .search import JournalSearchService
+from account.streaming import aiter_queryset
 from django.shortcuts import get_object_or_404
 from django.core.exceptions import ObjectDoesNotExist
 
@@ -46,10 +53,40 @@ class OnboardingService:
 
 
 class TrackMoodService:
+    EXPORT_COLUMNS = [
+        "id",
+        "mood_date",
+        "mood_score",
+        "mood_label",
+        "feel",
+        "journal",
+        "created_at",
+        "updated_at",
+    ]
 
     @staticmethod
+    @transaction.atomic
     def create(*, user, data):
-        return TrackMood.objects.create(user=user, **data)
+        mood = TrackMood.objects.create(user=user, **data)
+        MoodFeeling.objects.sync(mood)
+        JournalSearchService.refresh(mood_ids=[mood.id])
+        MoodActivityService.mark(user_id=user.pk, mood_date=mood.mood_date, mood_score=mood.mood_score)
+        return mood
+
+    @staticmethod
+    @transaction.atomic
+    def check_in(*, user, data):
+        mood, created = TrackMood.objects.upsert_for_day(
+            user=user,
+            mood_date=data.get("mood_date") or timezone.localdate(),
+            mood_score=data["mood_score"],
+            feel=data.get("feel", []),
+            journal=data.get("journal", ""),
+        )
+        MoodFeeling.objects.sync(mood)
+        JournalSearchService.refresh(mood_ids=[mood.id])
+        MoodActivityService.mark(user_id=user.pk, mood_date=mood.mood_date, mood_score=mood.mood_score)
+        return mood, created
 
     @staticmethod
     def list(*, user):
@@ -60,12 +97,108 @@ class TrackMoodService:
         return get_object_or_404(TrackMood, id=mood_id, user=user)
 
     @staticmethod
+    @transaction.atomic
     def update(*, instance, data):
+        previous_date = instance.mood_date
         for attr, value in data.items():
             setattr(instance, attr, value)
         instance.save()
+        MoodFeeling.objects.sync(instance)
+        if "journal" in data:
+            JournalSearchService.refresh(mood_ids=[instance.id])
+        if instance.mood_date != previous_date:
+            MoodActivityService.clear(user_id=instance.user_id, mood_date=previous_date)
+        MoodActivityService.mark(
+            user_id=instance.user_id, mood_date=instance.mood_date, mood_score=instance.mood_score
+        )
         return instance
 
     @staticmethod
+    @transaction.atomic
+    def change_feel(*, user, mood_id, add=(), remove=()):
+        """
+        Apply all feel additions/removals in one in-database UPDATE, with no
+        prior SELECT, then update the feeling index with one delete and one
+        insert. Nothing is written when the list would not change. Returns
+        the mood, or None if it does not exist for this user.
+        """
+        mood, changed = TrackMood.objects.change_feel(
+            mood_id=mood_id, user_id=user.pk, add=list(add), remove=list(remove)
+        )
+        if changed:
+            MoodFeeling.objects.apply_change(mood, add=list(add), remove=list(remove))
+        return mood
+
+    @staticmethod
+    @transaction.atomic
     def delete(*, instance):
-        instance.delete()
\ No newline at end of file
+        mood_id, user_id, mood_date = instance.id, instance.user_id, instance.mood_date
+        instance.delete()
+        JournalSearchService.discard(mood_ids=[mood_id])
+        MoodActivityService.clear(user_id=user_id, mood_date=mood_date)
+
+    @staticmethod
+    @transaction.atomic
+    def delete_many(*, queryset) -> int:
+        """Delete the entries in ``queryset`` and clear their activity bits, a year at a time."""
+        rows = list(queryset.values_list("id", "user_id", "mood_date"))
+        deleted, _ = TrackMood.objects.filter(id__in=[row[0] for row in rows]).delete()
+        JournalSearchService.discard(mood_ids=[row[0] for row in rows])
+        by_year = defaultdict(lambda: defaultdict(list))
+        for _, user_id, mood_date in rows:
+            by_year[mood_date.year][user_id].append(mood_date)
+        for year, days_by_user in by_year.items():
+            MoodActivityService.clear_many(year=year, days_by_user=days_by_user)
+        return deleted
+
+    @staticmethod
+    async def export_rows(*, user):
+        labels = dict(TrackMood.MOOD_CHOICES)
+        qs = (
+            TrackMood.objects
+            .filter(user=user)
+            .order_by("mood_date", "id")
+            .values_list(*ENTRY_FIELDS)
+        )
+        rows = merge_tiers(aiter_queryset(qs), MoodArchiveService.aiter_rows(user=user))
+        async for mood_id, mood_date, score, feel, journal, created_at, updated_at in rows:
+            yield (mood_id, mood_date, score, labels.get(score, "Unknown"), feel, journal, created_at, updated_at)
+
+    @staticmethod
+    def daily_averages(*, user, start_date, end_date):
+        """{mood_date: average score} over hot rows and archived entries."""
+        qs = (
+            TrackMood.objects
+            .filter(user=user, mood_date__range=(start_date, end_date))
+            .values("mood_date")
+            .annotate(avg_mood=Avg("mood_score"))
+        )
+        daily_avg = {
+            row["mood_date"]: float(row["avg_mood"])
+            for row in qs
+            if row["avg_mood"] is not None
+        }
+        for entry in MoodArchiveService.entries(user=user, start_date=start_date, end_date=end_date):
+            daily_avg.setdefault(entry["mood_date"], float(entry["mood_score"]))
+        return daily_avg
+
+    @staticmethod
+    def feeling_stats(*, user, start_date, end_date, limit=None):
+        breakdown = {
+            f"score_{score}": Count("id", filter=Q(mood_score=score))
+            for score, _ in TrackMood.MOOD_CHOICES
+        }
+        qs = (
+            MoodFeeling.objects
+            .filter(user=user, mood_date__range=(start_date, end_date))
+            .values("feeling")
+            .annotate(total=Count("id"), avg_mood=Avg("mood_score"), **breakdown)
+            .order_by("-total", "feeling")
+        )
+        return qs[:limit] if limit else qs
+
+    @staticmethod
+    def search(*, user, query, cursor=None, page_size=20):
+        return JournalSearchService.search(
+            user=user, query=query, cursor=cursor, page_size=page_size
+        )
@@ -0,0 +1,12 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .catalog import CoachingStyleCatalog
+from .models import CoachingStyle
+
+
+@receiver(post_save, sender=CoachingStyle)
+@receiver(post_delete, sender=CoachingStyle)
+def invalidate_coaching_style_catalog(sender, instance: CoachingStyle, **kwargs) -> None:
+    transaction.on_commit(CoachingStyleCatalog.invalidate)
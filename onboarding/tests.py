@@ -1,3 +1,233 @@
+import tracemalloc
+from datetime import date, timedelta
+from unittest import skipUnless
+
+from django.contrib.auth import get_user_model
+from django.db import connection
 from django.test import TestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from .activity import day_index
+from .models import MoodActivityYear, MoodFeeling, TrackMood
+from .partitions import DEFAULT_PARTITION, TrackMoodPartitionService
+from .services import TrackMoodService
+
+
+class TrackMoodAdminTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = get_user_model().objects.create_superuser(email="admin@example.com", full_name="Admin", password="pw")
+        cls.user = get_user_model().objects.create_user(email="mood@example.com", full_name="Mood", password="pw")
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def form(self, **values) -> dict:
+        return {"user": self.user.pk, "mood_score": 3, "feel": '["calm"]', "journal": "", **values}
+
+
+class TrackMoodAdminTests(TrackMoodAdminTestCase):
+    def test_add_and_change_keep_feelings_and_search_in_sync(self):
+        response = self.client.post(
+            "/admin/onboarding/trackmood/add/",
+            self.form(journal="walked by the river", mood_date="2026-03-02"),
+        )
+        self.assertEqual(response.status_code, 302)
+        mood = TrackMood.objects.get(user=self.user)
+        self.assertEqual(list(MoodFeeling.objects.filter(mood_id=mood.pk).values_list("feeling", flat=True)), ["calm"])
+        self.assertEqual([found.pk for found in TrackMoodService.search(user=self.user, query="river")[0]], [mood.pk])
+
+        response = self.client.post(
+            f"/admin/onboarding/trackmood/{mood.pk}/change/",
+            self.form(feel='["tired"]', journal="stayed in by the fire", mood_date="2026-03-02"),
+        )
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(list(MoodFeeling.objects.filter(mood_id=mood.pk).values_list("feeling", flat=True)), ["tired"])
+        self.assertEqual(TrackMoodService.search(user=self.user, query="river")[0], [])
+        self.assertEqual([found.pk for found in TrackMoodService.search(user=self.user, query="fire")[0]], [mood.pk])
+
+    def test_delete_removes_feelings_and_search(self):
+        mood = TrackMoodService.create(
+            user=self.user, data={"mood_score": 2, "feel": ["calm"], "journal": "river", "mood_date": date(2026, 3, 2)}
+        )
+
+        response = self.client.post(f"/admin/onboarding/trackmood/{mood.pk}/delete/", {"post": "yes"})
+
+        self.assertEqual(response.status_code, 302)
+        self.assertFalse(MoodFeeling.objects.filter(mood_id=mood.pk).exists())
+        self.assertEqual(TrackMoodService.search(user=self.user, query="river")[0], [])
+
+
+class MoodReportRangeTests(TestCase):
+    URL = "/api/v1/onboarding/mood/report/"
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(email="report@example.com", full_name="Report", password="pw")
+
+    def get(self, **params):
+        return self.client.get(self.URL, params, headers={"Authorization": f"Bearer {AccessToken.for_user(self.user)}"})
+
+    def test_trend_look_back_before_date_min_is_rejected(self):
+        response = self.get(start_date="0001-01-05", end_date="0001-01-10", trend="1")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("start_date", response.json())
+
+    def test_explicit_range_is_capped(self):
+        self.assertEqual(self.get(start_date="0001-01-01", end_date="9999-12-31").status_code, 400)
+
+    def test_trend_report(self):
+        TrackMood.objects.create(user=self.user, mood_score=3, mood_date=date(2026, 3, 2))
+        response = self.get(start_date="2026-03-01", end_date="2026-03-07", trend="1")
+        self.assertEqual(response.status_code, 200)
+
+
+class TrackMoodAdminActivityTests(TrackMoodAdminTestCase):
+    def day_is_set(self, day: date) -> bool:
+        activity = MoodActivityYear.objects.filter(user=self.user, year=day.year).first()
+        return activity is not None and bool(int.from_bytes(activity.days, "little") >> day_index(day) & 1)
+
+    def test_moving_an_entry_moves_its_day(self):
+        self.client.post("/admin/onboarding/trackmood/add/", self.form(mood_date="2026-03-02"))
+        mood = TrackMood.objects.get(user=self.user)
+        self.assertTrue(self.day_is_set(date(2026, 3, 2)))
+
+        self.client.post(f"/admin/onboarding/trackmood/{mood.pk}/change/", self.form(mood_date="2026-03-05"))
+
+        self.assertFalse(self.day_is_set(date(2026, 3, 2)))
+        self.assertTrue(self.day_is_set(date(2026, 3, 5)))
+
+    def test_bulk_delete_clears_days(self):
+        days = [date(2025, 12, 31), date(2026, 1, 1), date(2026, 1, 2)]
+        moods = [
+            TrackMoodService.create(user=self.user, data={"mood_score": 2, "feel": ["calm"], "mood_date": day})
+            for day in days
+        ]
+
+        response = self.client.post(
+            "/admin/onboarding/trackmood/",
+            {"action": "delete_selected", "post": "yes", "_selected_action": [mood.pk for mood in moods]},
+        )
+
+        self.assertEqual(response.status_code, 302)
+        self.assertFalse(TrackMood.objects.filter(user=self.user).exists())
+        self.assertFalse(any(self.day_is_set(day) for day in days))
+
+
+class TrackMoodExportMemoryTests(TestCase):
+    ENTRIES = 100_000
+    # Generous next to what one chunk needs, far below what 100k rows take.
+    PEAK_BYTES = 8 * 1024 * 1024
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(email="export@example.com", full_name="Export", password="pw")
+        start = date(1800, 1, 1)
+        TrackMood.objects.bulk_create(
+            (
+                TrackMood(
+                    user=cls.user,
+                    mood_score=i % 5,
+                    feel=["calm", "tired"],
+                    journal="Walked the dog and read for an hour before bed.",
+                    mood_date=start + timedelta(days=i),
+                )
+                for i in range(cls.ENTRIES)
+            ),
+            batch_size=5000,
+        )
+
+    async def test_streaming_export_peak_memory(self):
+        token = AccessToken.for_user(self.user)
+        tracemalloc.start()
+        try:
+            response = await self.async_client.get(
+                "/api/v1/onboarding/moods/export/",
+                {"export_format": "ndjson"},
+                headers={"Authorization": f"Bearer {token}"},
+            )
+            lines = 0
+            async for chunk in response.streaming_content:
+                lines += chunk.count(b"\n")
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(lines, self.ENTRIES)
+        self.assertLess(peak, self.PEAK_BYTES)
+
+
+@skipUnless(connection.vendor == "postgresql", "TrackMood is only partitioned on PostgreSQL")
+class TrackMoodPartitionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(email="partition@example.com", full_name="Partition", password="pw")
+        cls.partitions = TrackMoodPartitionService.list_partitions()
+
+    def partition_of(self, mood) -> str:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT tableoid::regclass::text FROM onboarding_trackmood WHERE id = %s", [mood.pk])
+            row = cursor.fetchone()
+        return row[0] if row else None
+
+    def test_table_is_partitioned(self):
+        self.assertTrue(TrackMoodPartitionService.is_partitioned())
+        self.assertTrue(self.partitions)
+
+    def test_create_update_delete(self):
+        first, second = self.partitions[0], self.partitions[1]
+        mood = TrackMood.objects.create(user=self.user, mood_score=3, mood_date=first.start)
+        self.assertEqual(self.partition_of(mood), first.name)
+
+        mood.mood_date = second.start
+        mood.save()
+        self.assertEqual(self.partition_of(mood), second.name)
+        self.assertEqual(TrackMood.objects.get(pk=mood.pk).mood_date, second.start)
+
+        mood.delete()
+        self.assertFalse(TrackMood.objects.filter(user=self.user).exists())
+
+    def test_upsert_for_day(self):
+        day = self.partitions[0].start
+        mood, created = TrackMood.objects.upsert_for_day(user=self.user, mood_date=day, mood_score=1)
+        self.assertTrue(created)
+        again, created = TrackMood.objects.upsert_for_day(user=self.user, mood_date=day, mood_score=4)
+        self.assertFalse(created)
+        self.assertEqual(again.pk, mood.pk)
+        self.assertEqual(TrackMood.objects.get(pk=mood.pk).mood_score, 4)
+        self.assertEqual(self.partition_of(mood), self.partitions[0].name)
+
+    def test_date_range_query_is_pruned(self):
+        partition = self.partitions[1]
+        queryset = TrackMood.objects.filter(mood_date__gte=partition.start, mood_date__lt=partition.end)
+        self.assertEqual(TrackMoodPartitionService.scanned_partitions(queryset), [partition.name])
+
+    def test_ensure_partitions_moves_default_rows(self):
+        month = self.partitions[-1].end
+        mood = TrackMood.objects.create(user=self.user, mood_score=2, mood_date=month + timedelta(days=3))
+        self.assertEqual(self.partition_of(mood), DEFAULT_PARTITION)
+
+        created = TrackMoodPartitionService.ensure_partitions(months_ahead=0, today=month)
+
+        self.assertEqual(len(created), 1)
+        self.assertEqual(self.partition_of(mood), created[0])
+        self.assertEqual(TrackMood.objects.get(pk=mood.pk).mood_score, 2)
+
+    def test_detach_drop_removes_dependents(self):
+        oldest, kept = self.partitions[0], self.partitions[-1]
+        dropped = TrackMoodService.create(
+            user=self.user, data={"mood_score": 3, "feel": ["calm"], "mood_date": oldest.start}
+        )
+        TrackMoodService.create(user=self.user, data={"mood_score": 4, "feel": ["calm"], "mood_date": kept.start})
+        # As if the rows had been committed: DROP TABLE refuses pending deferred FK checks.
+        with connection.cursor() as cursor:
+            cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+
+        detached = TrackMoodPartitionService.detach_partitions(before=oldest.end, drop=True)
 
-# Create your tests here.
+        self.assertEqual(detached, [oldest.name])
+        self.assertFalse(MoodFeeling.objects.filter(mood_id=dropped.pk).exists())
+        self.assertEqual(MoodFeeling.objects.filter(user=self.user).count(), 1)
+        activity = MoodActivityYear.objects.get(user=self.user, year=oldest.start.year)
+        self.assertFalse(int.from_bytes(activity.days, "little") >> day_index(oldest.start) & 1)
@@ -1,13 +1,24 @@
 from django.urls import path
-from .views import OnboardingAPIView, TrackMoodListCreateAPIView, TrackMoodDetailAPIView, WeeklyMoodSummaryAPIView, MoodReportAPIView
+from .views import CoachingStyleListAPIView, OnboardingAPIView, TrackMoodListCreateAPIView, TrackMoodCheckInAPIView, TrackMoodDetailAPIView, TrackMoodFeelAPIView, TrackMoodSearchAPIView, TrackMoodExportAPIView, WeeklyMoodSummaryAPIView, MoodReportAPIView, FeelingStatsAPIView, MoodHeatmapAPIView, PopulationMoodAnalyticsAPIView, CohortRetentionAPIView
 
 urlpatterns = [
     path('create-details/', OnboardingAPIView.as_view(), name='onboarding'),
+    path('coaching-styles/', CoachingStyleListAPIView.as_view(), name='coaching-style-list'),
     
     path("moods/", TrackMoodListCreateAPIView.as_view(), name="mood-list-create"),
     path("moods/<int:pk>/", TrackMoodDetailAPIView.as_view(), name="mood-detail"),
+    path("moods/<int:pk>/feel/", TrackMoodFeelAPIView.as_view(), name="mood-feel"),
+    path("moods/check-in/", TrackMoodCheckInAPIView.as_view(), name="mood-check-in"),
+    path("moods/search/", TrackMoodSearchAPIView.as_view(), name="mood-search"),
+    path("moods/export/", TrackMoodExportAPIView.as_view(), name="mood-export"),
     
     # last mood tracking api
     path("moods/weekly-summary/",WeeklyMoodSummaryAPIView.as_view(), name="weekly-mood-summary",),
-    path("mood/report/", MoodReportAPIView.as_view(), name="mood-report")
+    path("mood/report/", MoodReportAPIView.as_view(), name="mood-report"),
+    path("mood/feelings/", FeelingStatsAPIView.as_view(), name="mood-feelings"),
+    path("mood/heatmap/", MoodHeatmapAPIView.as_view(), name="mood-heatmap"),
+    
+    # admin analytics
+    path("mood/analytics/population/", PopulationMoodAnalyticsAPIView.as_view(), name="mood-analytics-population"),
+    path("mood/analytics/retention/", CohortRetentionAPIView.as_view(), name="mood-analytics-retention"),
 ]
@@ -1,22 +1,52 @@
 # Standard library
-from datetime import timedelta, datetime
+from datetime import date, timedelta, datetime
 from calendar import monthrange
+
+import numpy as np
 # Django
 from django.core.exceptions import ObjectDoesNotExist
+from django.db import IntegrityError
 from django.db.models import Avg, Count
 from django.utils import timezone
 from django.utils.timezone import now
 
 # Django REST Framework
 from rest_framework import status
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 # Local apps
 from .models import TrackMood
-from .serializers import OnboardingSerializer, TrackMoodSerializer
+from account.pagination import parse_page_size
+from account.streaming import parse_export_format, streaming_export_response
+from .serializers import (
+    CoachingStyleSerializer,
+    OnboardingSerializer,
+    TrackMoodCheckInSerializer,
+    TrackMoodFeelPatchSerializer,
+    TrackMoodSerializer,
+    TrackMoodSearchResultSerializer,
+)
+from .catalog import CoachingStyleCatalog
+from .activity import MoodActivityService
 from .services import OnboardingService, TrackMoodService
+from .analytics import PopulationAnalyticsService, RetentionService, daily_trend
+
+
+class CoachingStyleListAPIView(APIView):
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        serializer = CoachingStyleSerializer(CoachingStyleCatalog.all(), many=True)
+        return Response(
+            {
+                "success": True,
+                "message": "Coaching styles retrieved successfully",
+                "data": serializer.data,
+            },
+            status=status.HTTP_200_OK
+        )
 
 
 class OnboardingAPIView(APIView):
@@ -85,10 +115,16 @@ class TrackMoodListCreateAPIView(APIView):
         serializer = TrackMoodSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
-        mood = TrackMoodService.create(
-            user=request.user,
-            data=serializer.validated_data
-        )
+        try:
+            mood = TrackMoodService.create(
+                user=request.user,
+                data=serializer.validated_data
+            )
+        except IntegrityError:
+            return Response({
+                'success': False,
+                'message': 'A mood entry already exists for this date. Use the check-in endpoint to update it.'
+            }, status=status.HTTP_409_CONFLICT)
 
         return Response({
             'success': True,
@@ -97,6 +133,26 @@ class TrackMoodListCreateAPIView(APIView):
             status=status.HTTP_201_CREATED
         )
 
+class TrackMoodCheckInAPIView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        serializer = TrackMoodCheckInSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        mood, created = TrackMoodService.check_in(
+            user=request.user,
+            data=serializer.validated_data
+        )
+
+        return Response({
+            'success': True,
+            'message': 'Mood check-in created successfully' if created else 'Mood check-in updated successfully',
+            'created': created,
+            'data': TrackMoodSerializer(mood).data
+        }, status=status.HTTP_201_CREATED if created else status.HTTP_200_OK)
+
+
 class TrackMoodDetailAPIView(APIView):
     permission_classes = [IsAuthenticated]
 
@@ -115,10 +171,16 @@ class TrackMoodDetailAPIView(APIView):
         serializer = TrackMoodSerializer(mood, data=request.data)
         serializer.is_valid(raise_exception=True)
 
-        mood = TrackMoodService.update(
-            instance=mood,
-            data=serializer.validated_data
-        )
+        try:
+            mood = TrackMoodService.update(
+                instance=mood,
+                data=serializer.validated_data
+            )
+        except IntegrityError:
+            return Response({
+                'success': False,
+                'message': 'A mood entry already exists for this date.'
+            }, status=status.HTTP_409_CONFLICT)
 
         return Response({
             'success': True,
@@ -135,6 +197,71 @@ class TrackMoodDetailAPIView(APIView):
         }, status=status.HTTP_204_NO_CONTENT)
 
 
+class TrackMoodFeelAPIView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def patch(self, request, pk):
+        serializer = TrackMoodFeelPatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        mood = TrackMoodService.change_feel(
+            user=request.user,
+            mood_id=pk,
+            add=serializer.validated_data["add"],
+            remove=serializer.validated_data["remove"],
+        )
+        if mood is None:
+            return Response({
+                'success': False,
+                'message': 'Mood entry not found'
+            }, status=status.HTTP_404_NOT_FOUND)
+
+        return Response({
+            'success': True,
+            'message': 'Mood feelings updated successfully',
+            'data': {'id': mood.id, 'feel': mood.feel}
+        })
+
+
+class TrackMoodSearchAPIView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        query = (request.query_params.get("q") or "").strip()
+        if not query:
+            return Response(
+                {"q": "Search query is required."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        moods, next_cursor = TrackMoodService.search(
+            user=request.user,
+            query=query,
+            cursor=request.query_params.get("cursor"),
+            page_size=parse_page_size(request.query_params.get("page_size")),
+        )
+
+        return Response({
+            'success': True,
+            'message': 'Journal search results retrieved successfully',
+            'data': TrackMoodSearchResultSerializer(moods, many=True).data,
+            'next_cursor': next_cursor,
+        })
+
+
+class TrackMoodExportAPIView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        export_format = parse_export_format(request.query_params.get("export_format"))
+        return streaming_export_response(
+            TrackMoodService.export_rows(user=request.user),
+            columns=TrackMoodService.EXPORT_COLUMNS,
+            export_format=export_format,
+            filename=f"mood-history-{now().date().isoformat()}",
+        )
+
+
 class WeeklyMoodSummaryAPIView(APIView):
     permission_classes = [IsAuthenticated]
 
@@ -204,6 +331,7 @@ from .models import TrackMood
 
 
 ISO_DATE_FORMAT = "%Y-%m-%d"
+MAX_RANGE_DAYS = 3650
 
 
 def parse_iso_date(value: str, field_name: str):
@@ -219,6 +347,33 @@ def parse_iso_date(value: str, field_name: str):
         })
 
 
+def parse_date_range(params, default_days: int = 30):
+    """
+    Resolve ?range=Nd or ?start_date=...&end_date=... into (start, end),
+    defaulting to the last ``default_days`` days.
+    """
+    today = timezone.now().date()
+    range_param = params.get("range")
+    start_date_param = params.get("start_date")
+    end_date_param = params.get("end_date")
+
+    if range_param:
+        if not range_param.endswith("d") or not range_param[:-1].isdigit() or int(range_param[:-1]) <= 0:
+            raise ValidationError({"range": "Invalid range format. Example: 7d, 30d"})
+        if int(range_param[:-1]) > MAX_RANGE_DAYS:
+            raise ValidationError({"range": f"Range cannot exceed {MAX_RANGE_DAYS} days."})
+        return today - timedelta(days=int(range_param[:-1]) - 1), today
+
+    if start_date_param or end_date_param:
+        start_date = parse_iso_date(start_date_param, "start_date")
+        end_date = parse_iso_date(end_date_param, "end_date")
+        if start_date > end_date:
+            raise ValidationError({"start_date": "start_date cannot be greater than end_date."})
+        return start_date, end_date
+
+    return today - timedelta(days=default_days - 1), today
+
+
 # class MoodReportAPIView(APIView):
 #     permission_classes = [IsAuthenticated]
 
@@ -350,6 +505,8 @@ class MoodReportAPIView(APIView):
             days = int(range_param[:-1])
             if days <= 0:
                 return Response({"range": "Range must be greater than 0 days."}, status=400)
+            if days > MAX_RANGE_DAYS:
+                return Response({"range": f"Range cannot exceed {MAX_RANGE_DAYS} days."}, status=400)
 
             end_date = today
             start_date = end_date - timedelta(days=days - 1)
@@ -369,6 +526,8 @@ class MoodReportAPIView(APIView):
                     {"error": "start_date cannot be greater than end_date."},
                     status=400,
                 )
+            if (end_date - start_date).days >= MAX_RANGE_DAYS:
+                return Response({"error": f"Range cannot exceed {MAX_RANGE_DAYS} days."}, status=400)
 
         else:
             return Response(
@@ -383,21 +542,30 @@ class MoodReportAPIView(APIView):
 
         total_days = (end_date - start_date).days + 1
 
-        mood_qs = (
-            TrackMood.objects
-            .filter(
-                user=user,
-                mood_date__range=(start_date, end_date),
-            )
-            .values("mood_date")
-            .annotate(avg_mood=Avg("mood_score"))
-        )
+        include_trend = request.query_params.get("trend") in ("1", "true")
+        window = 7
+        if include_trend:
+            window_param = request.query_params.get("window", "7")
+            if not window_param.isdigit() or not 2 <= int(window_param) <= 90:
+                raise ValidationError({"window": "Window must be between 2 and 90 days."})
+            window = int(window_param)
+            if (start_date - date.min).days < window + 6:
+                earliest = date.min + timedelta(days=window + 6)
+                raise ValidationError(
+                    {"start_date": f"With trend, start_date must be on or after {earliest.isoformat()}."}
+                )
+
+        # Trend windows at the start of the range look back before start_date.
+        fetch_start = start_date - timedelta(days=window + 6) if include_trend else start_date
+
+        # Reads both the hot table and archived months.
+        daily_avg = TrackMoodService.daily_averages(user=user, start_date=fetch_start, end_date=end_date)
 
         # Build map safely (avg_mood will NEVER be null if a row exists)
         mood_map = {
-            row["mood_date"]: float(round(row["avg_mood"], 2))
-            for row in mood_qs
-            if row["avg_mood"] is not None
+            day: float(round(avg, 2))
+            for day, avg in daily_avg.items()
+            if day >= start_date
         }
 
         mood_history = []
@@ -409,6 +577,22 @@ class MoodReportAPIView(APIView):
                 "avg_mood": mood_map.get(d),  # None only if no entry exists
             })
 
+        trend = None
+        if include_trend:
+            metrics = daily_trend(daily_avg, start_date=start_date, end_date=end_date, window=window)
+            series = zip(metrics["rolling_mean"], metrics["rolling_std"], metrics["week_over_week"])
+            for item, (mean, std, delta) in zip(mood_history, series):
+                item["rolling_mean"] = None if np.isnan(mean) else round(float(mean), 2)
+                item["rolling_std"] = None if np.isnan(std) else round(float(std), 2)
+                item["week_over_week"] = None if np.isnan(delta) else round(float(delta), 2)
+            trend = {
+                "window": window,
+                "slope_per_day": (
+                    round(metrics["slope_per_day"], 4)
+                    if metrics["slope_per_day"] is not None else None
+                ),
+            }
+
         mood_dates = sorted(mood_map.keys())
 
         # ✅ FIXED STREAK LOGIC
@@ -439,4 +623,114 @@ class MoodReportAPIView(APIView):
             "activity_log": {
                 "active_days": active_days,
             },
+            **({"trend": trend} if trend else {}),
+        })
+
+
+
+class FeelingStatsAPIView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        start_date, end_date = parse_date_range(request.query_params)
+        limit = request.query_params.get("limit")
+        if limit is not None and (not limit.isdigit() or int(limit) <= 0):
+            raise ValidationError({"limit": "Must be a positive integer."})
+
+        rows = TrackMoodService.feeling_stats(
+            user=request.user,
+            start_date=start_date,
+            end_date=end_date,
+            limit=int(limit) if limit else None,
+        )
+
+        feelings = []
+        for row in rows:
+            breakdown = {
+                label: row[f"score_{score}"]
+                for score, label in TrackMood.MOOD_CHOICES
+            }
+            low_mood = row["score_0"] + row["score_1"]
+            feelings.append({
+                "feeling": row["feeling"],
+                "total": row["total"],
+                "avg_mood": round(float(row["avg_mood"]), 2),
+                "low_mood_share": round(low_mood / row["total"], 2),
+                "mood_breakdown": breakdown,
+            })
+
+        return Response({
+            "success": True,
+            "message": "Feeling statistics retrieved successfully",
+            "range": {
+                "start_date": start_date.isoformat(),
+                "end_date": end_date.isoformat(),
+            },
+            "data": feelings,
+        })
+
+
+class MoodHeatmapAPIView(APIView):
+    """
+    Yearly check-in calendar as a base64 bitset: bit ``i`` (little-endian,
+    byte ``i // 8``, bit ``i % 8``) is set when day-of-year ``i + 1`` has an
+    entry. ``?levels=1`` adds a 3-bit-per-day array holding ``mood_score + 1``.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        year = request.query_params.get("year")
+        if year is None:
+            year = timezone.localdate().year
+        elif not year.isdigit() or not 1 <= int(year) <= 9999:
+            raise ValidationError({"year": "Must be a valid year."})
+
+        data = MoodActivityService.heatmap(
+            user=request.user,
+            year=int(year),
+            include_levels=request.query_params.get("levels") in ("1", "true"),
+        )
+
+        return Response({
+            "success": True,
+            "message": "Mood heatmap retrieved successfully",
+            "data": data,
+        })
+
+
+class PopulationMoodAnalyticsAPIView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        start_date, end_date = parse_date_range(request.query_params, default_days=90)
+        snapshot = PopulationAnalyticsService.snapshot(
+            start_date=start_date,
+            end_date=end_date,
+            refresh=request.query_params.get("refresh") in ("1", "true"),
+        )
+
+        return Response({
+            "success": True,
+            "message": "Population mood analytics retrieved successfully",
+            "data": snapshot,
+        })
+
+
+class CohortRetentionAPIView(APIView):
+    """Latest stored signup-cohort retention matrix (see build_retention_report)."""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        report = RetentionService.latest()
+        if report is None:
+            return Response(
+                {"success": False, "message": "No retention report has been built yet"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        return Response({
+            "success": True,
+            "message": "Cohort retention retrieved successfully",
+            "generated_at": report.created_at.isoformat(),
+            "data": report.payload,
         })
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class PrivacyConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'privacy'
+
+    def ready(self) -> None:
+        import privacy.signals  # noqa: F401
@@ -0,0 +1,131 @@
+import hashlib
+import threading
+import uuid
+from typing import Callable, Dict, Optional, Tuple, TypedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Model
+
+from account.caching import cache_is_shared, unshared_cache_ttl
+
+CONTENT_VERSION_KEY = "privacy:content:{label}:version"
+CONTENT_PAYLOAD_KEY = "privacy:content:{label}:{version}:{variant}"
+IMMUTABLE_PAYLOAD_KEY = "privacy:content:{label}:immutable:{variant}"
+# Stands in for the shared version of entries that are never invalidated.
+IMMUTABLE = "immutable"
+
+
+class RenderedContent(TypedDict):
+    body: Optional[bytes]  # None when no content has been written yet
+    etag: Optional[str]
+
+
+def _label(model) -> str:
+    return model._meta.label_lower
+
+
+def _timeout() -> int:
+    timeout = getattr(settings, "PRIVACY_CONTENT_CACHE_TTL", 60 * 60 * 24 * 7)
+    return timeout if cache_is_shared() else min(timeout, unshared_cache_ttl())
+
+
+def _version_timeout() -> Optional[int]:
+    # Without a shared cache an invalidation never reaches the other workers,
+    # so their versions expire on their own instead.
+    return None if cache_is_shared() else unshared_cache_ttl()
+
+
+class ContentCache:
+    """
+    Rendered GET responses of the single-object content pages (privacy
+    policy, about us, terms), held in memory per worker and shared through
+    the cache.
+
+    Each model has a shared version key that is replaced whenever one of its
+    rows is saved or deleted (see ``privacy.signals``). A worker serves its
+    in-memory copy while the version matches, so a steady-state request costs
+    one cache read and no database queries; after a change the first worker
+    renders the page and the others pick it up from the cache.
+
+    A model can have several entries (``variant``): the page itself, its
+    current-version pointer and its version list. URLs in them come from
+    PRIVACY_CONTENT_ORIGIN, not the request, so there is one entry per
+    variant whatever the Host header; each worker keeps at most
+    PRIVACY_CONTENT_LOCAL_ENTRIES of them. Versions, which never change,
+    are kept apart with ``get_immutable``.
+
+    Without a shared cache (no REDIS_URL) an invalidation only reaches the
+    worker that saved, so versions then expire after UNSHARED_CACHE_TTL
+    seconds and the other workers re-render.
+    """
+
+    _local: Dict[Tuple[str, str], Tuple[str, RenderedContent]] = {}
+    _local_lock = threading.Lock()
+
+    @staticmethod
+    def _shared_version(label: str) -> str:
+        key = CONTENT_VERSION_KEY.format(label=label)
+        version = cache.get(key)
+        if version is None:
+            cache.add(key, uuid.uuid4().hex, timeout=_version_timeout())
+            version = cache.get(key)
+        return version
+
+    @classmethod
+    def _remember(cls, key: Tuple[str, str], entry: Tuple[str, RenderedContent]) -> None:
+        with cls._local_lock:
+            cls._local.pop(key, None)
+            while cls._local and len(cls._local) >= getattr(settings, "PRIVACY_CONTENT_LOCAL_ENTRIES", 64):
+                # Oldest first: dicts keep insertion order.
+                del cls._local[next(iter(cls._local))]
+            cls._local[key] = entry
+
+    @classmethod
+    def get(cls, model: type[Model], variant: str, render: Callable[[], Optional[bytes]]) -> RenderedContent:
+        label = _label(model)
+        version = cls._shared_version(label)
+        local = cls._local.get((label, variant))
+        if local is not None and local[0] == version:
+            return local[1]
+
+        key = CONTENT_PAYLOAD_KEY.format(label=label, version=version, variant=variant)
+        rendered: Optional[RenderedContent] = cache.get(key)
+        if rendered is None:
+            body = render()
+            rendered = {
+                "body": body,
+                "etag": f'"{hashlib.sha256(body).hexdigest()}"' if body is not None else None,
+            }
+            cache.set(key, rendered, timeout=_timeout())
+        cls._remember((label, variant), (version, rendered))
+        return rendered
+
+    @classmethod
+    def get_immutable(
+        cls, model: type[Model], variant: str, render: Callable[[], Optional[bytes]]
+    ) -> RenderedContent:
+        """
+        Like ``get`` for content that never changes once it exists, such as a
+        ContentVersion: it is kept under its own key, untouched by
+        ``invalidate``. A miss (``render`` returning None) is not cached.
+        """
+        label = _label(model)
+        local = cls._local.get((label, variant))
+        if local is not None and local[0] == IMMUTABLE:
+            return local[1]
+
+        key = IMMUTABLE_PAYLOAD_KEY.format(label=label, variant=variant)
+        rendered: Optional[RenderedContent] = cache.get(key)
+        if rendered is None:
+            body = render()
+            if body is None:
+                return {"body": None, "etag": None}
+            rendered = {"body": body, "etag": f'"{hashlib.sha256(body).hexdigest()}"'}
+            cache.set(key, rendered, timeout=getattr(settings, "PRIVACY_CONTENT_CACHE_TTL", 60 * 60 * 24 * 7))
+        cls._remember((label, variant), (IMMUTABLE, rendered))
+        return rendered
+
+    @staticmethod
+    def invalidate(model: type[Model]) -> None:
+        cache.set(CONTENT_VERSION_KEY.format(label=_label(model)), uuid.uuid4().hex, timeout=_version_timeout())
@@ -0,0 +1,51 @@
+# Generated by Django 5.2.9 on 2026-10-19 17:50
+
+import hashlib
+import json
+
+from django.db import migrations, models
+
+
+def snapshot_existing(apps, schema_editor):
+    ContentVersion = apps.get_model("privacy", "ContentVersion")
+    for name in ("PrivacyPolicy", "AboutUs", "TermsConditions"):
+        Model = apps.get_model("privacy", name)
+        # The row the views serve (most recently updated).
+        instance = Model.objects.order_by("-last_updated").first()
+        if instance is None:
+            continue
+        raw = json.dumps({"description": instance.description, "image": instance.image.name or ""}, sort_keys=True)
+        ContentVersion.objects.create(
+            kind=Model._meta.model_name,
+            number=1,
+            content_hash=hashlib.sha256(raw.encode()).hexdigest(),
+            image=instance.image.name or None,
+            description=instance.description,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('privacy', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContentVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(max_length=50)),
+                ('number', models.PositiveIntegerField()),
+                ('content_hash', models.CharField(max_length=64)),
+                ('image', models.ImageField(blank=True, null=True, upload_to='content/')),
+                ('description', models.TextField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['kind', '-number'],
+                'constraints': [models.UniqueConstraint(fields=('kind', 'number'), name='unique_content_version')],
+            },
+        ),
+        migrations.RunPython(snapshot_existing, migrations.RunPython.noop),
+    ]
@@ -28,4 +28,25 @@ class AboutUs(BaseContent):
 class TermsConditions(BaseContent):
     class Meta:
         verbose_name = "Terms & Conditions"
-        verbose_name_plural = "Terms & Conditions"
\ No newline at end of file
+        verbose_name_plural = "Terms & Conditions"
+
+class ContentVersion(models.Model):
+    """
+    Immutable snapshot of a content page, taken whenever its content changes.
+    ``kind`` is the content model's name; versions are numbered per kind.
+    """
+    kind = models.CharField(max_length=50)
+    number = models.PositiveIntegerField()
+    content_hash = models.CharField(max_length=64)
+    image = models.ImageField(upload_to="content/", null=True, blank=True)
+    description = models.TextField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["kind", "-number"]
+        constraints = [
+            models.UniqueConstraint(fields=["kind", "number"], name="unique_content_version"),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} v{self.number}"
@@ -1,8 +1,27 @@
+from django.conf import settings
+from django.db import models
 from rest_framework import serializers
-from .models import PrivacyPolicy, AboutUs, TermsConditions
+from .models import PrivacyPolicy, AboutUs, TermsConditions, ContentVersion
+
+
+def content_url(path: str) -> str:
+    """``path`` on PRIVACY_CONTENT_ORIGIN, or left relative when it is not set."""
+    return getattr(settings, "PRIVACY_CONTENT_ORIGIN", "").rstrip("/") + path
+
+
+class ContentImageField(serializers.ImageField):
+    """An image URL built from PRIVACY_CONTENT_ORIGIN, never from the request's Host."""
+
+    def to_representation(self, value):
+        return content_url(value.url) if value else None
 
 
 class BaseContentSerializer(serializers.ModelSerializer):
+    serializer_field_mapping = {
+        **serializers.ModelSerializer.serializer_field_mapping,
+        models.ImageField: ContentImageField,
+    }
+
     class Meta:
         fields = ["id", "image", "description", "last_updated"]
         read_only_fields = ["id", "last_updated"]
@@ -20,4 +39,13 @@ class AboutUsSerializer(BaseContentSerializer):
 
 class TermsConditionsSerializer(BaseContentSerializer):
     class Meta(BaseContentSerializer.Meta):
-        model = TermsConditions
\ No newline at end of file
+        model = TermsConditions
+
+
+class ContentVersionSerializer(serializers.ModelSerializer):
+    serializer_field_mapping = BaseContentSerializer.serializer_field_mapping
+
+    class Meta:
+        model = ContentVersion
+        fields = ["number", "content_hash", "image", "description", "created_at"]
+        read_only_fields = fields
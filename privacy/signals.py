@@ -0,0 +1,24 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import ContentCache
+from .models import AboutUs, PrivacyPolicy, TermsConditions
+from .versions import ContentVersionService
+
+
+@receiver(post_save, sender=PrivacyPolicy)
+@receiver(post_save, sender=AboutUs)
+@receiver(post_save, sender=TermsConditions)
+@receiver(post_delete, sender=PrivacyPolicy)
+@receiver(post_delete, sender=AboutUs)
+@receiver(post_delete, sender=TermsConditions)
+def invalidate_content_cache(sender, instance, **kwargs) -> None:
+    transaction.on_commit(lambda: ContentCache.invalidate(sender))
+
+
+@receiver(post_save, sender=PrivacyPolicy)
+@receiver(post_save, sender=AboutUs)
+@receiver(post_save, sender=TermsConditions)
+def snapshot_content_version(sender, instance, **kwargs) -> None:
+    ContentVersionService.snapshot(instance)
@@ -1,13 +1,31 @@
 # app_name/urls.py
 from django.urls import path
+from .models import PrivacyPolicy, AboutUs, TermsConditions
 from .views import (
     PrivacyPolicyView,
     AboutUsView,
     TermsConditionsView,
+    ContentVersionListView,
+    ContentVersionView,
+    CurrentContentVersionView,
 )
 
+
+def version_urls(prefix, model):
+    """Current-version pointer, history and permanent per-version URLs of one page."""
+    views = dict(content_model=model, version_url_name=f"{prefix}-version")
+    return [
+        path(f"{prefix}/current/", CurrentContentVersionView.as_view(**views), name=f"{prefix}-current"),
+        path(f"{prefix}/versions/", ContentVersionListView.as_view(**views), name=f"{prefix}-versions"),
+        path(f"{prefix}/versions/<int:number>/", ContentVersionView.as_view(**views), name=f"{prefix}-version"),
+    ]
+
+
 urlpatterns = [
     path("privacy-policy/", PrivacyPolicyView.as_view(), name="privacy-policy"),
     path("about-us/", AboutUsView.as_view(), name="about-us"),
     path("terms-conditions/", TermsConditionsView.as_view(), name="terms-conditions"),
+    *version_urls("privacy-policy", PrivacyPolicy),
+    *version_urls("about-us", AboutUs),
+    *version_urls("terms-conditions", TermsConditions),
 ]
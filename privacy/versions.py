@@ -0,0 +1,69 @@
+import hashlib
+import json
+from typing import Optional
+
+from django.db import IntegrityError, transaction
+
+from .models import ContentVersion
+
+
+def content_hash(description: str, image_name: Optional[str]) -> str:
+    raw = json.dumps({"description": description, "image": image_name or ""}, sort_keys=True)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+class ContentVersionService:
+    """
+    Versions of the single-object content pages. Every change to a page's
+    content adds a numbered, immutable ContentVersion (see
+    ``privacy.signals``); old versions are never changed or deleted, so they
+    double as the page's history.
+    """
+
+    @staticmethod
+    def kind(model) -> str:
+        return model._meta.model_name
+
+    @staticmethod
+    def snapshot(instance) -> Optional[ContentVersion]:
+        """
+        Record ``instance`` as the next version of its page unless its content
+        equals the current version. Returns the new version, if any.
+        """
+        try:
+            return ContentVersionService._snapshot(instance)
+        except IntegrityError:
+            # Two first snapshots of a page raced (there was no row to lock);
+            # the other one now holds number 1, so this one comes after it.
+            return ContentVersionService._snapshot(instance)
+
+    @staticmethod
+    @transaction.atomic
+    def _snapshot(instance) -> Optional[ContentVersion]:
+        kind = ContentVersionService.kind(type(instance))
+        digest = content_hash(instance.description, instance.image.name)
+        # Locking the current version serializes concurrent snapshots of a page.
+        current = (
+            ContentVersion.objects.select_for_update()
+            .filter(kind=kind)
+            .order_by("-number")
+            .first()
+        )
+        if current is not None and current.content_hash == digest:
+            return None
+        return ContentVersion.objects.create(
+            kind=kind,
+            number=current.number + 1 if current else 1,
+            content_hash=digest,
+            image=instance.image.name or None,
+            description=instance.description,
+        )
+
+    @staticmethod
+    def current(model) -> Optional[ContentVersion]:
+        return (
+            ContentVersion.objects
+            .filter(kind=ContentVersionService.kind(model))
+            .order_by("-number")
+            .first()
+        )
@@ -13,14 +13,42 @@ from rest_framework.response import Response
 
 from rest_framework import generics, status
 from rest_framework.permissions import AllowAny
+from rest_framework.renderers import JSONRenderer
+from django.conf import settings
 from django.db import transaction
+from django.http import HttpResponse, HttpResponseNotModified
+from django.urls import reverse
+from django.utils.http import parse_etags
 from rest_framework.response import Response
+from typing import Optional
 
-from .models import PrivacyPolicy, AboutUs, TermsConditions
-from .serializers import PrivacyPolicySerializer, AboutUsSerializer, TermsConditionsSerializer
+from .cache import ContentCache, RenderedContent
+from .models import PrivacyPolicy, AboutUs, TermsConditions, ContentVersion
+from .serializers import (
+    PrivacyPolicySerializer, AboutUsSerializer, TermsConditionsSerializer, ContentVersionSerializer, content_url,
+)
+from .versions import ContentVersionService
 from account.permissions import IsSuperuserOrReadOnly
 
 
+def cached_response(request, rendered: RenderedContent, cache_control: str):
+    """A rendered ContentCache entry as a response, or a 304 when the client's ETag matches."""
+    if rendered["body"] is None:
+        return Response(
+            {"success": False, "message": "Content not found."},
+            status=status.HTTP_404_NOT_FOUND
+        )
+
+    etags = parse_etags(request.headers.get("If-None-Match", ""))
+    if "*" in etags or rendered["etag"] in etags:
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(rendered["body"], content_type="application/json")
+    response["ETag"] = rendered["etag"]
+    response["Cache-Control"] = cache_control
+    return response
+
+
 class SingleObjectViewMixin:
     def get_object(self):
         return self.queryset.first()
@@ -29,22 +57,29 @@ class SingleObjectViewMixin:
 class BaseSingleObjectView(SingleObjectViewMixin, generics.RetrieveUpdateAPIView):
     permission_classes = [IsSuperuserOrReadOnly]
 
-    def get(self, request, *args, **kwargs):
+    def render_content(self) -> Optional[bytes]:
         instance = self.get_object()
         if not instance:
-            return Response(
-                {"success": False, "message": "Content not found."},
-                status=status.HTTP_404_NOT_FOUND
-            )
+            return None
 
-        serializer = self.get_serializer(instance)
-        return Response(
+        # No request in the context: URLs in a shared response must not depend on its Host.
+        serializer = self.get_serializer_class()(instance)
+        return JSONRenderer().render(
             {
                 "success": True,
                 "message": "Content retrieved successfully.",
                 "data": serializer.data,
-            },
-            status=status.HTTP_200_OK,
+            }
+        )
+
+    def get(self, request, *args, **kwargs):
+        """
+        Served from ContentCache with a strong ETag and a long max-age;
+        ``If-None-Match`` with the current ETag gets a 304.
+        """
+        rendered = ContentCache.get(self.queryset.model, "page", self.render_content)
+        return cached_response(
+            request, rendered, f"public, max-age={getattr(settings, 'PRIVACY_CONTENT_MAX_AGE', 86400)}"
         )
 
     @transaction.atomic
@@ -120,3 +155,92 @@ class AboutUsView(BaseSingleObjectView):
 class TermsConditionsView(BaseSingleObjectView):
     queryset = TermsConditions.objects.all()
     serializer_class = TermsConditionsSerializer
+
+
+class BaseContentVersionView(APIView):
+    """
+    Read-only views over a page's ContentVersions. ``content_model`` and
+    ``version_url_name`` (the URL name of the single-version view) are set
+    per page in ``privacy.urls``.
+    """
+    permission_classes = [IsSuperuserOrReadOnly]
+    content_model = None
+    version_url_name = None
+
+    def version_url(self, number: int) -> str:
+        return content_url(reverse(self.version_url_name, kwargs={"number": number}))
+
+    def respond(self, request, variant: str, render, cache_control: str):
+        rendered = ContentCache.get(self.content_model, variant, render)
+        return cached_response(request, rendered, cache_control)
+
+
+def _pointer_cache_control() -> str:
+    return f"public, max-age={getattr(settings, 'PRIVACY_CONTENT_POINTER_MAX_AGE', 60)}"
+
+
+class CurrentContentVersionView(BaseContentVersionView):
+    """
+    The current version's number, hash and permanent URL. Clients poll this
+    cheap pointer and refetch the page only when the version changes.
+    """
+
+    def get(self, request, *args, **kwargs):
+        def render() -> Optional[bytes]:
+            current = ContentVersionService.current(self.content_model)
+            if current is None:
+                return None
+            return JSONRenderer().render({
+                "success": True,
+                "message": "Current version retrieved successfully.",
+                "data": {
+                    "number": current.number,
+                    "content_hash": current.content_hash,
+                    "url": self.version_url(current.number),
+                },
+            })
+
+        return self.respond(request, "current", render, _pointer_cache_control())
+
+
+class ContentVersionListView(BaseContentVersionView):
+    """Every version of the page, newest first, without the content itself."""
+
+    def get(self, request, *args, **kwargs):
+        def render() -> bytes:
+            versions = (
+                ContentVersion.objects
+                .filter(kind=ContentVersionService.kind(self.content_model))
+                .order_by("-number")
+                .values("number", "content_hash", "created_at")
+            )
+            return JSONRenderer().render({
+                "success": True,
+                "message": "Versions retrieved successfully.",
+                "data": [
+                    {**version, "url": self.version_url(version["number"])}
+                    for version in versions
+                ],
+            })
+
+        return self.respond(request, "versions", render, _pointer_cache_control())
+
+
+class ContentVersionView(BaseContentVersionView):
+    """One version. Versions never change, so the response is cacheable forever."""
+
+    def get(self, request, number: int, *args, **kwargs):
+        def render() -> Optional[bytes]:
+            version = ContentVersion.objects.filter(
+                kind=ContentVersionService.kind(self.content_model), number=number
+            ).first()
+            if version is None:
+                return None
+            return JSONRenderer().render({
+                "success": True,
+                "message": "Content version retrieved successfully.",
+                "data": ContentVersionSerializer(version).data,
+            })
+
+        rendered = ContentCache.get_immutable(self.content_model, f"version:{number}", render)
+        return cached_response(request, rendered, "public, max-age=31536000, immutable")
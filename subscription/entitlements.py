@@ -0,0 +1,120 @@
+import time
+from typing import Dict, FrozenSet, Iterable, List, Optional, TypedDict
+
+from django.conf import settings
+from django.core.cache import cache
+
+from account.caching import cache_is_shared, unshared_cache_ttl
+from .models import ACTIVE_STATUSES, Subscription
+
+# Bump when the record layout or the feature mapping changes; old records
+# are then simply never read again.
+ENTITLEMENT_VERSION = 2
+ENTITLEMENT_KEY = "subscription:entitlement:v{version}:{user_id}"
+
+PREMIUM_FEATURES: FrozenSet[str] = frozenset({
+    "mood_report",
+    "mood_export",
+    "mood_heatmap",
+    "journal_search",
+})
+# Features per plan name; an active plan that is not listed gets PREMIUM_FEATURES.
+PLAN_FEATURES: Dict[str, FrozenSet[str]] = {
+    "Premium Plan": PREMIUM_FEATURES,
+}
+
+
+class Entitlement(TypedDict):
+    version: int
+    user_id: int
+    active: bool
+    plan: Optional[str]
+    features: List[str]
+    expires_at: Optional[float]  # end of a period that will not renew
+    built_at: float
+
+
+def _key(user_id: int) -> str:
+    return ENTITLEMENT_KEY.format(version=ENTITLEMENT_VERSION, user_id=user_id)
+
+
+def _timeout() -> int:
+    timeout = getattr(settings, "ENTITLEMENT_CACHE_TTL", 60 * 60 * 24)
+    # A rebuild only reaches this process's cache when it is not shared.
+    return timeout if cache_is_shared() else min(timeout, unshared_cache_ttl())
+
+
+def _record(user_id: int, subscription: Optional[Subscription]) -> Entitlement:
+    plan = subscription.plan_name if subscription else None
+    return {
+        "version": ENTITLEMENT_VERSION,
+        "user_id": user_id,
+        "active": subscription is not None,
+        "plan": plan,
+        "features": sorted(PLAN_FEATURES.get(plan, PREMIUM_FEATURES)) if subscription else [],
+        "expires_at": (
+            subscription.current_period_end.timestamp()
+            if subscription and subscription.cancel_at_period_end and subscription.current_period_end
+            else None
+        ),
+        "built_at": time.time(),
+    }
+
+
+class EntitlementService:
+    """
+    What a user's subscription allows, cached per user in the shared cache.
+
+    Records are rebuilt when a Subscription changes (see
+    ``subscription.signals``, and the Stripe event worker for bulk writes),
+    so checking an entitlement is a single cache read. A missing record is
+    built from the database once and cached with ``cache.add``, so a record
+    built from a read that a concurrent rebuild has since superseded never
+    overwrites the rebuilt one.
+
+    Without a shared cache (no REDIS_URL) other processes would never see a
+    rebuild, so records then expire after UNSHARED_CACHE_TTL seconds.
+    """
+
+    @staticmethod
+    def build_many(user_ids: Iterable[int]) -> Dict[int, Entitlement]:
+        user_ids = set(user_ids)
+        latest: Dict[int, Subscription] = {}
+        # Oldest first, so the newest active subscription wins.
+        for subscription in (
+            Subscription.objects
+            .filter(user_id__in=user_ids, status__in=ACTIVE_STATUSES)
+            .order_by("created_at", "id")
+        ):
+            latest[subscription.user_id] = subscription
+        return {user_id: _record(user_id, latest.get(user_id)) for user_id in user_ids}
+
+    @staticmethod
+    def rebuild(user_ids: Iterable[int]) -> None:
+        records = EntitlementService.build_many(user_ids)
+        if records:
+            cache.set_many({_key(user_id): record for user_id, record in records.items()}, timeout=_timeout())
+
+    @staticmethod
+    def get(user_id: int) -> Entitlement:
+        record = cache.get(_key(user_id))
+        if record is None:
+            record = EntitlementService.build_many([user_id])[user_id]
+            if not cache.add(_key(user_id), record, timeout=_timeout()):
+                # A rebuild got there first; its record is the current one.
+                record = cache.get(_key(user_id)) or record
+        return record
+
+    @staticmethod
+    def is_active(record: Entitlement) -> bool:
+        """Honours ``expires_at`` even before the expiry sweeper has run."""
+        return record["active"] and (record["expires_at"] is None or time.time() < record["expires_at"])
+
+    @staticmethod
+    def for_request(request) -> Entitlement:
+        """The requesting user's entitlement, read at most once per request."""
+        record = getattr(request, "_entitlement", None)
+        if record is None:
+            record = EntitlementService.get(request.user.pk)
+            request._entitlement = record
+        return record
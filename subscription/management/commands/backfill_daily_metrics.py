@@ -0,0 +1,24 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from subscription.services import DailyMetricService
+
+
+def _date(value: str) -> date:
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise CommandError(f"Invalid date '{value}'. Use YYYY-MM-DD.")
+
+
+class Command(BaseCommand):
+    help = "Rebuild DailyMetric rows (signups, subscriptions, revenue) from users and subscriptions."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--start-date", type=_date, help="First day to rebuild (default: all history).")
+        parser.add_argument("--end-date", type=_date, help="Last day to rebuild (default: today).")
+
+    def handle(self, *args, **options):
+        written = DailyMetricService.rebuild(start_date=options["start_date"], end_date=options["end_date"])
+        self.stdout.write(f"Rebuilt {written} daily metric row(s).")
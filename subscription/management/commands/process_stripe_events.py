@@ -0,0 +1,30 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from subscription.webhooks import DEFAULT_BATCH_SIZE, StripeEventService
+
+
+class Command(BaseCommand):
+    help = "Apply recorded Stripe webhook events to subscriptions, oldest first."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+        parser.add_argument("--loop", action="store_true", help="Keep polling for new events.")
+        parser.add_argument("--interval", type=float, default=1.0, help="Seconds to sleep when idle (with --loop).")
+        parser.add_argument("--retry-failed", action="store_true", help="Requeue failed events first.")
+
+    def handle(self, *args, **options):
+        if options["retry_failed"]:
+            self.stdout.write(f"Requeued {StripeEventService.retry_failed()} failed event(s).")
+
+        while True:
+            stats = StripeEventService.process_pending(batch_size=options["batch_size"])
+            if any(stats.values()):
+                self.stdout.write(
+                    f"Processed {stats['processed']}, skipped {stats['skipped']}, failed {stats['failed']} event(s)."
+                )
+                continue
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from subscription.services import DashboardMetricsService
+
+
+class Command(BaseCommand):
+    help = "Recompute the dashboard metrics snapshot (run from cron ahead of DASHBOARD_METRICS_TTL)."
+
+    def handle(self, *args, **options):
+        snapshot = DashboardMetricsService.refresh()
+        data = snapshot["data"]
+        self.stdout.write(
+            f"Dashboard metrics refreshed: {data['customers']['total']} customers, "
+            f"revenue {data['revenue']['total']}, {len(data['user_growth'])} month(s) of user growth."
+        )
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from subscription.sweeper import DEFAULT_CHUNK_SIZE, SubscriptionSweepService
+
+
+class Command(BaseCommand):
+    help = (
+        "Expire or mark past due subscriptions whose period has ended. "
+        "Safe to run on several nodes at once."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        stats = SubscriptionSweepService.sweep(chunk_size=options["chunk_size"])
+        self.stdout.write(
+            f"Swept {stats['chunks']} chunk(s): {stats['expired']} expired, "
+            f"{stats['past_due']} past due."
+        )
@@ -0,0 +1,47 @@
+from datetime import date
+from decimal import Decimal
+
+from django.db import IntegrityError, models, transaction
+from django.db.models import F
+
+
+class DailyMetricManager(models.Manager):
+
+    def bump(self, day: date, *, signups: int = 0, subscriptions: int = 0, revenue: Decimal = Decimal("0")) -> None:
+        """
+        Add the given deltas to the row for ``day`` with one UPDATE, creating
+        the row on the first event of the day.
+        """
+        deltas = {
+            "signups": F("signups") + signups,
+            "subscriptions": F("subscriptions") + subscriptions,
+            "revenue": F("revenue") + revenue,
+        }
+        if self.filter(date=day).update(**deltas):
+            return
+        try:
+            with transaction.atomic():
+                self.create(date=day, signups=signups, subscriptions=subscriptions, revenue=revenue)
+        except IntegrityError:
+            # Another transaction created the row first.
+            self.filter(date=day).update(**deltas)
+
+
+class MetricCounterManager(models.Manager):
+
+    def bump(self, name: str, delta: int) -> None:
+        """Add ``delta`` to the counter ``name``, creating it on first use."""
+        if self.filter(name=name).update(value=F("value") + delta):
+            return
+        try:
+            with transaction.atomic():
+                self.create(name=name, value=delta)
+        except IntegrityError:
+            # Another transaction created the row first.
+            self.filter(name=name).update(value=F("value") + delta)
+
+    def value(self, name: str) -> int:
+        return self.filter(name=name).values_list("value", flat=True).first() or 0
+
+    def reset(self, name: str, value: int) -> None:
+        self.update_or_create(name=name, defaults={"value": value})
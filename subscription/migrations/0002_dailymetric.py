@@ -0,0 +1,51 @@
+# Generated by Django 5.2.9 on 2026-10-19 17:08
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+
+
+def backfill_daily_metrics(apps, schema_editor):
+    UserAuth = apps.get_model("account", "UserAuth")
+    Subscription = apps.get_model("subscription", "Subscription")
+    DailyMetric = apps.get_model("subscription", "DailyMetric")
+
+    days = {}
+    for row in UserAuth.objects.annotate(day=TruncDate("date_joined")).values("day").annotate(total=Count("pk")):
+        days.setdefault(row["day"], DailyMetric(date=row["day"])).signups = row["total"]
+    subscriptions = (
+        Subscription.objects.annotate(day=TruncDate("created_at"))
+        .values("day")
+        .annotate(total=Count("pk"), revenue=Sum("plan_price"))
+    )
+    for row in subscriptions:
+        metric = days.setdefault(row["day"], DailyMetric(date=row["day"]))
+        metric.subscriptions = row["total"]
+        metric.revenue = row["revenue"] or 0
+    DailyMetric.objects.bulk_create(days.values(), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('account', '0008_userauth_account_use_date_jo_4d3e29_idx'),
+        ('subscription', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyMetric',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(unique=True)),
+                ('signups', models.IntegerField(default=0)),
+                ('subscriptions', models.IntegerField(default=0)),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+            ],
+            options={
+                'verbose_name_plural': 'Daily Metrics',
+                'ordering': ['date'],
+            },
+        ),
+        migrations.RunPython(backfill_daily_metrics, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.9 on 2026-10-19 17:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('subscription', '0002_dailymetric'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='subscription',
+            name='status',
+            field=models.CharField(choices=[('incomplete', 'Incomplete'), ('incomplete_expired', 'Incomplete expired'), ('trialing', 'Trialing'), ('active', 'Active'), ('past_due', 'Past due'), ('canceled', 'Canceled'), ('unpaid', 'Unpaid'), ('paused', 'Paused')], default='active', max_length=32),
+        ),
+        migrations.AddField(
+            model_name='subscription',
+            name='stripe_customer_id',
+            field=models.CharField(blank=True, db_index=True, max_length=255, null=True),
+        ),
+        migrations.AddField(
+            model_name='subscription',
+            name='stripe_event_created',
+            field=models.DateTimeField(blank=True, help_text='Creation time of the last Stripe event applied to this row', null=True),
+        ),
+        migrations.AddField(
+            model_name='subscription',
+            name='stripe_subscription_id',
+            field=models.CharField(blank=True, max_length=255, null=True, unique=True),
+        ),
+        migrations.CreateModel(
+            name='StripeEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event_id', models.CharField(max_length=255, unique=True)),
+                ('type', models.CharField(max_length=100)),
+                ('customer_id', models.CharField(blank=True, max_length=255, null=True)),
+                ('stripe_created', models.DateTimeField()),
+                ('payload', models.JSONField()),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('processed', 'Processed'), ('skipped', 'Skipped'), ('failed', 'Failed')], default='pending', max_length=16)),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('error', models.TextField(blank=True)),
+                ('received_at', models.DateTimeField(auto_now_add=True)),
+                ('processed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Stripe Events',
+                'indexes': [models.Index(fields=['status', 'stripe_created', 'id'], name='subscriptio_status_bc3c9a_idx'), models.Index(fields=['customer_id', 'stripe_created'], name='subscriptio_custome_5783a2_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.9 on 2026-10-19 17:17
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('subscription', '0003_stripe_events'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='subscription',
+            name='cancel_at_period_end',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='subscription',
+            name='current_period_end',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='subscription',
+            name='current_period_start',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='subscription',
+            index=models.Index(fields=['current_period_end', 'status'], name='subscriptio_current_536f69_idx'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.9 on 2026-10-19 18:07
+
+from django.db import migrations, models
+
+
+def count_customers(apps, schema_editor):
+    UserAuth = apps.get_model("account", "UserAuth")
+    MetricCounter = apps.get_model("subscription", "MetricCounter")
+    MetricCounter.objects.create(name="customers", value=UserAuth.objects.count())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('account', '0008_userauth_account_use_date_jo_4d3e29_idx'),
+        ('subscription', '0004_subscription_periods'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MetricCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('value', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name_plural': 'Metric Counters',
+            },
+        ),
+        migrations.RunPython(count_customers, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,40 @@
+from datetime import timedelta
+
+from django.db import migrations
+from django.utils import timezone
+
+# Subscriptions created before billing periods were tracked were monthly.
+PLAN_PERIOD = timedelta(days=30)
+
+
+def backfill_periods(apps, schema_editor):
+    """
+    Give subscriptions without a billing period the one they are in now,
+    counting whole plan periods from ``created_at``, so the expiry sweeper
+    sees them.
+    """
+    Subscription = apps.get_model("subscription", "Subscription")
+    now = timezone.now()
+    batch = []
+    for subscription in Subscription.objects.filter(current_period_end__isnull=True).iterator(chunk_size=1000):
+        start = subscription.created_at
+        if start < now:
+            start += PLAN_PERIOD * ((now - start) // PLAN_PERIOD)
+        subscription.current_period_start = start
+        subscription.current_period_end = start + PLAN_PERIOD
+        batch.append(subscription)
+        if len(batch) >= 1000:
+            Subscription.objects.bulk_update(batch, ["current_period_start", "current_period_end"])
+            batch = []
+    Subscription.objects.bulk_update(batch, ["current_period_start", "current_period_end"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('subscription', '0005_metriccounter'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_periods, migrations.RunPython.noop),
+    ]
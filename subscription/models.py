@@ -1,21 +1,135 @@
 from django.db import models
 from django.contrib.auth import get_user_model
+
+from .managers import DailyMetricManager, MetricCounterManager
 User = get_user_model()
 
 
+# Stripe subscription statuses; only these grant access.
+STATUS_CHOICES = [
+    ("incomplete", "Incomplete"),
+    ("incomplete_expired", "Incomplete expired"),
+    ("trialing", "Trialing"),
+    ("active", "Active"),
+    ("past_due", "Past due"),
+    ("canceled", "Canceled"),
+    ("unpaid", "Unpaid"),
+    ("paused", "Paused"),
+]
+ACTIVE_STATUSES = {"active", "trialing"}
+
+
 # Create your models here.
 class Subscription(models.Model):
     class Meta:
         verbose_name_plural = "Subscriptions"
         db_table = "subscription"
+        indexes = [
+            # Range scan for the expiry sweeper.
+            models.Index(fields=["current_period_end", "status"]),
+        ]
  
     id = models.AutoField(primary_key=True)
     user = models.ForeignKey(User,on_delete=models.CASCADE)
     plan_name = models.CharField(max_length=100,default='Premium Plan')
     currency_symbol = models.CharField(max_length=100,default='USD')
     plan_price = models.DecimalField(max_digits=8, decimal_places=2, default=4.90)
+    status = models.CharField(max_length=32, choices=STATUS_CHOICES, default="active")
+    stripe_customer_id = models.CharField(max_length=255, null=True, blank=True, db_index=True)
+    stripe_subscription_id = models.CharField(max_length=255, null=True, blank=True, unique=True)
+    current_period_start = models.DateTimeField(null=True, blank=True)
+    current_period_end = models.DateTimeField(null=True, blank=True)
+    cancel_at_period_end = models.BooleanField(default=False)
+    stripe_event_created = models.DateTimeField(
+        null=True, blank=True,
+        help_text="Creation time of the last Stripe event applied to this row"
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
  
     def __str__(self):
-        return str(self.user)
\ No newline at end of file
+        return str(self.user)
+
+    @property
+    def is_active(self) -> bool:
+        return self.status in ACTIVE_STATUSES
+
+
+class DailyMetric(models.Model):
+    """
+    Signups, new subscriptions and revenue per day, kept current by
+    ``subscription.signals`` and rebuilt with ``backfill_daily_metrics``.
+
+    Subscriptions and revenue are booked on the day a subscription is
+    created; deleting it later (for instance along with its user) leaves
+    them as they were.
+    """
+
+    date = models.DateField(unique=True)
+    signups = models.IntegerField(default=0)
+    subscriptions = models.IntegerField(default=0)
+    revenue = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+
+    objects = DailyMetricManager()
+
+    class Meta:
+        ordering = ["date"]
+        verbose_name_plural = "Daily Metrics"
+
+    def __str__(self):
+        return f"{self.date} | signups={self.signups} subscriptions={self.subscriptions} revenue={self.revenue}"
+
+
+class MetricCounter(models.Model):
+    """
+    Running totals that would otherwise take a scan of DailyMetric, such as
+    the number of customers. Kept current by ``subscription.signals``.
+    """
+
+    CUSTOMERS = "customers"
+
+    name = models.CharField(max_length=50, unique=True)
+    value = models.BigIntegerField(default=0)
+
+    objects = MetricCounterManager()
+
+    class Meta:
+        verbose_name_plural = "Metric Counters"
+
+    def __str__(self):
+        return f"{self.name}={self.value}"
+
+
+class StripeEvent(models.Model):
+    """
+    Raw Stripe webhook events, deduplicated on the Stripe event id. The
+    webhook only records them; ``process_stripe_events`` applies them.
+    """
+
+    STATUS_CHOICES = [
+        ("pending", "Pending"),
+        ("processed", "Processed"),
+        ("skipped", "Skipped"),
+        ("failed", "Failed"),
+    ]
+
+    event_id = models.CharField(max_length=255, unique=True)
+    type = models.CharField(max_length=100)
+    customer_id = models.CharField(max_length=255, null=True, blank=True)
+    stripe_created = models.DateTimeField()
+    payload = models.JSONField()
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default="pending")
+    attempts = models.PositiveSmallIntegerField(default=0)
+    error = models.TextField(blank=True)
+    received_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "stripe_created", "id"]),
+            models.Index(fields=["customer_id", "stripe_created"]),
+        ]
+        verbose_name_plural = "Stripe Events"
+
+    def __str__(self):
+        return f"{self.event_id} | {self.type} | {self.status}"
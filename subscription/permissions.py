@@ -0,0 +1,23 @@
+from rest_framework.permissions import BasePermission
+
+from .entitlements import EntitlementService
+
+
+class HasEntitlement(BasePermission):
+    """
+    Requires an active subscription, or the view's ``required_feature`` when
+    it sets one. Reads the cached entitlement record, not the database.
+    """
+    message = "An active subscription is required."
+
+    def has_permission(self, request, view):
+        user = request.user
+        if not user or not user.is_authenticated:
+            return False
+        if user.is_superuser:
+            return True
+        entitlement = EntitlementService.for_request(request)
+        if not EntitlementService.is_active(entitlement):
+            return False
+        feature = getattr(view, "required_feature", None)
+        return feature is None or feature in entitlement["features"]
@@ -1,13 +1,19 @@
-from datetime import timedelta
+import time
+from datetime import date, datetime, timedelta
 from decimal import Decimal
-from typing import TypedDict, List
+from typing import Any, Dict, Optional, Tuple, TypedDict, List
 
-from django.db.models import Count, Sum
-from django.db.models.functions import TruncMonth
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Exists, F, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import TruncDate, TruncMonth, TruncWeek
 from django.utils import timezone
+from rest_framework.exceptions import ValidationError
 
 from account.models import UserAuth
-from .models import Subscription
+from account.pagination import decode_cursor, encode_cursor
+from .models import ACTIVE_STATUSES, DailyMetric, MetricCounter, Subscription
 
 
 class GrowthMetric(TypedDict):
@@ -20,6 +26,23 @@ class MonthlyStat(TypedDict):
     total: int
 
 
+class DashboardMetrics(TypedDict):
+    customers: GrowthMetric
+    revenue: GrowthMetric
+    user_growth: List[MonthlyStat]
+
+
+class DashboardSnapshot(TypedDict):
+    generated_at: float  # unix timestamp
+    data: DashboardMetrics
+
+
+DASHBOARD_SNAPSHOT_KEY = "subscription:dashboard_metrics:snapshot"
+DASHBOARD_REFRESH_LOCK_KEY = "subscription:dashboard_metrics:refresh_lock"
+DASHBOARD_REFRESH_LOCK_TIMEOUT = 60
+DASHBOARD_WAIT_INTERVAL = 0.1
+
+
 def _month_range():
     now = timezone.now()
     this_month = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
@@ -27,19 +50,21 @@ def _month_range():
     return this_month, last_month
 
 
-def get_total_customers_with_growth() -> GrowthMetric:
+def _month_dates():
     this_month, last_month = _month_range()
+    return this_month.date(), last_month.date()
 
-    total_customers: int = UserAuth.objects.only("user_id").count()
 
-    current_month: int = UserAuth.objects.filter(
-        date_joined__gte=this_month
-    ).count()
+def get_total_customers_with_growth() -> GrowthMetric:
+    this_month, last_month = _month_dates()
 
-    last_month_count: int = UserAuth.objects.filter(
-        date_joined__gte=last_month,
-        date_joined__lt=this_month,
-    ).count()
+    totals = DailyMetric.objects.filter(date__gte=last_month).aggregate(
+        current=Sum("signups", filter=Q(date__gte=this_month)),
+        previous=Sum("signups", filter=Q(date__lt=this_month)),
+    )
+    total_customers: int = MetricCounter.objects.value(MetricCounter.CUSTOMERS)
+    current_month: int = totals["current"] or 0
+    last_month_count: int = totals["previous"] or 0
 
     growth_rate: float = (
         ((current_month - last_month_count) / last_month_count) * 100
@@ -54,19 +79,14 @@ def get_total_customers_with_growth() -> GrowthMetric:
 
 
 def get_total_revenue_with_growth() -> GrowthMetric:
-    this_month, last_month = _month_range()
-
-    current: Decimal = (
-        Subscription.objects.filter(created_at__gte=this_month)
-        .aggregate(total=Sum("plan_price"))["total"]
-        or Decimal("0.00")
-    )
+    this_month, last_month = _month_dates()
 
-    previous: Decimal = (
-        Subscription.objects.filter(created_at__gte=last_month, created_at__lt=this_month)
-        .aggregate(total=Sum("plan_price"))["total"]
-        or Decimal("0.00")
+    totals = DailyMetric.objects.filter(date__gte=last_month).aggregate(
+        current=Sum("revenue", filter=Q(date__gte=this_month)),
+        previous=Sum("revenue", filter=Q(date__lt=this_month)),
     )
+    current: Decimal = totals["current"] or Decimal("0.00")
+    previous: Decimal = totals["previous"] or Decimal("0.00")
 
     growth_rate: float = (
         float((current - previous) / previous * 100)
@@ -81,15 +101,293 @@ def get_total_revenue_with_growth() -> GrowthMetric:
 
 
 def get_user_growth_monthly(limit: int = 12) -> List[MonthlyStat]:
+    """Signups per month for the last ``limit`` months that had any."""
+    this_month, _ = _month_dates()
     qs = (
-        UserAuth.objects
-        .annotate(month=TruncMonth("date_joined"))
+        DailyMetric.objects
+        .filter(date__gte=_add_months(this_month, -(limit - 1)))
+        .annotate(month=TruncMonth("date"))
         .values("month")
-        .annotate(total=Count("user_id"))
-        .order_by("month")[:limit]
+        .annotate(total=Sum("signups"))
+        .filter(total__gt=0)
+        .order_by("month")
     )
 
     return [
         {"month": item["month"].strftime("%Y-%m"), "total": item["total"]}
         for item in qs
     ]
+
+
+GRANULARITIES = {
+    "day": None,
+    "week": TruncWeek,
+    "month": TruncMonth,
+}
+MAX_SERIES_PERIODS = 1000
+
+
+class MetricPoint(TypedDict):
+    period: str
+    signups: int
+    subscriptions: int
+    revenue: float
+
+
+def _add_months(day: date, months: int) -> date:
+    month = day.month - 1 + months
+    return date(day.year + month // 12, month % 12 + 1, 1)
+
+
+def _period_start(day: date, granularity: str) -> date:
+    if granularity == "week":
+        return day - timedelta(days=day.weekday())
+    if granularity == "month":
+        return day.replace(day=1)
+    return day
+
+
+def _next_period(day: date, granularity: str) -> date:
+    if granularity == "week":
+        return day + timedelta(days=7)
+    if granularity == "month":
+        return _add_months(day, 1)
+    return day + timedelta(days=1)
+
+
+class DailyMetricService:
+
+    @staticmethod
+    def series(*, start_date: date, end_date: date, granularity: str = "day") -> List[MetricPoint]:
+        """
+        Totals per day, ISO week (starting Monday) or month between
+        start_date and end_date, with empty periods filled with zeros.
+        """
+        trunc = GRANULARITIES[granularity]
+        qs = DailyMetric.objects.filter(date__range=(start_date, end_date))
+        qs = qs.annotate(period=trunc("date")) if trunc else qs.annotate(period=F("date"))
+        rows = {
+            row["period"]: row
+            for row in (
+                qs.values("period")
+                .annotate(
+                    signups=Sum("signups"),
+                    subscriptions=Sum("subscriptions"),
+                    revenue=Sum("revenue"),
+                )
+            )
+        }
+
+        points: List[MetricPoint] = []
+        period = _period_start(start_date, granularity)
+        while period <= end_date:
+            row = rows.get(period)
+            points.append({
+                "period": period.isoformat(),
+                "signups": row["signups"] if row else 0,
+                "subscriptions": row["subscriptions"] if row else 0,
+                "revenue": float(row["revenue"]) if row else 0.0,
+            })
+            period = _next_period(period, granularity)
+        return points
+
+    @staticmethod
+    def period_count(*, start_date: date, end_date: date, granularity: str) -> int:
+        count, period = 0, _period_start(start_date, granularity)
+        while period <= end_date and count <= MAX_SERIES_PERIODS:
+            count += 1
+            period = _next_period(period, granularity)
+        return count
+
+    @staticmethod
+    @transaction.atomic
+    def rebuild(*, start_date: Optional[date] = None, end_date: Optional[date] = None) -> int:
+        """
+        Recompute DailyMetric rows from users and subscriptions, for all days
+        or only [start_date, end_date], and reset the customer counter.
+        Returns the number of rows written.
+
+        Deleted subscriptions keep their revenue in DailyMetric but are not
+        seen here, so rebuilding a day drops what they had booked.
+        """
+        users = UserAuth.objects.all()
+        subscriptions = Subscription.objects.all()
+        metrics = DailyMetric.objects.all()
+        if start_date:
+            users = users.filter(date_joined__gte=_start_of_day(start_date))
+            subscriptions = subscriptions.filter(created_at__gte=_start_of_day(start_date))
+            metrics = metrics.filter(date__gte=start_date)
+        if end_date:
+            next_day = _start_of_day(end_date + timedelta(days=1))
+            users = users.filter(date_joined__lt=next_day)
+            subscriptions = subscriptions.filter(created_at__lt=next_day)
+            metrics = metrics.filter(date__lte=end_date)
+
+        days: Dict[date, DailyMetric] = {}
+        for row in users.annotate(day=TruncDate("date_joined")).values("day").annotate(total=Count("pk")):
+            days.setdefault(row["day"], DailyMetric(date=row["day"])).signups = row["total"]
+        for row in (
+            subscriptions.annotate(day=TruncDate("created_at"))
+            .values("day")
+            .annotate(total=Count("pk"), revenue=Sum("plan_price"))
+        ):
+            metric = days.setdefault(row["day"], DailyMetric(date=row["day"]))
+            metric.subscriptions = row["total"]
+            metric.revenue = row["revenue"] or Decimal("0")
+
+        metrics.delete()
+        DailyMetric.objects.bulk_create(days.values(), batch_size=1000)
+        MetricCounter.objects.reset(MetricCounter.CUSTOMERS, UserAuth.objects.count())
+        return len(days)
+
+
+class DashboardMetricsService:
+    """
+    Dashboard metrics served from a snapshot in the shared cache.
+
+    A snapshot older than DASHBOARD_METRICS_TTL is refreshed by the first
+    request that sees it (or by ``refresh_dashboard_metrics`` on a schedule).
+    The refresh is single-flight: one worker takes a cache lock and
+    recomputes, while the others keep serving the stale snapshot. Workers
+    only wait when there is no snapshot at all.
+    """
+
+    @staticmethod
+    def compute() -> DashboardMetrics:
+        return {
+            "customers": get_total_customers_with_growth(),
+            "revenue": get_total_revenue_with_growth(),
+            "user_growth": get_user_growth_monthly(),
+        }
+
+    @staticmethod
+    def refresh() -> DashboardSnapshot:
+        snapshot: DashboardSnapshot = {
+            "generated_at": time.time(),
+            "data": DashboardMetricsService.compute(),
+        }
+        # Kept without expiry so a stale snapshot can be served during a refresh.
+        cache.set(DASHBOARD_SNAPSHOT_KEY, snapshot, timeout=None)
+        return snapshot
+
+    @staticmethod
+    def get_snapshot() -> DashboardSnapshot:
+        snapshot = cache.get(DASHBOARD_SNAPSHOT_KEY)
+        ttl = getattr(settings, "DASHBOARD_METRICS_TTL", 300)
+        if snapshot is not None and time.time() - snapshot["generated_at"] < ttl:
+            return snapshot
+
+        if cache.add(DASHBOARD_REFRESH_LOCK_KEY, 1, timeout=DASHBOARD_REFRESH_LOCK_TIMEOUT):
+            try:
+                return DashboardMetricsService.refresh()
+            finally:
+                cache.delete(DASHBOARD_REFRESH_LOCK_KEY)
+
+        if snapshot is not None:
+            return snapshot
+
+        # Cold start while another worker computes: wait for its snapshot.
+        deadline = time.monotonic() + DASHBOARD_REFRESH_LOCK_TIMEOUT
+        while time.monotonic() < deadline:
+            time.sleep(DASHBOARD_WAIT_INTERVAL)
+            snapshot = cache.get(DASHBOARD_SNAPSHOT_KEY)
+            if snapshot is not None:
+                return snapshot
+        return DashboardMetricsService.refresh()
+
+
+USER_LIST_FIELDS = (
+    "user_id",
+    "full_name",
+    "username",
+    "email",
+    "profile_pic",
+    "date_joined",
+    "plan_name",
+)
+
+
+def _start_of_day(day: date) -> datetime:
+    return timezone.make_aware(datetime.combine(day, datetime.min.time()))
+
+
+def get_users_with_subscription(
+    *,
+    search: Optional[str] = None,
+    plan: Optional[str] = None,
+    is_subscribed: Optional[bool] = None,
+    joined_after: Optional[date] = None,
+    joined_before: Optional[date] = None,
+):
+    """
+    Users newest first, each with the plan name of their latest subscription
+    (one row per user, however many subscriptions they have).
+    """
+    latest_plan = (
+        Subscription.objects
+        .filter(user=OuterRef("pk"))
+        .order_by("-created_at", "-id")
+        .values("plan_name")[:1]
+    )
+    qs = UserAuth.objects.annotate(plan_name=Subquery(latest_plan))
+
+    if search:
+        qs = qs.filter(
+            Q(email__icontains=search)
+            | Q(full_name__icontains=search)
+            | Q(username__icontains=search)
+        )
+    if plan:
+        qs = qs.filter(plan_name__iexact=plan)
+    if is_subscribed is not None:
+        qs = qs.filter(is_subscribed=is_subscribed)
+    if joined_after:
+        qs = qs.filter(date_joined__gte=_start_of_day(joined_after))
+    if joined_before:
+        qs = qs.filter(date_joined__lt=_start_of_day(joined_before + timedelta(days=1)))
+
+    return qs.order_by("-date_joined", "-user_id")
+
+
+def paginate_users(qs, *, cursor: Optional[str], page_size: int) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """One keyset page over (date_joined, user_id), newest first."""
+    position = decode_cursor(cursor)
+    if position:
+        try:
+            joined = datetime.fromisoformat(position["date_joined"])
+            user_id = int(position["user_id"])
+        except (KeyError, TypeError, ValueError):
+            raise ValidationError({"cursor": "Invalid cursor."})
+        qs = qs.filter(
+            Q(date_joined__lt=joined)
+            | Q(date_joined=joined, user_id__lt=user_id)
+        )
+
+    rows = list(qs.values(*USER_LIST_FIELDS)[:page_size + 1])
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        last = rows[-1]
+        next_cursor = encode_cursor({
+            "date_joined": last["date_joined"].isoformat(),
+            "user_id": last["user_id"],
+        })
+    return rows, next_cursor
+
+
+def sync_is_subscribed(user_ids) -> int:
+    """
+    Set UserAuth.is_subscribed from the users' subscription statuses in a
+    single UPDATE. Returns the number of users whose flag changed.
+    """
+    if not user_ids:
+        return 0
+    has_active = Exists(
+        Subscription.objects.filter(user_id=OuterRef("pk"), status__in=ACTIVE_STATUSES)
+    )
+    return (
+        UserAuth.objects
+        .filter(user_id__in=user_ids)
+        .exclude(is_subscribed=has_active)
+        .update(is_subscribed=has_active)
+    )
@@ -0,0 +1,53 @@
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from account.models import UserAuth
+from .entitlements import EntitlementService
+from .models import DailyMetric, MetricCounter, Subscription
+
+
+def _day(value):
+    return timezone.localdate(value) if timezone.is_aware(value) else value.date()
+
+
+@receiver(post_save, sender=UserAuth)
+def count_signup(sender, instance: UserAuth, created: bool, **kwargs) -> None:
+    if created:
+        DailyMetric.objects.bump(_day(instance.date_joined), signups=1)
+        MetricCounter.objects.bump(MetricCounter.CUSTOMERS, 1)
+
+
+@receiver(post_delete, sender=UserAuth)
+def uncount_signup(sender, instance: UserAuth, **kwargs) -> None:
+    DailyMetric.objects.bump(_day(instance.date_joined), signups=-1)
+    MetricCounter.objects.bump(MetricCounter.CUSTOMERS, -1)
+
+
+@receiver(pre_save, sender=Subscription)
+def remember_subscription_price(sender, instance: Subscription, **kwargs) -> None:
+    instance._previous_price = (
+        Subscription.objects.filter(pk=instance.pk).values_list("plan_price", flat=True).first()
+        if instance.pk else None
+    )
+
+
+@receiver(post_save, sender=Subscription)
+def count_subscription(sender, instance: Subscription, created: bool, **kwargs) -> None:
+    price = Decimal(str(instance.plan_price))
+    if created:
+        DailyMetric.objects.bump(_day(instance.created_at), subscriptions=1, revenue=price)
+        return
+    previous = getattr(instance, "_previous_price", None)
+    if previous is not None and previous != price:
+        DailyMetric.objects.bump(_day(instance.created_at), revenue=price - previous)
+
+
+@receiver(post_save, sender=Subscription)
+@receiver(post_delete, sender=Subscription)
+def rebuild_entitlement(sender, instance: Subscription, **kwargs) -> None:
+    user_id = instance.user_id
+    transaction.on_commit(lambda: EntitlementService.rebuild([user_id]))
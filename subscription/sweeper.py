@@ -0,0 +1,108 @@
+from datetime import timedelta
+from typing import List, Optional, TypedDict
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from notification.models import Notification
+from .entitlements import EntitlementService
+from .models import ACTIVE_STATUSES, Subscription
+from .services import sync_is_subscribed
+
+DEFAULT_CHUNK_SIZE = 500
+
+
+class SweepStats(TypedDict):
+    chunks: int
+    expired: int
+    past_due: int
+
+
+def _grace() -> timedelta:
+    return timedelta(days=getattr(settings, "SUBSCRIPTION_PAST_DUE_GRACE_DAYS", 3))
+
+
+def due_subscriptions(now):
+    """
+    Active subscriptions whose period has ended and that the sweeper should
+    act on. Stripe renews its own subscriptions through webhooks, so those
+    are only picked up once the grace period has passed without a renewal.
+    """
+    return Subscription.objects.filter(
+        Q(current_period_end__lte=now - _grace())
+        | Q(cancel_at_period_end=True)
+        | Q(stripe_subscription_id__isnull=True),
+        # The outer bound keeps this a range scan on (current_period_end, status).
+        current_period_end__lte=now,
+        status__in=ACTIVE_STATUSES,
+    )
+
+
+def _notification(subscription: Subscription, event: str, title: str, message: str) -> Notification:
+    return Notification(
+        event=event,
+        title=title,
+        message=f"Subscription #{subscription.pk} ({subscription.plan_name}) {message}",
+        user_id=subscription.user_id,
+    )
+
+
+class SubscriptionSweepService:
+    """
+    Ends subscriptions whose billing period is over, a chunk at a time. Each chunk is one transaction whose rows are locked with SKIP
+    LOCKED, so several nodes can sweep at once without touching the same rows.
+
+    - ``cancel_at_period_end``: the subscription becomes ``canceled``.
+    - Subscriptions not billed through Stripe have no payment that could
+      renew them, so they become ``canceled`` too.
+    - Stripe subscriptions not renewed within the grace period become ``past_due``.
+    """
+
+    @staticmethod
+    @transaction.atomic
+    def sweep_chunk(*, chunk_size: int = DEFAULT_CHUNK_SIZE, now=None) -> Optional[SweepStats]:
+        """Process one chunk; returns None when nothing is due."""
+        now = now or timezone.now()
+        chunk: List[Subscription] = list(
+            due_subscriptions(now)
+            .select_for_update(skip_locked=True)
+            .order_by("current_period_end", "id")[:chunk_size]
+        )
+        if not chunk:
+            return None
+
+        stats: SweepStats = {"chunks": 1, "expired": 0, "past_due": 0}
+        notifications: List[Notification] = []
+        for subscription in chunk:
+            subscription.updated_at = now
+            if subscription.cancel_at_period_end or not subscription.stripe_subscription_id:
+                subscription.status = "canceled"
+                stats["expired"] += 1
+                notifications.append(_notification(
+                    subscription, "Subscription Expired", "Subscription Expired", "ended at the end of its period.",
+                ))
+            else:
+                subscription.status = "past_due"
+                stats["past_due"] += 1
+                notifications.append(_notification(
+                    subscription, "Subscription Past Due", "Subscription Past Due", "was not renewed by Stripe.",
+                ))
+
+        Subscription.objects.bulk_update(chunk, ["status", "updated_at"])
+        user_ids = {subscription.user_id for subscription in chunk}
+        sync_is_subscribed(user_ids)
+        Notification.objects.bulk_create(notifications)
+        # bulk_update skips the Subscription signals that keep entitlements current.
+        transaction.on_commit(lambda: EntitlementService.rebuild(user_ids))
+        return stats
+
+    @staticmethod
+    def sweep(*, chunk_size: int = DEFAULT_CHUNK_SIZE) -> SweepStats:
+        totals: SweepStats = {"chunks": 0, "expired": 0, "past_due": 0}
+        now = timezone.now()
+        while (stats := SubscriptionSweepService.sweep_chunk(chunk_size=chunk_size, now=now)) is not None:
+            for name, value in stats.items():
+                totals[name] += value
+        return totals
@@ -1,3 +1,137 @@
-from django.test import TestCase
+import json
+import time
 
-# Create your tests here.
+from datetime import timedelta
+
+import stripe
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory, force_authenticate
+from rest_framework.views import APIView
+
+from .models import StripeEvent, Subscription
+from .permissions import HasEntitlement
+from .webhooks import StripeEventService
+
+WEBHOOK_URL = "/api/v1/subscription/stripe/webhook/"
+WEBHOOK_SECRET = "whsec_test"
+
+
+def sign(payload: str, secret: str = WEBHOOK_SECRET) -> str:
+    timestamp = int(time.time())
+    signature = stripe.WebhookSignature._compute_signature(f"{timestamp}.{payload}", secret)
+    return f"t={timestamp},{stripe.WebhookSignature.EXPECTED_SCHEME}={signature}"
+
+
+@override_settings(STRIPE_WEBHOOK_SECRET=WEBHOOK_SECRET)
+class StripeWebhookTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(email="stripe@example.com", full_name="Stripe", password="pw")
+
+    def event(self, event_id: str, *, created: int, status: str = "active") -> dict:
+        return {
+            "id": event_id,
+            "type": "customer.subscription.updated",
+            "created": created,
+            "data": {
+                "object": {
+                    "id": "sub_test",
+                    "object": "subscription",
+                    "customer": "cus_test",
+                    "status": status,
+                    "metadata": {"user_id": str(self.user.pk)},
+                }
+            },
+        }
+
+    def post(self, event: dict, *, secret: str = WEBHOOK_SECRET):
+        payload = json.dumps(event)
+        return self.client.post(
+            WEBHOOK_URL, payload, content_type="application/json", headers={"Stripe-Signature": sign(payload, secret)}
+        )
+
+    def test_valid_signature_is_recorded_and_applied(self):
+        response = self.post(self.event("evt_1", created=1_700_000_000))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(StripeEvent.objects.filter(event_id="evt_1", status="pending").exists())
+        self.assertEqual(StripeEventService.process_pending()["processed"], 1)
+        subscription = Subscription.objects.get(stripe_subscription_id="sub_test")
+        self.assertEqual(subscription.user_id, self.user.pk)
+        self.assertEqual(subscription.status, "active")
+
+    def test_bad_signature_is_rejected(self):
+        response = self.post(self.event("evt_1", created=1_700_000_000), secret="whsec_other")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(StripeEvent.objects.exists())
+
+    def test_duplicate_event_is_processed_once(self):
+        event = self.event("evt_1", created=1_700_000_000)
+        self.assertEqual(self.post(event).status_code, 200)
+        self.assertEqual(StripeEventService.process_pending()["processed"], 1)
+
+        self.assertEqual(self.post(event).status_code, 200)
+
+        self.assertEqual(StripeEvent.objects.filter(event_id="evt_1").count(), 1)
+        self.assertEqual(StripeEventService.process_pending(), {"processed": 0, "skipped": 0, "failed": 0})
+        self.assertEqual(StripeEvent.objects.get(event_id="evt_1").attempts, 1)
+
+    def test_older_event_is_ignored(self):
+        self.post(self.event("evt_new", created=1_700_000_100, status="canceled"))
+        StripeEventService.process_pending()
+
+        self.post(self.event("evt_old", created=1_700_000_000, status="active"))
+        stats = StripeEventService.process_pending()
+
+        self.assertEqual(stats["skipped"], 1)
+        self.assertEqual(StripeEvent.objects.get(event_id="evt_old").status, "skipped")
+        self.assertEqual(Subscription.objects.get(stripe_subscription_id="sub_test").status, "canceled")
+
+
+class ReportView(APIView):
+    permission_classes = [HasEntitlement]
+    required_feature = "mood_report"
+
+    def get(self, request):
+        return Response({"success": True})
+
+
+class HasEntitlementTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(email="premium@example.com", full_name="Premium", password="pw")
+
+    def setUp(self):
+        cache.clear()
+
+    def get(self) -> int:
+        request = APIRequestFactory().get("/report/")
+        force_authenticate(request, user=self.user)
+        return ReportView.as_view()(request).status_code
+
+    def subscribe(self, **fields) -> None:
+        with self.captureOnCommitCallbacks(execute=True):
+            Subscription.objects.create(user=self.user, **fields)
+
+    def test_without_subscription_is_denied(self):
+        self.assertEqual(self.get(), 403)
+
+    def test_active_subscription_is_allowed(self):
+        self.subscribe(status="active", current_period_end=timezone.now() + timedelta(days=10))
+        self.assertEqual(self.get(), 200)
+
+    def test_lapsed_subscription_is_denied(self):
+        # Canceled at period end, and the period is over; the sweeper has not run yet.
+        self.subscribe(
+            status="active", cancel_at_period_end=True, current_period_end=timezone.now() - timedelta(minutes=1)
+        )
+        self.assertEqual(self.get(), 403)
+
+    def test_canceled_subscription_is_denied(self):
+        self.subscribe(status="canceled")
+        self.assertEqual(self.get(), 403)
@@ -1,7 +1,10 @@
 from django.urls import path
-from .views import UserInformationList, DashboardMetricsAPIView
+from .views import UserInformationList, DashboardMetricsAPIView, DashboardMetricSeriesAPIView, EntitlementAPIView, StripeWebhookAPIView
 
 urlpatterns = [
     path('users/list/', UserInformationList.as_view(), name='user-subscription-list'),
     path("dashboard/metrics/", DashboardMetricsAPIView.as_view(), name="dashboard-metrics"),
+    path("dashboard/metrics/series/", DashboardMetricSeriesAPIView.as_view(), name="dashboard-metrics-series"),
+    path("me/entitlement/", EntitlementAPIView.as_view(), name="my-entitlement"),
+    path("stripe/webhook/", StripeWebhookAPIView.as_view(), name="stripe-webhook"),
 ]
@@ -1,58 +1,186 @@
-from django.db.models import F
-from rest_framework.permissions import IsAuthenticated, IsAdminUser
+import time
+from datetime import date, datetime, timedelta, timezone
+
+import stripe
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import AllowAny, IsAuthenticated, IsAdminUser
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from account.models import UserAuth
+from account.pagination import parse_page_size
+from account.streaming import aiter_queryset, parse_export_format, streaming_export_response
 
+from .entitlements import EntitlementService
 from .services import (
-    get_total_customers_with_growth,
-    get_total_revenue_with_growth,
-    get_user_growth_monthly,
+    GRANULARITIES,
+    MAX_SERIES_PERIODS,
+    USER_LIST_FIELDS,
+    DailyMetricService,
+    DashboardMetricsService,
+    get_users_with_subscription,
+    paginate_users,
 )
+from .webhooks import StripeEventService
 
 # Create your views here.
-def get_users_with_subscription():
-    return (
-        UserAuth.objects
-        .select_related("subscription")
-        .annotate(plan_name=F("subscription__plan_name"))
-        .values(
-            "full_name",
-            "username",
-            "email",
-            "profile_pic",
-            "date_joined",
-            "plan_name",
-        )
-    )
+def _parse_bool(params, name):
+    value = params.get(name)
+    if value is None:
+        return None
+    if value.lower() in ("1", "true"):
+        return True
+    if value.lower() in ("0", "false"):
+        return False
+    raise ValidationError({name: "Must be true or false."})
+
+
+def _parse_date(params, name):
+    value = params.get(name)
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise ValidationError({name: "Invalid date format. Use YYYY-MM-DD."})
+
 
 class UserInformationList(APIView):
+    """
+    Admin user listing, newest first, with keyset pagination
+    (``?cursor=&page_size=``) or, with ``?export_format=csv|ndjson``, the
+    whole filtered list streamed.
+    """
     permission_classes = [IsAdminUser]
 
     def get(self, request):
-        data = list(get_users_with_subscription())
+        params = request.query_params
+        qs = get_users_with_subscription(
+            search=(params.get("search") or "").strip() or None,
+            plan=(params.get("plan") or "").strip() or None,
+            is_subscribed=_parse_bool(params, "is_subscribed"),
+            joined_after=_parse_date(params, "joined_after"),
+            joined_before=_parse_date(params, "joined_before"),
+        )
+
+        if params.get("export_format"):
+            export_format = parse_export_format(params.get("export_format"))
+            return streaming_export_response(
+                aiter_queryset(qs.values_list(*USER_LIST_FIELDS)),
+                columns=USER_LIST_FIELDS,
+                export_format=export_format,
+                filename=f"users-{date.today().isoformat()}",
+            )
+
+        data, next_cursor = paginate_users(
+            qs,
+            cursor=params.get("cursor"),
+            page_size=parse_page_size(params.get("page_size"), default=50, maximum=500),
+        )
         return Response({
             "success": True,
             "message": "User data fetched successfully",
-            "data": data
+            "data": data,
+            "next_cursor": next_cursor,
         })
 
 
 class DashboardMetricsAPIView(APIView):
     permission_classes = [IsAuthenticated]
-    
-    data = {
-                "customers": get_total_customers_with_growth(),
-                "revenue": get_total_revenue_with_growth(),
-                "user_growth": get_user_growth_monthly(),
-            }
 
     def get(self, request):
+        snapshot = DashboardMetricsService.get_snapshot()
         return Response(
             {
                 "success": True,
                 "message": "Dashboard metrics fetched successfully",
-                "data": self.data,
+                "data": snapshot["data"],
+                "generated_at": datetime.fromtimestamp(snapshot["generated_at"], tz=timezone.utc).isoformat(),
+                "age_seconds": round(time.time() - snapshot["generated_at"], 1),
             }
         )
+
+
+class DashboardMetricSeriesAPIView(APIView):
+    """
+    Signups, subscriptions and revenue per ``?granularity=day|week|month``
+    between ``?start_date=`` and ``?end_date=`` (default: the last 30 days,
+    12 weeks or a year), read from the daily metrics table.
+    """
+    permission_classes = [IsAdminUser]
+
+    DEFAULT_SPANS = {"day": 29, "week": 7 * 11, "month": 365}
+
+    def get(self, request):
+        params = request.query_params
+        granularity = params.get("granularity", "day")
+        if granularity not in GRANULARITIES:
+            raise ValidationError({"granularity": f"Must be one of: {', '.join(GRANULARITIES)}."})
+
+        end_date = _parse_date(params, "end_date") or date.today()
+        start_date = _parse_date(params, "start_date") or end_date - timedelta(days=self.DEFAULT_SPANS[granularity])
+        if start_date > end_date:
+            raise ValidationError({"start_date": "start_date cannot be greater than end_date."})
+        if DailyMetricService.period_count(
+            start_date=start_date, end_date=end_date, granularity=granularity
+        ) > MAX_SERIES_PERIODS:
+            raise ValidationError({"granularity": f"Range spans more than {MAX_SERIES_PERIODS} periods."})
+
+        return Response({
+            "success": True,
+            "message": "Dashboard metric series fetched successfully",
+            "granularity": granularity,
+            "range": {
+                "start_date": start_date.isoformat(),
+                "end_date": end_date.isoformat(),
+            },
+            "data": DailyMetricService.series(start_date=start_date, end_date=end_date, granularity=granularity),
+        })
+
+
+class EntitlementAPIView(APIView):
+    """The current user's plan and premium features."""
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        entitlement = EntitlementService.for_request(request)
+        return Response({
+            "success": True,
+            "message": "Entitlement fetched successfully",
+            "data": {
+                "active": EntitlementService.is_active(entitlement),
+                "plan": entitlement["plan"],
+                "features": entitlement["features"],
+                "expires_at": (
+                    datetime.fromtimestamp(entitlement["expires_at"], tz=timezone.utc).isoformat()
+                    if entitlement["expires_at"] else None
+                ),
+            },
+        })
+
+
+class StripeWebhookAPIView(APIView):
+    """
+    Stripe webhook endpoint. Only verifies and records the event so Stripe
+    gets its acknowledgement right away; ``process_stripe_events`` applies it.
+    """
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
+    def post(self, request):
+        try:
+            StripeEventService.record(
+                payload=request.body,
+                signature=request.headers.get("Stripe-Signature", ""),
+            )
+        except stripe.SignatureVerificationError:
+            return Response(
+                {"success": False, "message": "Invalid signature"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        except (ValueError, UnicodeDecodeError):
+            return Response(
+                {"success": False, "message": "Invalid payload"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return Response({"success": True, "message": "Event received"})
@@ -0,0 +1,253 @@
+import json
+from collections import defaultdict
+from datetime import datetime, timezone as dt_timezone
+from decimal import Decimal
+from typing import Dict, List, Optional, TypedDict
+
+import stripe
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from account.models import UserAuth
+from .entitlements import EntitlementService
+from .models import DailyMetric, StripeEvent, Subscription
+from .services import sync_is_subscribed
+
+SUBSCRIPTION_EVENT_PREFIX = "customer.subscription."
+DEFAULT_BATCH_SIZE = 500
+
+
+class ProcessStats(TypedDict):
+    processed: int
+    skipped: int
+    failed: int
+
+
+def _customer_id(event: dict) -> Optional[str]:
+    obj = event.get("data", {}).get("object", {})
+    if obj.get("object") == "customer":
+        return obj.get("id")
+    customer = obj.get("customer")
+    # Expanded objects carry the id inside.
+    return customer.get("id") if isinstance(customer, dict) else customer
+
+
+def _metadata_user_id(obj: dict) -> Optional[int]:
+    value = str((obj.get("metadata") or {}).get("user_id", ""))
+    return int(value) if value.isdigit() else None
+
+
+def _day(value: datetime):
+    return timezone.localdate(value)
+
+
+def _lock_customers(customer_ids: List[str]) -> None:
+    """
+    Serialize workers per customer until the transaction ends (PostgreSQL
+    only). Locks are taken in sorted order so two workers cannot deadlock.
+    """
+    if connection.vendor != "postgresql" or not customer_ids:
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT count(pg_advisory_xact_lock(hashtext(customer))) FROM unnest(%s::text[]) AS customer",
+            [sorted(customer_ids)],
+        )
+
+
+def _subscription_fields(obj: dict) -> dict:
+    """Map a Stripe subscription object onto Subscription columns."""
+    fields = {
+        "status": obj.get("status") or "active",
+        "cancel_at_period_end": bool(obj.get("cancel_at_period_end")),
+    }
+    items = (obj.get("items") or {}).get("data") or []
+    # Newer API versions moved the billing period onto the subscription items.
+    period = obj if obj.get("current_period_end") else (items[0] if items else {})
+    for name in ("current_period_start", "current_period_end"):
+        if period.get(name):
+            fields[name] = datetime.fromtimestamp(int(period[name]), tz=dt_timezone.utc)
+    price = items[0].get("price") if items else None
+    if price:
+        if price.get("nickname"):
+            fields["plan_name"] = price["nickname"]
+        if price.get("currency"):
+            fields["currency_symbol"] = price["currency"].upper()
+        if price.get("unit_amount") is not None:
+            fields["plan_price"] = Decimal(price["unit_amount"]) / 100
+    return fields
+
+
+class StripeEventService:
+    """
+    Two-step Stripe webhook ingestion.
+
+    ``record`` runs in the request: it verifies the signature and inserts the
+    raw event, ignoring event ids it has already seen. ``process_pending`` runs
+    in a worker and applies subscription events in ``created`` order. Each
+    Subscription remembers the creation time of the last event applied to it,
+    so redelivered or late events never overwrite newer state.
+    """
+
+    @staticmethod
+    def record(*, payload: bytes, signature: str) -> None:
+        """
+        Raises stripe.SignatureVerificationError for a bad signature and
+        ValueError for a body that is not a Stripe event.
+        """
+        stripe.WebhookSignature.verify_header(
+            payload.decode("utf-8"),
+            signature,
+            settings.STRIPE_WEBHOOK_SECRET,
+            tolerance=getattr(settings, "STRIPE_WEBHOOK_TOLERANCE", 300),
+        )
+        event = json.loads(payload)
+        if not isinstance(event, dict) or not event.get("id") or not event.get("type"):
+            raise ValueError("Not a Stripe event.")
+
+        # A single INSERT ... ON CONFLICT DO NOTHING: duplicates cost no extra round trip.
+        StripeEvent.objects.bulk_create(
+            [
+                StripeEvent(
+                    event_id=event["id"],
+                    type=event["type"],
+                    customer_id=_customer_id(event),
+                    stripe_created=datetime.fromtimestamp(int(event.get("created") or 0), tz=dt_timezone.utc),
+                    payload=event,
+                )
+            ],
+            ignore_conflicts=True,
+        )
+
+    @staticmethod
+    def retry_failed() -> int:
+        return StripeEvent.objects.filter(status="failed").update(status="pending", error="")
+
+    @staticmethod
+    @transaction.atomic
+    def process_pending(*, batch_size: int = DEFAULT_BATCH_SIZE) -> ProcessStats:
+        """Apply up to ``batch_size`` pending events. Concurrent workers skip each other's rows."""
+        events = list(
+            StripeEvent.objects
+            .select_for_update(skip_locked=True)
+            .filter(status="pending")
+            .order_by("stripe_created", "id")[:batch_size]
+        )
+        stats: ProcessStats = {"processed": 0, "skipped": 0, "failed": 0}
+        if not events:
+            return stats
+
+        # Fold each subscription's events into its latest state.
+        latest: Dict[str, StripeEvent] = {}
+        skipped: List[int] = []
+        for event in events:
+            obj = event.payload.get("data", {}).get("object", {})
+            if not event.type.startswith(SUBSCRIPTION_EVENT_PREFIX) or not obj.get("id"):
+                skipped.append(event.id)
+                continue
+            previous = latest.get(obj["id"])
+            if previous is not None:
+                skipped.append(previous.id)
+            latest[obj["id"]] = event
+
+        # Another worker may hold earlier events of the same customers; wait for
+        # it so rows it creates are visible below.
+        _lock_customers(list({event.customer_id for event in latest.values() if event.customer_id}))
+        existing = {
+            subscription.stripe_subscription_id: subscription
+            for subscription in Subscription.objects.select_for_update().filter(stripe_subscription_id__in=latest)
+        }
+        unknown_customers = {
+            event.customer_id for key, event in latest.items() if key not in existing and event.customer_id
+        }
+        customer_users = dict(
+            Subscription.objects
+            .filter(stripe_customer_id__in=unknown_customers)
+            .order_by("created_at")
+            .values_list("stripe_customer_id", "user_id")
+        )
+        known_users = set(
+            UserAuth.objects
+            .filter(user_id__in={_metadata_user_id(event.payload["data"]["object"]) for event in latest.values()})
+            .values_list("user_id", flat=True)
+        )
+
+        now = timezone.now()
+        to_create: List[Subscription] = []
+        to_update: List[Subscription] = []
+        applied: List[int] = []
+        failed: Dict[str, List[int]] = defaultdict(list)
+        revenue_changes: Dict = defaultdict(Decimal)
+
+        for key, event in latest.items():
+            obj = event.payload["data"]["object"]
+            fields = _subscription_fields(obj)
+            subscription = existing.get(key)
+
+            if subscription is None:
+                user_id = _metadata_user_id(obj)
+                if user_id not in known_users:
+                    user_id = customer_users.get(event.customer_id)
+                if user_id is None:
+                    failed[f"No user for customer {event.customer_id}."].append(event.id)
+                    continue
+                to_create.append(Subscription(
+                    user_id=user_id,
+                    stripe_subscription_id=key,
+                    stripe_customer_id=event.customer_id,
+                    stripe_event_created=event.stripe_created,
+                    **fields,
+                ))
+                applied.append(event.id)
+                continue
+
+            if subscription.stripe_event_created and event.stripe_created < subscription.stripe_event_created:
+                skipped.append(event.id)
+                continue
+            old_price = Decimal(str(subscription.plan_price))
+            for name, value in fields.items():
+                setattr(subscription, name, value)
+            subscription.stripe_customer_id = event.customer_id or subscription.stripe_customer_id
+            subscription.stripe_event_created = event.stripe_created
+            subscription.updated_at = now
+            new_price = Decimal(str(subscription.plan_price))
+            if new_price != old_price:
+                revenue_changes[_day(subscription.created_at)] += new_price - old_price
+            to_update.append(subscription)
+            applied.append(event.id)
+
+        # Bulk writes bypass the DailyMetric signals, so the counters are bumped here.
+        Subscription.objects.bulk_create(to_create)
+        Subscription.objects.bulk_update(
+            to_update,
+            ["status", "plan_name", "currency_symbol", "plan_price",
+             "current_period_start", "current_period_end", "cancel_at_period_end",
+             "stripe_customer_id", "stripe_event_created", "updated_at"],
+        )
+        if to_create:
+            DailyMetric.objects.bump(
+                _day(now),
+                subscriptions=len(to_create),
+                revenue=sum((Decimal(str(item.plan_price)) for item in to_create), Decimal(0)),
+            )
+        for day, delta in revenue_changes.items():
+            DailyMetric.objects.bump(day, revenue=delta)
+
+        user_ids = {item.user_id for item in to_create + to_update}
+        if user_ids:
+            sync_is_subscribed(user_ids)
+            # Bulk writes skip the Subscription signals that keep entitlements current.
+            transaction.on_commit(lambda: EntitlementService.rebuild(user_ids))
+
+        done = StripeEvent.objects.filter(id__in=[event.id for event in events])
+        done.filter(id__in=applied).update(status="processed", processed_at=now, attempts=F("attempts") + 1)
+        done.filter(id__in=skipped).update(status="skipped", processed_at=now, attempts=F("attempts") + 1)
+        for error, ids in failed.items():
+            done.filter(id__in=ids).update(status="failed", error=error, attempts=F("attempts") + 1)
+
+        stats["processed"] = len(applied)
+        stats["skipped"] = len(skipped)
+        stats["failed"] = sum(len(ids) for ids in failed.values())
+        return stats